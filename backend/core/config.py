@@ -3,7 +3,81 @@ from dotenv import load_dotenv
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Postgres engine: connection mode is auto-detected from DATABASE_URL unless set to direct, session or transaction
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "auto")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))  # ignored behind a transaction pooler
+DB_POOL_WAIT_SAMPLES = int(os.getenv("DB_POOL_WAIT_SAMPLES", "1000"))
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+# Single-node mode (DATABASE_URL=sqlite:///path/to/agent_mailer.db)
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+SQLITE_CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))
+SQLITE_MMAP_SIZE_BYTES = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")
 JWT_ALGORITHM = "HS256"
-JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 30
\ No newline at end of file
+JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 30
+JWT_REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+# A just-rotated refresh token presented again this soon is a concurrent refresh (two tabs), not a leak
+JWT_REFRESH_TOKEN_REUSE_GRACE_SECONDS = int(os.getenv("JWT_REFRESH_TOKEN_REUSE_GRACE_SECONDS", "30"))
+VERIFIED_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("VERIFIED_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+# Argon2 hashing runs on a small thread pool; logins beyond MAX_PENDING queued hashes get a 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(8 * PASSWORD_HASH_WORKERS)))
+
+# Prompt registry (LangSmith prompt hub cache)
+PROMPT_CACHE_TTL_SECONDS = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", "300"))
+PROMPT_REFRESH_INTERVAL_SECONDS = int(os.getenv("PROMPT_REFRESH_INTERVAL_SECONDS", "240"))
+PROMPT_SNAPSHOT_DIR = os.getenv("PROMPT_SNAPSHOT_DIR", ".prompt_snapshots")
+
+# Tavily search cache
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH")  # optional SQLite file for a cache that survives restarts
+
+# Context deep-agent budget
+CONTEXT_AGENT_MAX_TOOL_CALLS = int(os.getenv("CONTEXT_AGENT_MAX_TOOL_CALLS", "8"))
+CONTEXT_AGENT_MAX_MODEL_CALLS = int(os.getenv("CONTEXT_AGENT_MAX_MODEL_CALLS", "12"))
+CONTEXT_AGENT_DEADLINE_SECONDS = float(os.getenv("CONTEXT_AGENT_DEADLINE_SECONDS", "90"))
+
+# Speculative pre-drafting after context generation
+SPECULATIVE_DRAFT_MAX_TYPES = int(os.getenv("SPECULATIVE_DRAFT_MAX_TYPES", "2"))
+SPECULATIVE_DRAFT_CONCURRENCY = int(os.getenv("SPECULATIVE_DRAFT_CONCURRENCY", "2"))
+SPECULATIVE_DRAFT_TTL_HOURS = int(os.getenv("SPECULATIVE_DRAFT_TTL_HOURS", "24"))  # unclaimed pre-drafts are then deleted
+SPECULATIVE_DRAFT_GC_INTERVAL_SECONDS = int(os.getenv("SPECULATIVE_DRAFT_GC_INTERVAL_SECONDS", "3600"))
+
+# Draft graph checkpointer: a SQLite file path locally, a postgresql:// URL in production
+CHECKPOINT_URL = os.getenv("CHECKPOINT_URL", "checkpoints.sqlite")
+CHECKPOINT_TTL_DAYS = int(os.getenv("CHECKPOINT_TTL_DAYS", "14"))
+CHECKPOINT_GC_INTERVAL_SECONDS = int(os.getenv("CHECKPOINT_GC_INTERVAL_SECONDS", "3600"))
+DRAFT_HISTORY_MAX_REVISIONS = int(os.getenv("DRAFT_HISTORY_MAX_REVISIONS", "4"))
+
+# Keyset-paginated listings
+LIST_PAGE_SIZE_DEFAULT = int(os.getenv("LIST_PAGE_SIZE_DEFAULT", "50"))
+LIST_PAGE_SIZE_MAX = int(os.getenv("LIST_PAGE_SIZE_MAX", "200"))
+
+# Per-user analytics cache (invalidated whenever the user saves a job or draft)
+ANALYTICS_CACHE_TTL_SECONDS = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "60"))
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "1024"))
+
+# Uploaded context documents
+USER_DOCUMENT_CHUNK_CHARS = int(os.getenv("USER_DOCUMENT_CHUNK_CHARS", "4000"))
+# PDF/DOCX text extraction is CPU-bound, so uploads are parsed in child processes, DOCUMENT_PARSE_WORKERS at a time
+DOCUMENT_PARSE_WORKERS = int(os.getenv("DOCUMENT_PARSE_WORKERS", str(min(2, os.cpu_count() or 1))))
+DOCUMENT_PARSE_TIMEOUT_SECONDS = float(os.getenv("DOCUMENT_PARSE_TIMEOUT_SECONDS", "20"))
+DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Full-text search over jobs and drafts (ranked, so paged by offset rather than keyset)
+SEARCH_PAGE_SIZE_DEFAULT = int(os.getenv("SEARCH_PAGE_SIZE_DEFAULT", "20"))
+SEARCH_MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "1000"))
+
+# Streaming history export: rows fetched per cursor round trip and written per chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
@@ -1,35 +1,152 @@
 import ssl
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from sqlalchemy import event, Select, CompoundSelect
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from backend.core.config import DATABASE_URL
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.pool import StaticPool
+from backend.core.config import (
+    DATABASE_URL,
+    SQLITE_READ_POOL_SIZE,
+    SQLITE_CACHE_SIZE_KIB,
+    SQLITE_MMAP_SIZE_BYTES,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_SYNCHRONOUS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_ECHO,
+)
+from backend.core.db_pool import InstrumentedPool, asyncpg_statement_options, detect_connection_mode
 
 # Remove surrounding quotes if any and strip URL query params that asyncpg won't accept
 _raw_url = DATABASE_URL.strip().strip("'\"")
 
-# Ensure the driver is asyncpg if it's a postgres url
+# Ensure the driver is asyncpg if it's a postgres url, aiosqlite if it's a sqlite one
 if _raw_url.startswith("postgresql://"):
      _raw_url = _raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+elif _raw_url.startswith("sqlite://"):
+    _raw_url = _raw_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
 
 _db_url = _raw_url.split("?", 1)[0]
 
-# Create an SSL context to pass to asyncpg.connect()
-_ssl_context = ssl.create_default_context()
-_ssl_context.check_hostname = False
-_ssl_context.verify_mode = ssl.CERT_NONE
-
-engine = create_async_engine(
-    _db_url,
-    echo=True,
-    pool_pre_ping=True,
-    connect_args={
-        "ssl": _ssl_context,
-        "statement_cache_size": 0,  # Required for Supabase Transaction Pooler
-    },
-)
+# Single-node mode: an embedded SQLite file instead of a remote Postgres
+SQLITE_MODE = _db_url.startswith("sqlite")
+
+# direct, session or transaction (pooler); always direct for SQLite
+CONNECTION_MODE = "direct" if SQLITE_MODE else detect_connection_mode(_raw_url)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record, query_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers keep reading while the writer commits; NORMAL only fsyncs at checkpoints in WAL mode
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KIB}")
+    cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE_BYTES}")
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA foreign_keys = ON")
+    if query_only:
+        cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+if SQLITE_MODE:
+    _in_memory = _db_url.endswith(":memory:") or _db_url.endswith("://")
+    if _in_memory:
+        # Every connection to :memory: is a separate database, so share one for reads and writes
+        engine = create_async_engine(_db_url, echo=DB_ECHO, poolclass=StaticPool)
+        read_engine = engine
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    else:
+        # SQLite allows one writer at a time: a single write connection queues writers in the pool
+        # instead of failing them with "database is locked", while reads run on their own pool
+        engine = create_async_engine(_db_url, echo=DB_ECHO, poolclass=InstrumentedPool, pool_size=1, max_overflow=0)
+        read_engine = create_async_engine(
+            _db_url, echo=DB_ECHO, poolclass=InstrumentedPool, pool_size=SQLITE_READ_POOL_SIZE, max_overflow=0
+        )
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        event.listen(
+            read_engine.sync_engine,
+            "connect",
+            lambda conn, record: _set_sqlite_pragmas(conn, record, query_only=True),
+        )
+else:
+    # Create an SSL context to pass to asyncpg.connect()
+    _ssl_context = ssl.create_default_context()
+    _ssl_context.check_hostname = False
+    _ssl_context.verify_mode = ssl.CERT_NONE
+
+    _connect_args = {}
+    if _db_url.startswith("postgresql+asyncpg"):
+        _db_url, _connect_args = asyncpg_statement_options(_db_url, CONNECTION_MODE)
+        _connect_args["ssl"] = _ssl_context
+
+    engine = create_async_engine(
+        _db_url,
+        echo=DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+        connect_args=_connect_args,
+    )
+    read_engine = engine
+
+
+def pool_metrics() -> dict:
+    """Connection mode, statement caching and per-pool checkout metrics for /metrics/db."""
+    engines = {"primary": engine} if read_engine is engine else {"writer": engine, "reader": read_engine}
+    return {
+        "dialect": engine.dialect.name,
+        "connection_mode": CONNECTION_MODE,
+        "statement_cache": CONNECTION_MODE != "transaction" and not SQLITE_MODE,
+        "pools": {
+            name: e.pool.stats() if isinstance(e.pool, InstrumentedPool) else {"class": type(e.pool).__name__}
+            for name, e in engines.items()
+        },
+    }
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to the read engine and everything else to the write engine.
+
+    Once a transaction has flushed or run a write statement it stays on the writer
+    until it ends, so a session always reads its own uncommitted writes. With one
+    engine (Postgres, in-memory SQLite) both sides are the same and this is a plain Session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        writes = self._flushing or (clause is not None and not isinstance(clause, (Select, CompoundSelect)))
+        if writes:
+            self.info["has_writes"] = True  # LazySession.release() refuses to end such a transaction
+        if read_engine is engine or self.info.get("uses_writer"):
+            return engine.sync_engine
+        if writes:
+            self.info["uses_writer"] = True
+            return engine.sync_engine
+        if clause is None:
+            # A bare get_bind() (e.g. to read the dialect) runs nothing, so it must not pin the writer
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("uses_writer", None)
+        session.info.pop("has_writes", None)
+
 
 async_session_maker = sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
@@ -39,6 +156,64 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
-    async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+def utcnow() -> datetime:
+    """
+    Python-side default for created_at columns.
+
+    SQLite's CURRENT_TIMESTAMP stores whole seconds as text while bound datetimes carry
+    microseconds, so keyset cursors compared the two formats as strings; writing the
+    value from Python keeps one format (and sub-second ordering) on every backend.
+    """
+    return datetime.now(timezone.utc)
+
+
+class LazySession:
+    """
+    Stands in for the request's AsyncSession: the session is only created on first use,
+    and `release()` hands its connection back to the pool mid-request.
+
+    An AsyncSession holds its pooled connection from the first query until the transaction
+    ends, which for a request is normally the end of the response. Handlers that go on to
+    wait on an LLM call `await db.release()` once their reads are done; the next query
+    (e.g. the final insert) checks a connection out again.
+    """
+
+    def __init__(self, maker=async_session_maker):
+        self._maker = maker
+        self._session = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._maker()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    async def release(self) -> None:
+        """
+        Ends the current read-only transaction so its connection goes back to the pool.
+
+        Raises RuntimeError if the transaction has writes, flushed or not: the caller commits
+        (or rolls back) those itself, so nothing half-finished is persisted on its behalf.
+        """
+        session = self._session
+        if session is None or not session.in_transaction():
+            return
+        if session.new or session.dirty or session.deleted or session.info.get("has_writes"):
+            raise RuntimeError("release() with uncommitted writes; commit or roll back first")
+        # Nothing to persist; unlike rollback() this leaves the loaded objects usable
+        await session.commit()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+async def get_db() -> AsyncIterator[LazySession]:
+    session = LazySession()
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,100 @@
+import threading
+import time
+import uuid
+from collections import deque
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from backend.core.config import DB_CONNECTION_MODE, DB_POOL_WAIT_SAMPLES, DB_STATEMENT_CACHE_SIZE
+from backend.utils.percentiles import summarize
+
+CONNECTION_MODES = ("direct", "session", "transaction")
+
+
+def detect_connection_mode(url: str) -> str:
+    """
+    How the app reaches Postgres: "direct", or through a "session" or "transaction" mode pooler.
+
+    DB_CONNECTION_MODE wins when set. Otherwise Supabase's pooler is recognised by host and
+    port (6543 is its transaction pooler, 5432 its session pooler), `?pgbouncer=true` marks a
+    transaction pooler, and anything else is treated as direct. Set DB_CONNECTION_MODE for
+    other transaction-mode poolers: prepared statements break behind them.
+    """
+    if DB_CONNECTION_MODE != "auto":
+        if DB_CONNECTION_MODE not in CONNECTION_MODES:
+            raise ValueError(f"DB_CONNECTION_MODE must be auto or one of {CONNECTION_MODES}, got {DB_CONNECTION_MODE!r}")
+        return DB_CONNECTION_MODE
+    parsed = make_url(url)
+    if parsed.query.get("pgbouncer") == "true":
+        return "transaction"
+    if (parsed.host or "").endswith("pooler.supabase.com"):
+        return "transaction" if parsed.port == 6543 else "session"
+    return "direct"
+
+
+def asyncpg_statement_options(url: str, mode: str):
+    """
+    The asyncpg URL and connect_args for a connection mode: prepared statements are
+    cached on direct and session-mode connections and disabled behind a transaction pooler.
+
+    Returns:
+        tuple[URL, dict]: The URL (with SQLAlchemy's statement cache size) and connect_args.
+    """
+    if mode == "transaction":
+        # A transaction pooler hands each transaction a different server connection, so a
+        # statement prepared on one is missing (or a name clash) on the next: no caching,
+        # and unique names for the unnamed statements asyncpg still prepares
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+        return make_url(url).update_query_dict({"prepared_statement_cache_size": "0"}), connect_args
+    # Direct and session-mode connections keep their prepared statements, so reuse them
+    connect_args = {"statement_cache_size": DB_STATEMENT_CACHE_SIZE}
+    return make_url(url).update_query_dict({"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)}), connect_args
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    A QueuePool that records how long each checkout waited for a connection
+    (including opening a new one) and how many checkouts timed out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._waits_ms = deque(maxlen=DB_POOL_WAIT_SAMPLES)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_wait_ms = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        finally:
+            wait_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.checkouts += 1
+                self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+                self._waits_ms.append(wait_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = list(self._waits_ms)
+            checkouts, timeouts, max_wait_ms = self.checkouts, self.timeouts, self.max_wait_ms
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "max_wait_ms": round(max_wait_ms, 1),
+            "wait_ms": summarize(waits),  # over the last DB_POOL_WAIT_SAMPLES checkouts
+        }
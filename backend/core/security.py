@@ -1,47 +1,83 @@
-from datetime import datetime, timedelta
-from backend.core.config import JWT_ALGORITHM, JWT_SECRET_KEY, JWT_ACCESS_TOKEN_EXPIRE_MINUTES
+import hashlib
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from backend.core.config import (
+    JWT_ALGORITHM,
+    JWT_SECRET_KEY,
+    JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS,
+    JWT_REFRESH_TOKEN_REUSE_GRACE_SECONDS,
+    VERIFIED_TOKEN_CACHE_MAX_ENTRIES,
+)
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, exists
 from uuid import UUID
-from backend.core.database import get_db
 from backend.models.user import User
+from backend.models.refresh_tokens import RefreshToken
+from backend.utils.ttl_cache import TTLCache
 
 security = HTTPBearer()
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-def create_access_token(username: str, user_id: str, role: str) -> str:
+# Access token -> (its claims, its session), kept until the token's own exp, so most requests skip the signature check
+verified_tokens = TTLCache(maxsize=VERIFIED_TOKEN_CACHE_MAX_ENTRIES, ttl=JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Refresh token families logged out while access tokens minted for them may still be unexpired.
+# Like verified_tokens this is per process: another worker keeps accepting those tokens until their exp.
+revoked_sessions = TTLCache(maxsize=VERIFIED_TOKEN_CACHE_MAX_ENTRIES, ttl=JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+def create_access_token(username: str, user_id: str, role: str, session_id: str | None = None) -> str:
     payload = {
         "sub": username,
         "id": user_id,
         "role": role,
         "exp": datetime.utcnow() + timedelta(minutes=JWT_ACCESS_TOKEN_EXPIRE_MINUTES),
     }
+    if session_id is not None:
+        payload["sid"] = session_id  # the refresh token family, so logging out also ends this token
     return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
+def _session_revoked(session_id: str | None) -> bool:
+    return session_id is not None and revoked_sessions.get(session_id) is not None
+
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_bearer)],
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    try: 
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> User:
+    cached = verified_tokens.get(token)
+    if cached is not None:
+        claims, session_id = cached
+        if _session_revoked(session_id):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+            )
+        return dict(claims)
+    try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         role: str = payload.get("role")
-        if user_id is None:
+        if user_id is None or _session_revoked(payload.get("sid")):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-        return {"username": username, "id": user_id, "role": role}
-    except JWTError:
+        # A UUID rather than the claim's string: every dialect binds it (SQLite rejects strings)
+        claims = {"username": username, "id": UUID(user_id), "role": role}
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            verified_tokens.set(token, (claims, payload.get("sid")), ttl=remaining)
+        return dict(claims)
+    except (JWTError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -58,7 +94,145 @@ async def authenticate_user(
     user = result.scalars().first()
     if not user:
         return False
-    from backend.utils.password_hash import verify_password
-    if not verify_password(password, user.password_hash):
+    from backend.utils.password_hash import averify_password
+    if not await averify_password(password, user.password_hash):
         return False
-    return user
\ No newline at end of file
+    return user
+
+
+def _hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_refresh_token(user_id, family_id) -> tuple[RefreshToken, str]:
+    token = secrets.token_urlsafe(32)
+    row = RefreshToken(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=_hash_refresh_token(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=JWT_REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return row, token
+
+
+async def issue_refresh_token(db: AsyncSession, user_id) -> tuple[str, uuid.UUID]:
+    """Starts a new refresh token family at login and returns its first token and the family id."""
+    now = datetime.now(timezone.utc)
+    # Logins are rare enough to double as cleanup of the user's expired tokens
+    await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= now))
+    row, token = _new_refresh_token(user_id, uuid.uuid4())
+    db.add(row)
+    await db.commit()
+    return token, row.family_id
+
+
+async def _revoke_family(db: AsyncSession, family_id) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    revoked_sessions.set(str(family_id), True)
+
+
+async def _family_is_live(db: AsyncSession, family_id, now: datetime) -> bool:
+    """Whether the family still has a usable token, i.e. it was not logged out or revoked."""
+    return bool(await db.scalar(select(exists().where(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at.is_(None),
+        RefreshToken.expires_at > now,
+    ))))
+
+
+_invalid_refresh_token = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired refresh token. Please sign in again.",
+)
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> tuple[User, str, uuid.UUID]:
+    """
+    Exchanges a refresh token for its replacement.
+
+    Raises 401 when the token is unknown, expired, revoked or its user is inactive.
+    A revoked token being presented again means it leaked, so its whole family
+    (every token descended from the same login) is revoked too. The exception is a
+    token rotated less than JWT_REFRESH_TOKEN_REUSE_GRACE_SECONDS ago while its family
+    is still live: that is a concurrent refresh (two tabs restoring the same cookie),
+    and it gets a new token of the same family instead. Only once per token; a
+    second replay is treated as theft.
+
+    Returns:
+        tuple[User, str, uuid.UUID]: The token's user, the new refresh token and its family id.
+    """
+    now = datetime.now(timezone.utc)
+    grace_start = now - timedelta(seconds=JWT_REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+    result = await db.execute(
+        select(
+            RefreshToken,
+            (RefreshToken.expires_at > now).label("live"),
+            (RefreshToken.replaced_by_id.is_not(None) & (RefreshToken.revoked_at > grace_start)).label("just_rotated"),
+        )
+        .where(RefreshToken.token_hash == _hash_refresh_token(token))
+    )
+    row = result.first()
+    if row is None:
+        raise _invalid_refresh_token
+    current, live, just_rotated = row
+    in_grace = False
+    if current.revoked_at is not None:
+        in_grace = just_rotated and await _family_is_live(db, current.family_id, now)
+        if not in_grace:
+            print(f"Refresh token reuse detected for user {current.user_id}; revoking family {current.family_id}")
+            await _revoke_family(db, current.family_id)
+            raise _invalid_refresh_token
+    if not live:
+        raise _invalid_refresh_token
+
+    user = await db.get(User, current.user_id)
+    if user is None or not user.is_active:
+        await _revoke_family(db, current.family_id)
+        raise _invalid_refresh_token
+
+    replacement, new_token = _new_refresh_token(user.id, current.family_id)
+    if in_grace:
+        # Already replaced once; the concurrent caller gets a sibling in the same family, but only one
+        claimed = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == current.id, RefreshToken.grace_used_at.is_(None))
+            .values(grace_used_at=now)
+        )
+        if claimed.rowcount != 1:
+            print(f"Refresh token replayed twice for user {current.user_id}; revoking family {current.family_id}")
+            await _revoke_family(db, current.family_id)
+            raise _invalid_refresh_token
+        db.add(replacement)
+        await db.commit()
+        return user, new_token, current.family_id
+    # Only one concurrent request may rotate a given token; the loser retries as a just-rotated replay
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == current.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now, replaced_by_id=replacement.id)
+    )
+    if claimed.rowcount != 1:
+        await db.rollback()
+        return await rotate_refresh_token(db, token)
+    db.add(replacement)
+    await db.commit()
+    return user, new_token, current.family_id
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """
+    Logs out a session: revokes the token's family and, in this process, the access tokens
+    issued for it. Unknown tokens are ignored.
+    """
+    result = await db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == _hash_refresh_token(token))
+    )
+    family_id = result.scalar()
+    if family_id is not None:
+        await _revoke_family(db, family_id)
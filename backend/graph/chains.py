@@ -2,17 +2,36 @@ from langchain_openai import ChatOpenAI
 from langchain.chat_models import init_chat_model
 from deepagents import create_deep_agent
 from deepagents.backends import FilesystemBackend
-from .schemas import EmailSchema, LinkedInMessageSchema, CoverLetterSchema
+from langchain.agents.middleware import ModelCallLimitMiddleware, ToolCallLimitMiddleware
+from .schemas import EmailSchema, LinkedInMessageSchema, CoverLetterSchema, ContextSchema
 from .web_search_tool import internet_search
+from backend.core.config import CONTEXT_AGENT_MAX_TOOL_CALLS, CONTEXT_AGENT_MAX_MODEL_CALLS
 
 
 
 llm = ChatOpenAI(model_name="gpt-4.1-mini")
 
-agent = create_deep_agent(
-    tools=[internet_search],
-    model=llm
-)
+def create_context_agent(model, tools):
+    """The context research deep agent, with its tool and model call budgets."""
+    return create_deep_agent(
+        tools=tools,
+        model=model,
+        response_format=ContextSchema,
+        middleware=[
+            # Over budget, further tool calls are rejected and the model is left to answer with what it has
+            ToolCallLimitMiddleware(run_limit=CONTEXT_AGENT_MAX_TOOL_CALLS, exit_behavior="continue"),
+            ModelCallLimitMiddleware(run_limit=CONTEXT_AGENT_MAX_MODEL_CALLS, exit_behavior="end"),
+            # These limits only see this agent's own calls, and the built-in `task` tool would hand the
+            # work to a general-purpose subagent with every tool and no budget, so delegation is refused
+            ToolCallLimitMiddleware(tool_name="task", run_limit=0, exit_behavior="continue"),
+        ],
+    )
+
+
+agent = create_context_agent(llm, [internet_search])
+
+# Produces a best-effort context when the agent runs out of budget before answering
+context_llm = llm.with_structured_output(ContextSchema)
 
 
 email_llm = llm.with_structured_output(EmailSchema)
@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from backend.core.config import CHECKPOINT_URL, CHECKPOINT_TTL_DAYS, CHECKPOINT_GC_INTERVAL_SECONDS
+
+
+def draft_thread_id(jd_id, draft_type: str) -> str:
+    """Stable thread for one (job description, content type) pair, so revisions continue the saved conversation."""
+    return f"draft:{jd_id}:{draft_type}"
+
+
+def predraft_thread_id(content_id) -> str:
+    """Private thread of one speculative run; its conversation moves to draft_thread_id once the pre-draft is claimed."""
+    return f"predraft:{content_id}"
+
+
+def batch_thread_id(jd_id) -> str:
+    """Throwaway thread for a multi-type fan-out run; delete it once the run finishes."""
+    return f"draft:{jd_id}:batch:{uuid.uuid4()}"
+
+
+@asynccontextmanager
+async def open_checkpointer(url: str = CHECKPOINT_URL):
+    """Opens a Postgres saver for postgresql:// URLs and a SQLite saver for anything else (a file path)."""
+    if url.startswith(("postgres://", "postgresql://")):
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        async with AsyncPostgresSaver.from_conn_string(url) as saver:
+            await saver.setup()
+            yield saver
+    else:
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        async with AsyncSqliteSaver.from_conn_string(url.removeprefix("sqlite:///")) as saver:
+            await saver.setup()
+            yield saver
+
+
+async def delete_thread(saver, thread_id: str) -> None:
+    if saver is not None:
+        await saver.adelete_thread(thread_id)
+
+
+# Checkpoint ids are uuid6, which sort by creation time, so a thread's newest id dates its last checkpoint
+_STALE_THREADS_SQL = "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING max(checkpoint_id) < {param}"
+
+
+def checkpoint_id_at(moment: datetime) -> str:
+    """The smallest uuid6 checkpoint id LangGraph could issue at `moment`."""
+    ticks = int(moment.timestamp() * 10_000_000) + 0x01B21DD213814000  # 100ns intervals since 1582-10-15
+    value = (ticks >> 12) << 80 | 0x6 << 76 | (ticks & 0xFFF) << 64 | 0b10 << 62
+    return str(uuid.UUID(int=value))
+
+
+async def _stale_thread_ids(saver, cutoff: datetime) -> list[str]:
+    # Reads only the (thread_id, checkpoint_id) primary key; no checkpoint is loaded or deserialized
+    postgres = type(saver).__module__.startswith("langgraph.checkpoint.postgres")
+    query = _STALE_THREADS_SQL.format(param="%s" if postgres else "?")
+    async with saver.lock, saver.conn.cursor() as cur:
+        await cur.execute(query, (checkpoint_id_at(cutoff),))
+        rows = await cur.fetchall()
+    return [row["thread_id"] if postgres else row[0] for row in rows]
+
+
+async def collect_stale_threads(saver, max_age_days: int = CHECKPOINT_TTL_DAYS) -> int:
+    """Deletes every thread whose latest checkpoint is older than `max_age_days`. Returns the number deleted."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    stale = await _stale_thread_ids(saver, cutoff)
+    for thread_id in stale:
+        await saver.adelete_thread(thread_id)
+    return len(stale)
+
+
+async def run_checkpoint_gc(saver, interval: int = CHECKPOINT_GC_INTERVAL_SECONDS) -> None:
+    """Garbage-collects old draft threads forever; run as a background task."""
+    while True:
+        try:
+            deleted = await collect_stale_threads(saver)
+            if deleted:
+                print(f"Checkpoint GC deleted {deleted} stale threads")
+        except Exception as e:
+            print(f"Error collecting stale checkpoint threads: {e}")
+        await asyncio.sleep(interval)
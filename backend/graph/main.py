@@ -23,8 +23,18 @@ draft_graph.add_node('email_drafter_agent', email_drafter_agent)
 draft_graph.add_node('linkedin_message_agent', linkedin_message_agent)
 draft_graph.add_node('cover_letter_agent', cover_letter_agent)
 
+# The drafter node for each content type
+DRAFTER_NODES = {
+    'email': 'email_drafter_agent',
+    'linkedin_message': 'linkedin_message_agent',
+    'cover_letter': 'cover_letter_agent',
+}
+
 
 def route_start(state):
+    # A list of types fans out to every matching drafter node, which then run in parallel
+    if state.get('types'):
+        return list(state['types'])
     if state.get('type'):
         return state['type']
     return END
@@ -32,12 +42,7 @@ def route_start(state):
 draft_graph.add_conditional_edges(
     START,
     route_start,
-    {
-        'email': 'email_drafter_agent',
-        'linkedin_message': 'linkedin_message_agent',
-        'cover_letter': 'cover_letter_agent',
-        END: END
-    }
+    {**DRAFTER_NODES, END: END}
 )
 
 
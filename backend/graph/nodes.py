@@ -1,13 +1,20 @@
 from .state import GenerateState, DraftState
-from .chains import email_llm, linkedin_message_llm, cover_letter_llm, agent, llm
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langsmith import Client
+import asyncio
+from .chains import email_llm, linkedin_message_llm, cover_letter_llm, agent, llm, context_llm
+from .schemas import ContextSchema
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage, RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from backend.core.config import CONTEXT_AGENT_DEADLINE_SECONDS, DRAFT_HISTORY_MAX_REVISIONS
+from .prompt_registry import prompt_registry
 
-from dotenv import load_dotenv
-load_dotenv()
-client = Client()
+CONTEXT_PROMPT = "context_generator:40940ed8"
+EMAIL_PROMPT = "email_draft_prompt"
+LINKEDIN_MESSAGE_PROMPT = "linkedin_message_prompt"
+COVER_LETTER_PROMPT = "cover_letter_prompt"
 
-def content_generator(state: GenerateState) -> GenerateState:
+PROMPT_NAMES = [CONTEXT_PROMPT, EMAIL_PROMPT, LINKEDIN_MESSAGE_PROMPT, COVER_LETTER_PROMPT]
+
+async def content_generator(state: GenerateState) -> GenerateState:
     '''Generates the content for the email, linkedin message or cover letter'''
     
     current_jd = state.get('job_description', '').strip()
@@ -15,11 +22,11 @@ def content_generator(state: GenerateState) -> GenerateState:
     user_context = state.get('user_context', '').strip()
 
     print("Generating context...")
-    prompt_name = "context_generator:40940ed8"
-    prompt = client.pull_prompt(prompt_name)
-    messages = prompt.invoke({'job_description': state['job_description'], 'user_context': user_context}).to_messages()
-    response = agent.invoke({'messages': messages})
-    state['context'] = response['messages'][-1].content
+    prompt_name = CONTEXT_PROMPT
+    prompt = await prompt_registry.aget(prompt_name)
+    messages = (await prompt.ainvoke({'job_description': state['job_description'], 'user_context': user_context})).to_messages()
+    context = await run_context_agent(messages)
+    state['context'] = context.model_dump()
     
     # Capture metadata
     state['model_used'] = llm.model_name
@@ -28,54 +35,119 @@ def content_generator(state: GenerateState) -> GenerateState:
 
 
 
-def email_drafter_agent(state: DraftState) -> DraftState:
+async def run_context_agent(messages: list) -> ContextSchema:
+    """
+    Runs the context deep agent within its budget (tool calls, model calls and a
+    wall-clock deadline). If the budget runs out before the agent produces its
+    structured answer, the research gathered so far is condensed into a
+    best-effort ContextSchema with a single structured LLM call.
+    """
+    latest_messages = messages
+    try:
+        async with asyncio.timeout(CONTEXT_AGENT_DEADLINE_SECONDS):
+            async for agent_state in agent.astream({'messages': messages}, stream_mode="values"):
+                if agent_state.get('structured_response') is not None:
+                    return agent_state['structured_response']
+                latest_messages = agent_state.get('messages', latest_messages)
+    except TimeoutError:
+        print(f"Context agent hit its {CONTEXT_AGENT_DEADLINE_SECONDS}s deadline, finalizing best-effort context")
+    else:
+        print("Context agent exhausted its step budget, finalizing best-effort context")
+
+    research = "\n\n".join(
+        str(message.content) for message in latest_messages[len(messages):]
+        if isinstance(message, ToolMessage) or (isinstance(message, AIMessage) and message.content)
+    )
+    fallback_messages = list(messages)
+    fallback_messages.append(HumanMessage(content=(
+        "Research budget exhausted. Using only the information above and the research notes below, "
+        f"produce the final context now.\n\nResearch notes:\n{research[-20000:] or 'None'}"
+    )))
+    return await context_llm.ainvoke(fallback_messages)
+
+
+async def _draft_messages(state: DraftState, prompt_name: str, prompt_inputs: dict) -> tuple[list, list]:
+    """
+    Returns (messages to send to the drafter LLM, update for the saved conversation).
+
+    With feedback on a thread that already holds a conversation, the revision is
+    appended to it instead of rebuilding the prompt, and older revision turns are
+    dropped so the stored state stays bounded. Anything else starts a new conversation.
+    """
+    history = [] if state.get('types') else state.get('messages') or []
+    feedback = state.get('feedback')
+
+    if history and feedback:
+        revision = [HumanMessage(content=feedback)]
+        # Keep the original prompt and first draft plus the most recent revision turns
+        first_draft = next((i for i, m in enumerate(history) if isinstance(m, AIMessage)), len(history) - 1) + 1
+        turns = history[first_draft:]
+        keep = max(DRAFT_HISTORY_MAX_REVISIONS - 1, 0) * 2
+        dropped = turns[:max(len(turns) - keep, 0)]
+        kept = history[:first_draft] + turns[len(dropped):]
+        removals = [RemoveMessage(id=m.id) for m in dropped if m.id]
+        return kept + revision, removals + revision
+
+    prompt = await prompt_registry.aget(prompt_name)
+    messages = (await prompt.ainvoke(prompt_inputs)).to_messages()
+    if feedback:
+        messages.append(HumanMessage(content=feedback))
+    return messages, [RemoveMessage(id=REMOVE_ALL_MESSAGES), *messages]
+
+
+def _history_update(state: DraftState, history: list, response) -> dict:
+    # Fan-out runs draft several types at once and do not keep a per-type conversation
+    if state.get('types'):
+        return {}
+    return {'messages': history + [AIMessage(content=response.model_dump_json())]}
+
+
+async def email_drafter_agent(state: DraftState) -> dict:
     """Drafts an email to the HR/Recruiter based on the generated context."""
-    prompt_name = "email_draft_prompt"
-    prompt = client.pull_prompt(prompt_name)
-    messages = prompt.invoke({'context': state['context'], 'user_details': state['user_details']}).to_messages()
-    if state.get('feedback'):
-        messages.append(HumanMessage(content=state['feedback']))
+    prompt_name = EMAIL_PROMPT
+    messages, history = await _draft_messages(state, prompt_name, {'context': state['context'], 'user_details': state['user_details']})
     
-    response = email_llm.invoke(messages)
-    state['email'] = response.model_dump()
-    # Capture metadata
-    state['model_used'] = llm.model_name
-    state['prompt_version'] = prompt_name
-    return state
+    response = await email_llm.ainvoke(messages)
+    # Return only the keys this node owns so it can run in parallel with the other drafters
+    return {
+        'email': response.model_dump(),
+        'model_used': llm.model_name,
+        'prompt_version': prompt_name,
+        'prompt_versions': {'email': prompt_name},
+        **_history_update(state, history, response),
+    }
 
 
 
 
 
 
-def linkedin_message_agent(state: DraftState) -> DraftState:
+async def linkedin_message_agent(state: DraftState) -> dict:
     """Sends a LinkedIn message to the HR/Recruiter based on the generated context."""
-    prompt_name = "linkedin_message_prompt"
-    prompt = client.pull_prompt(prompt_name)
-    messages = prompt.invoke({'context': state['context']}).to_messages()
-    if state.get('feedback'):
-        messages.append(HumanMessage(content=state['feedback']))
+    prompt_name = LINKEDIN_MESSAGE_PROMPT
+    messages, history = await _draft_messages(state, prompt_name, {'context': state['context']})
     
       
-    response = linkedin_message_llm.invoke(messages)
-    state['linkedin_message'] = response.model_dump()
-    # Capture metadata
-    state['model_used'] = llm.model_name
-    state['prompt_version'] = prompt_name
-    return state
+    response = await linkedin_message_llm.ainvoke(messages)
+    return {
+        'linkedin_message': response.model_dump(),
+        'model_used': llm.model_name,
+        'prompt_version': prompt_name,
+        'prompt_versions': {'linkedin_message': prompt_name},
+        **_history_update(state, history, response),
+    }
 
 
     
-def cover_letter_agent(state: DraftState) -> DraftState:
+async def cover_letter_agent(state: DraftState) -> dict:
     """generate cover letter """
-    prompt_name = "cover_letter_prompt"
-    prompt = client.pull_prompt(prompt_name)
-    messages = prompt.invoke({'context': state['context']}).to_messages()
-    if state.get('feedback'):
-        messages.append(HumanMessage(content=state['feedback']))
-    response = cover_letter_llm.invoke(messages)
-    state['cover_letter'] = response.model_dump()
-    # Capture metadata
-    state['model_used'] = llm.model_name
-    state['prompt_version'] = prompt_name
-    return state
+    prompt_name = COVER_LETTER_PROMPT
+    messages, history = await _draft_messages(state, prompt_name, {'context': state['context']})
+    response = await cover_letter_llm.ainvoke(messages)
+    return {
+        'cover_letter': response.model_dump(),
+        'model_used': llm.model_name,
+        'prompt_version': prompt_name,
+        'prompt_versions': {'cover_letter': prompt_name},
+        **_history_update(state, history, response),
+    }
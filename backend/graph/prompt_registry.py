@@ -0,0 +1,193 @@
+import asyncio
+import os
+import time
+import threading
+from langchain_core.load import dumps, loads
+from langsmith import Client
+from backend.core.config import (
+    PROMPT_CACHE_TTL_SECONDS,
+    PROMPT_REFRESH_INTERVAL_SECONDS,
+    PROMPT_SNAPSHOT_DIR,
+)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+class PromptRegistry:
+    """
+    Local cache in front of the LangSmith prompt hub.
+
+    Prompts are served from an in-process TTL cache. Every prompt pulled from the
+    hub is also pinned to an on-disk snapshot, so a cold process (or a LangSmith
+    outage) can still serve the last known version. Stale entries are returned
+    immediately and refreshed in the background; the hub is only hit on the
+    request path when a prompt has neither a cached entry nor a snapshot.
+    """
+
+    def __init__(self, client: Client, ttl_seconds: int, snapshot_dir: str, refresh_interval: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_dir = snapshot_dir
+        self.refresh_interval = refresh_interval
+
+        self._entries = {}  # name -> (fetched_at, prompt)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.snapshot_loads = 0
+        self.hub_pulls = 0
+        self.hub_failures = 0
+
+    def get(self, name: str):
+        """Returns the prompt for `name`, pulling from the hub only on a cold miss."""
+        with self._lock:
+            entry = self._entries.get(name)
+
+        if entry:
+            fetched_at, prompt = entry
+            if time.monotonic() - fetched_at > self.ttl_seconds:
+                self.stale_hits += 1
+                self._schedule_refresh(name)
+            else:
+                self.hits += 1
+            return prompt
+
+        self.misses += 1
+        prompt = self._load_snapshot(name)
+        if prompt is not None:
+            self._store(name, prompt)
+            self._schedule_refresh(name)
+            return prompt
+
+        return self.refresh(name)
+
+    async def aget(self, name: str):
+        """Async variant of `get`; a cold pull from the hub runs off the event loop."""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry:
+            return self.get(name)
+        return await asyncio.to_thread(self.get, name)
+
+    def refresh(self, name: str):
+        """Pulls `name` from the hub, caching it and pinning a new snapshot."""
+        try:
+            prompt = self.client.pull_prompt(name)
+        except Exception:
+            self.hub_failures += 1
+            raise
+        self.hub_pulls += 1
+        self._store(name, prompt)
+        self._save_snapshot(name, prompt)
+        return prompt
+
+    def warm_up(self, names: list[str]) -> None:
+        """Loads every prompt in `names` into the cache, preferring the hub over snapshots."""
+        for name in names:
+            try:
+                self.refresh(name)
+            except Exception as e:
+                print(f"Warning: could not pull prompt {name} during warm-up: {e}")
+                prompt = self._load_snapshot(name)
+                if prompt is not None:
+                    self._store(name, prompt)
+
+    def start_background_refresh(self) -> None:
+        """Starts a daemon thread that periodically re-pulls every cached prompt."""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="prompt-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop_event.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "cached_prompts": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "snapshot_loads": self.snapshot_loads,
+            "hub_pulls": self.hub_pulls,
+            "hub_failures": self.hub_failures,
+        }
+
+    def _store(self, name: str, prompt) -> None:
+        with self._lock:
+            self._entries[name] = (time.monotonic(), prompt)
+
+    def _schedule_refresh(self, name: str) -> None:
+        with self._lock:
+            if name in self._refreshing:
+                return
+            self._refreshing.add(name)
+
+        def _run():
+            try:
+                self.refresh(name)
+            except Exception as e:
+                print(f"Warning: background refresh of prompt {name} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(name)
+
+        threading.Thread(target=_run, name=f"prompt-refresh-{name}", daemon=True).start()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_event.wait(self.refresh_interval):
+            with self._lock:
+                names = list(self._entries)
+            for name in names:
+                try:
+                    self.refresh(name)
+                except Exception as e:
+                    print(f"Warning: periodic refresh of prompt {name} failed: {e}")
+
+    def _snapshot_path(self, name: str) -> str:
+        safe_name = name.replace("/", "__").replace(":", "@")
+        return os.path.join(self.snapshot_dir, f"{safe_name}.json")
+
+    def _save_snapshot(self, name: str, prompt) -> None:
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            path = self._snapshot_path(name)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(dumps(prompt))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: could not write snapshot for prompt {name}: {e}")
+
+    def _load_snapshot(self, name: str):
+        path = self._snapshot_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                prompt = loads(f.read())
+        except Exception as e:
+            print(f"Warning: could not read snapshot for prompt {name}: {e}")
+            return None
+        self.snapshot_loads += 1
+        return prompt
+
+
+prompt_registry = PromptRegistry(
+    client=Client(),
+    ttl_seconds=PROMPT_CACHE_TTL_SECONDS,
+    snapshot_dir=PROMPT_SNAPSHOT_DIR,
+    refresh_interval=PROMPT_REFRESH_INTERVAL_SECONDS,
+)
@@ -16,4 +16,17 @@ class LinkedInMessageSchema(BaseModel):
 
 class CoverLetterSchema(BaseModel):
     """Schema for cover letter"""
-    body: str = Field(..., description="Body of the cover letter")
\ No newline at end of file
+    body: str = Field(..., description="Body of the cover letter")
+
+class ContextSchema(BaseModel):
+    """Schema for the context generated from a job description and the user's profile"""
+    job_title: str = Field(..., description="Title of the role being hired for")
+    company_name: str = Field(..., description="Name of the hiring company")
+    location: Optional[str] = Field(None, description="Location or remote policy of the role")
+    required_skills: List[str] = Field(default_factory=list, description="Skills and technologies the role requires")
+    responsibilities: List[str] = Field(default_factory=list, description="Key responsibilities of the role")
+    company_summary: Optional[str] = Field(None, description="What the company does, from the JD and web research")
+    recent_company_news: List[str] = Field(default_factory=list, description="Recent, relevant news about the company")
+    hiring_contact: Optional[str] = Field(None, description="Recruiter or hiring manager name/email if found")
+    matching_experience: List[str] = Field(default_factory=list, description="User experience that matches the role's requirements")
+    talking_points: List[str] = Field(default_factory=list, description="Angles to emphasize in outreach")
@@ -1,10 +1,23 @@
-from typing import TypedDict, List, Optional, Dict, Literal
+from typing import TypedDict, List, Optional, Dict, Literal, Annotated
+from langchain_core.messages import AnyMessage
+from langgraph.graph.message import add_messages
+
+
+def keep_last(current, new):
+    '''Reducer that lets parallel branches write the same key; the last write wins'''
+    return new
+
+
+def merge_dicts(current: dict | None, new: dict | None) -> dict:
+    '''Reducer that merges per-branch dicts written by parallel drafter nodes'''
+    return {**(current or {}), **(new or {})}
+
 
 class GenerateState(TypedDict):
     '''Defines the state of the graph which generates context for the job description'''
     user_context: str
     job_description: str
-    context: str
+    context: dict
     model_used: Optional[str]
     prompt_version: Optional[str]
 
@@ -14,10 +27,14 @@ class DraftState(TypedDict):
     user_details: str
     context: str
     type: Literal['email', 'cover_letter','linkedin_message']
+    # Set instead of `type` to draft several content types in parallel in one run
+    types: List[Literal['email', 'cover_letter','linkedin_message']]
     email: dict
     linkedin_message: dict
     cover_letter: dict
     feedback: str
-    model_used: Optional[str]
-    prompt_version: Optional[str]
-
+    model_used: Annotated[Optional[str], keep_last]
+    prompt_version: Annotated[Optional[str], keep_last]
+    prompt_versions: Annotated[Dict[str, str], merge_dicts]
+    # Drafting conversation kept by the checkpointer so feedback revisions can continue it
+    messages: Annotated[List[AnyMessage], add_messages]
@@ -0,0 +1,169 @@
+import time
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+class UsageTracker(BaseCallbackHandler):
+    """
+    Records token usage and timings for one graph run.
+
+    Pass an instance in `config["callbacks"]`. Every LLM and tool call is tagged
+    with the graph node it ran in (`langgraph_node` metadata), and every node's
+    wall time is measured, so a run can be summarized per node or as a whole.
+    """
+
+    # Callbacks only touch in-memory dicts, so run them on the event loop instead of a thread
+    run_inline = True
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.calls = []
+        self.node_started = {}  # node -> perf_counter at node start
+        self.node_latency_ms = {}  # node -> wall time in ms
+        self._llm_runs = {}  # run_id -> call dict
+        self._tool_runs = {}
+        self._node_runs = {}  # run_id -> node
+
+    def _offset_ms(self, now: float | None = None) -> int:
+        return round(((now or time.perf_counter()) - self.started_at) * 1000)
+
+    # Graph nodes
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # The node's own run is the chain named after it; inner runnables share the metadata
+        if node and kwargs.get("name") == node and node not in self.node_started:
+            self.node_started[node] = time.perf_counter()
+            self._node_runs[run_id] = node
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        node = self._node_runs.pop(run_id, None)
+        if node:
+            self.node_latency_ms[node] = round((time.perf_counter() - self.node_started[node]) * 1000)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self.on_chain_end(None, run_id=run_id)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs):
+        self._start_llm(run_id, metadata, kwargs.get("name") or (serialized or {}).get("name"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs):
+        self._start_llm(run_id, metadata, kwargs.get("name") or (serialized or {}).get("name"))
+
+    def on_llm_new_token(self, token, *, run_id: UUID, **kwargs):
+        call = self._llm_runs.get(run_id)
+        if call is not None and call["ttft_ms"] is None:
+            call["_first_token"] = time.perf_counter()
+            call["ttft_ms"] = round((call["_first_token"] - call["_start"]) * 1000)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs):
+        call = self._llm_runs.pop(run_id, None)
+        if call is None:
+            return
+        self._finish(call)
+        prompt_tokens, completion_tokens, cached_tokens = _token_usage(response)
+        call.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached_tokens=cached_tokens)
+        if call["ttft_ms"] is None:
+            # Not streamed: the first token arrives with the whole response
+            call["ttft_ms"] = call["latency_ms"]
+            call["_first_token"] = call["_start"] + call["latency_ms"] / 1000
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        call = self._llm_runs.pop(run_id, None)
+        if call is not None:
+            self._finish(call, error=error)
+
+    # Tool calls
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, metadata=None, **kwargs):
+        call = self._new_call("tool", metadata, kwargs.get("name") or (serialized or {}).get("name"))
+        self._tool_runs[run_id] = call
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        call = self._tool_runs.pop(run_id, None)
+        if call is not None:
+            self._finish(call)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs):
+        call = self._tool_runs.pop(run_id, None)
+        if call is not None:
+            self._finish(call, error=error)
+
+    # Summaries
+
+    def summary(self, node: str | None = None) -> dict:
+        """
+        Totals for one node, or for the whole run when `node` is None.
+
+        `ttft_ms` is measured from the start of the node (or run) to the first
+        token of its first LLM call; `latency_ms` is the node's (or run's) wall time.
+        """
+        calls = [c for c in self.calls if node is None or c["node"] == node]
+        llm_calls = [c for c in calls if c["kind"] == "llm"]
+        started = self.node_started.get(node, self.started_at) if node else self.started_at
+        if node and node in self.node_latency_ms:
+            latency_ms = self.node_latency_ms[node]
+        else:
+            latency_ms = self._offset_ms() - round((started - self.started_at) * 1000)
+
+        first_tokens = [c["_first_token"] for c in llm_calls if c.get("_first_token")]
+        ttft_ms = round((min(first_tokens) - started) * 1000) if first_tokens else None
+
+        return {
+            "prompt_tokens": sum(c.get("prompt_tokens") or 0 for c in llm_calls),
+            "completion_tokens": sum(c.get("completion_tokens") or 0 for c in llm_calls),
+            "cached_tokens": sum(c.get("cached_tokens") or 0 for c in llm_calls),
+            "ttft_ms": ttft_ms,
+            "latency_ms": latency_ms,
+            "llm_calls": len(llm_calls),
+            "tool_calls": len(calls) - len(llm_calls),
+            "calls": [{k: v for k, v in c.items() if not k.startswith("_")} for c in calls],
+        }
+
+    def _new_call(self, kind: str, metadata, name) -> dict:
+        call = {
+            "kind": kind,
+            "node": (metadata or {}).get("langgraph_node"),
+            "name": name,
+            "start_ms": self._offset_ms(),
+            "ttft_ms": None,
+            "latency_ms": None,
+            "_start": time.perf_counter(),
+        }
+        self.calls.append(call)
+        return call
+
+    def _start_llm(self, run_id: UUID, metadata, name) -> None:
+        call = self._new_call("llm", metadata, name)
+        call["model"] = (metadata or {}).get("ls_model_name")
+        self._llm_runs[run_id] = call
+
+    def _finish(self, call: dict, error: BaseException | None = None) -> None:
+        call["latency_ms"] = round((time.perf_counter() - call["_start"]) * 1000)
+        if error is not None:
+            call["error"] = f"{type(error).__name__}: {error}"
+        if call["kind"] == "tool":
+            call.pop("ttft_ms")
+
+
+def _token_usage(response: LLMResult) -> tuple[int | None, int | None, int | None]:
+    """Returns (prompt, completion, cached) token counts from an LLM result."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                details = usage.get("input_token_details") or {}
+                return usage.get("input_tokens"), usage.get("output_tokens"), details.get("cache_read", 0)
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if not token_usage:
+        return None, None, None
+    details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens"),
+        token_usage.get("completion_tokens"),
+        details.get("cached_tokens", 0),
+    )
@@ -1,10 +1,107 @@
 from tavily import TavilyClient
 from typing import Literal
+import re
+import json
+import time
+import sqlite3
+import threading
+from backend.core.config import SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_PATH
+from backend.utils.ttl_cache import TTLCache
 from dotenv import load_dotenv
 load_dotenv()
 
 tavily_client = TavilyClient()
 
+
+class SearchCache:
+    """
+    Caches Tavily responses keyed on (normalized query, topic, max_results).
+
+    Lookups hit a bounded in-memory TTL/LRU tier first and, when `path` is set,
+    fall back to a SQLite tier that survives restarts. Every hit adds the latency
+    of the original Tavily call to `saved_seconds`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, path: str | None = None):
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.persistent_hits = 0
+        self.saved_seconds = 0.0
+        self._db = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, latency REAL NOT NULL, result TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(query: str, topic: str, max_results: int) -> str:
+        normalized = re.sub(r"\s+", " ", query).strip().lower()
+        return f"{topic}|{max_results}|{normalized}"
+
+    def get(self, key: str):
+        entry = self.memory.get(key)
+        if entry is None and self._db is not None:
+            loaded = self._load(key)
+            if loaded is not None:
+                entry, expires_at = loaded
+                self.persistent_hits += 1
+                # Only for what is left of the stored lifetime, so the memory copy never outlives it
+                remaining = expires_at - time.time()
+                if remaining > 0:
+                    self.memory.set(key, entry, ttl=remaining)
+        if entry is None:
+            return None
+        result, latency = entry
+        self.saved_seconds += latency
+        return result
+
+    def set(self, key: str, result: dict, latency: float) -> None:
+        self.memory.set(key, (result, latency))
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, expires_at, latency, result) VALUES (?, ?, ?, ?)",
+                    (key, time.time() + self.ttl, latency, json.dumps(result)),
+                )
+                self._db.commit()
+
+    def stats(self) -> dict:
+        memory_stats = self.memory.stats()
+        # A persistent-tier hit is also counted as a memory miss
+        hits = memory_stats["hits"] + self.persistent_hits
+        lookups = memory_stats["hits"] + memory_stats["misses"]
+        return {
+            **memory_stats,
+            "persistent_hits": self.persistent_hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+    def _load(self, key: str):
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, latency, result FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[0] <= time.time():
+                self._db.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+        if not row:
+            return None
+        return (json.loads(row[2]), row[1]), row[0]
+
+
+search_cache = SearchCache(
+    maxsize=SEARCH_CACHE_MAX_ENTRIES,
+    ttl=SEARCH_CACHE_TTL_SECONDS,
+    path=SEARCH_CACHE_PATH,
+)
+
+
 def internet_search(
     query: str,
     max_results: int = 3,
@@ -12,14 +109,22 @@ def internet_search(
     include_raw_content: bool = False,
 ):
     """Run a web search"""
-    return tavily_client.search(
+    key = SearchCache.make_key(query, topic, max_results)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    start = time.perf_counter()
+    result = tavily_client.search(
         query,
         max_results=max_results,
         include_answer='advanced',
         topic=topic
     )
+    search_cache.set(key, result, time.perf_counter() - start)
+    return result
 
 
 if __name__ == "__main__":
     result = internet_search(query="What is the capital of France?")
-    print(result['answer'])
\ No newline at end of file
+    print(result['answer'])
@@ -1,10 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from backend.routers import users
 from backend.routers import auth
 from backend.routers import generation
+from backend.routers import metrics
+from backend.routers import analytics
+from backend.routers import search
+from backend.graph.nodes import PROMPT_NAMES
+from backend.graph.prompt_registry import prompt_registry
+from backend.graph.main import draft_graph
+from backend.graph.checkpointer import open_checkpointer, run_checkpoint_gc
+from backend.core.database import SQLITE_MODE, engine
+from backend.migrations import upgrade
+from backend.utils import parse_pool
+from backend.utils.speculative_drafts import run_predraft_gc
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Agent Mailer Backend", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SQLITE_MODE:
+        # A single-node database lives next to the app, so bring its schema up to date on start
+        await upgrade(engine)
+    # Load prompts before serving traffic so drafting never waits on the prompt hub
+    await asyncio.to_thread(prompt_registry.warm_up, PROMPT_NAMES)
+    prompt_registry.start_background_refresh()
+    async with open_checkpointer() as checkpointer:
+        draft_graph.checkpointer = checkpointer
+        gc_task = asyncio.create_task(run_checkpoint_gc(checkpointer))
+        predraft_gc_task = asyncio.create_task(run_predraft_gc())
+        yield
+        predraft_gc_task.cancel()
+        gc_task.cancel()
+        draft_graph.checkpointer = None
+    prompt_registry.stop_background_refresh()
+    parse_pool.shutdown()
+
+
+app = FastAPI(title="Agent Mailer Backend", version="1.0.0", lifespan=lifespan)
 
 
 # Adjust allowed origins after you know your frontend URL
@@ -19,3 +53,6 @@ app.add_middleware(
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(generation.router)
+app.include_router(metrics.router)
+app.include_router(analytics.router)
+app.include_router(search.router)
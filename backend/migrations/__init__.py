@@ -0,0 +1,2 @@
+from backend.migrations.runner import upgrade, downgrade, current_version, status
+from backend.migrations.plan_check import check_query_plans
@@ -0,0 +1,51 @@
+"""
+Schema migrations.
+
+    python -m backend.migrations upgrade [VERSION]   apply pending migrations (default: all)
+    python -m backend.migrations downgrade VERSION   revert migrations newer than VERSION
+    python -m backend.migrations status              list migrations and whether they are applied
+    python -m backend.migrations check-plans         fail if a hot query falls back to a sequential scan
+"""
+import argparse
+import asyncio
+import sys
+from backend.core.database import engine
+from backend.migrations import upgrade, downgrade, status, check_query_plans
+
+
+async def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.migrations", description="Database schema migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    up = commands.add_parser("upgrade", help="Apply pending migrations")
+    up.add_argument("version", type=int, nargs="?", default=None)
+    down = commands.add_parser("downgrade", help="Revert migrations newer than VERSION")
+    down.add_argument("version", type=int)
+    commands.add_parser("status", help="List migrations")
+    commands.add_parser("check-plans", help="EXPLAIN the hot queries and fail on sequential scans")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "upgrade":
+            applied = await upgrade(engine, args.version)
+            print(f"Applied {applied}" if applied else "Already up to date.")
+        elif args.command == "downgrade":
+            reverted = await downgrade(engine, args.version)
+            print(f"Reverted {reverted}" if reverted else "Nothing to revert.")
+        elif args.command == "status":
+            for migration in await status(engine):
+                mark = "x" if migration["applied"] else " "
+                print(f"[{mark}] {migration['version']:04d} {migration['description']}")
+        else:
+            failures = await check_query_plans(engine)
+            for name, tables in failures.items():
+                print(f"Sequential scan in '{name}': {', '.join(tables)}")
+            if failures:
+                return 1
+            print("Every hot query uses an index.")
+    finally:
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,113 @@
+import json
+import uuid
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Tables whose hot queries must be served by an index
+HOT_TABLES = {"job_descriptions", "generated_contents", "context_runs", "user_documents", "user_document_chunks", "refresh_tokens"}
+
+# Any values will do; only the shape of the plan matters
+_sample = {
+    "user_id": str(uuid.uuid4()),
+    "jd_id": str(uuid.uuid4()),
+    "document_id": str(uuid.uuid4()),
+    "content_type": "cold_email",
+    "cache_key": "0" * 64,
+    "family_id": str(uuid.uuid4()),
+}
+
+jobs = sa.table("job_descriptions", *(sa.column(c) for c in ("id", "title", "user_id", "created_at", "context_cache_key")))
+contents = sa.table("generated_contents", *(sa.column(c) for c in ("id", "user_id", "jd_id", "content_type", "is_provisional", "created_at")))
+runs = sa.table("context_runs", *(sa.column(c) for c in ("id", "user_id", "created_at")))
+documents = sa.table("user_documents", *(sa.column(c) for c in ("id", "user_id", "content_hash", "is_active")))
+chunks = sa.table("user_document_chunks", *(sa.column(c) for c in ("document_id", "position", "text")))
+refresh_tokens = sa.table("refresh_tokens", *(sa.column(c) for c in ("id", "family_id", "token_hash", "revoked_at")))
+
+# The per-user queries the API runs on every dashboard and history load
+HOT_QUERIES = {
+    "jobs by user": sa.select(jobs.c.id, jobs.c.title)
+        .where(jobs.c.user_id == _sample["user_id"])
+        .order_by(jobs.c.created_at.desc()),
+    "context cache lookup": sa.select(jobs.c.id)
+        .where(jobs.c.user_id == _sample["user_id"], jobs.c.context_cache_key == _sample["cache_key"]),
+    "contents by user": sa.select(contents.c.id)
+        .where(contents.c.user_id == _sample["user_id"], contents.c.is_provisional.is_(False))
+        .order_by(contents.c.created_at.desc()),
+    "contents by user and type": sa.select(contents.c.id)
+        .where(contents.c.user_id == _sample["user_id"], contents.c.content_type == _sample["content_type"])
+        .order_by(contents.c.created_at.desc()),
+    "contents by job": sa.select(contents.c.id)
+        .where(contents.c.jd_id == _sample["jd_id"], contents.c.content_type == _sample["content_type"]),
+    "context runs by user": sa.select(runs.c.id)
+        .where(runs.c.user_id == _sample["user_id"])
+        .order_by(runs.c.created_at.desc()),
+    "active document hashes": sa.select(documents.c.content_hash)
+        .where(documents.c.user_id == _sample["user_id"], documents.c.is_active.is_(True)),
+    "document chunks": sa.select(chunks.c.text)
+        .where(chunks.c.document_id == _sample["document_id"])
+        .order_by(chunks.c.position),
+    "refresh token lookup": sa.select(refresh_tokens.c.id)
+        .where(refresh_tokens.c.token_hash == _sample["cache_key"]),
+    "refresh token family": sa.select(refresh_tokens.c.id)
+        .where(refresh_tokens.c.family_id == _sample["family_id"], refresh_tokens.c.revoked_at.is_(None)),
+}
+
+
+def _explain(conn: Connection, prefix: str, query):
+    compiled = query.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[key] for key in compiled.positiontup)
+    return conn.exec_driver_sql(f"{prefix} {compiled}", params)
+
+
+def _postgres_scans(conn: Connection, query) -> list[str]:
+    # With seq scans priced out, the planner only picks one when no index can serve the query
+    conn.execute(sa.text("SET LOCAL enable_seqscan = off"))
+    plan = _explain(conn, "EXPLAIN (FORMAT JSON)", query).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+            scans.append(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return scans
+
+
+def _sqlite_scans(conn: Connection, query) -> list[str]:
+    scans = []
+    for row in _explain(conn, "EXPLAIN QUERY PLAN", query):
+        detail = row[-1]
+        # "SCAN t" is a full table scan; "SEARCH t USING INDEX ..." is an index lookup
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in HOT_TABLES and "INDEX" not in detail:
+            scans.append(words[1])
+    return scans
+
+
+def _check(conn: Connection) -> dict[str, list[str]]:
+    explain = _postgres_scans if conn.dialect.name == "postgresql" else _sqlite_scans
+    failures = {}
+    for name, query in HOT_QUERIES.items():
+        scans = explain(conn, query)
+        if scans:
+            failures[name] = scans
+    # Never keep the SET LOCAL (or anything else) from this check
+    conn.rollback()
+    return failures
+
+
+async def check_query_plans(engine: AsyncEngine) -> dict[str, list[str]]:
+    """
+    EXPLAINs every hot query and returns {query name: [tables scanned sequentially]}.
+    An empty dict means every hot query is served by an index.
+    """
+    async with engine.connect() as conn:
+        return await conn.run_sync(_check)
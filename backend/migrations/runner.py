@@ -0,0 +1,176 @@
+import importlib
+import pkgutil
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateColumn
+
+VERSIONS_PACKAGE = "backend.migrations.versions"
+
+schema_migrations = sa.Table(
+    "schema_migrations",
+    sa.MetaData(),
+    sa.Column("version", sa.Integer, primary_key=True),
+    sa.Column("description", sa.String(255), nullable=False),
+    sa.Column("applied_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+)
+
+
+class Operations:
+    """
+    Dialect-aware schema operations handed to each migration's upgrade/downgrade.
+
+    Every operation checks the live schema first, so a migration can be applied to
+    a database that already has some of its changes (e.g. from fix_db_schema.py).
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.dialect = conn.dialect
+
+    @property
+    def inspector(self):
+        # A fresh inspector each time; the cached one would not see earlier DDL
+        return sa.inspect(self.conn)
+
+    def has_table(self, table: str) -> bool:
+        return self.inspector.has_table(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        return any(c["name"] == column for c in self.inspector.get_columns(table))
+
+    def has_index(self, table: str, name: str) -> bool:
+        return any(i["name"] == name for i in self.inspector.get_indexes(table))
+
+    def create_table(self, name: str, *columns) -> None:
+        if self.has_table(name):
+            return
+        metadata = sa.MetaData()
+        referenced = {fk.target_fullname.split(".")[0] for c in columns if isinstance(c, sa.Column) for fk in c.foreign_keys}
+        for table in referenced - {name}:
+            sa.Table(table, metadata, autoload_with=self.conn)
+        sa.Table(name, metadata, *columns).create(self.conn)
+
+    def drop_table(self, name: str) -> None:
+        if self.has_table(name):
+            sa.Table(name, sa.MetaData(), autoload_with=self.conn).drop(self.conn)
+
+    def drop_enum(self, name: str) -> None:
+        """Drops a named enum type; only Postgres has them, other dialects store a VARCHAR."""
+        if self.dialect.name == "postgresql":
+            self.conn.execute(sa.text(f"DROP TYPE IF EXISTS {self._quote(name)}"))
+
+    def add_column(self, table: str, column: sa.Column) -> None:
+        if self.has_column(table, column.name):
+            return
+        sa.Table(table, sa.MetaData(), column)
+        spec = CreateColumn(column).compile(dialect=self.dialect)
+        self.conn.execute(sa.text(f"ALTER TABLE {self._quote(table)} ADD COLUMN {spec}"))
+
+    def drop_column(self, table: str, column: str) -> None:
+        if self.has_column(table, column):
+            self.conn.execute(sa.text(f"ALTER TABLE {self._quote(table)} DROP COLUMN {self._quote(column)}"))
+
+    def create_index(self, name: str, table: str, columns: list[str], unique: bool = False) -> None:
+        if self.has_index(table, name):
+            return
+        cols = ", ".join(self._quote(c) for c in columns)
+        unique_sql = "UNIQUE " if unique else ""
+        self.conn.execute(sa.text(f"CREATE {unique_sql}INDEX {self._quote(name)} ON {self._quote(table)} ({cols})"))
+
+    def drop_index(self, name: str, table: str) -> None:
+        if self.has_index(table, name):
+            self.conn.execute(sa.text(f"DROP INDEX {self._quote(name)}"))
+
+    def execute(self, statement, params: dict | None = None):
+        if isinstance(statement, str):
+            statement = sa.text(statement)
+        return self.conn.execute(statement, params or {})
+
+    def _quote(self, identifier: str) -> str:
+        return self.dialect.identifier_preparer.quote(identifier)
+
+
+def load_migrations() -> list:
+    """Returns every migration module in the versions package, ordered by `version`."""
+    package = importlib.import_module(VERSIONS_PACKAGE)
+    modules = [
+        importlib.import_module(f"{VERSIONS_PACKAGE}.{info.name}")
+        for info in pkgutil.iter_modules(package.__path__)
+    ]
+    modules.sort(key=lambda m: m.version)
+    versions = [m.version for m in modules]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return modules
+
+
+def _applied_versions(conn: Connection) -> list[int]:
+    schema_migrations.create(conn, checkfirst=True)
+    return sorted(conn.execute(sa.select(schema_migrations.c.version)).scalars())
+
+
+def _apply(conn: Connection, migration, direction: str) -> None:
+    ops = Operations(conn)
+    if direction == "up":
+        migration.upgrade(ops)
+        conn.execute(schema_migrations.insert().values(version=migration.version, description=migration.description))
+    else:
+        migration.downgrade(ops)
+        conn.execute(schema_migrations.delete().where(schema_migrations.c.version == migration.version))
+
+
+async def current_version(engine: AsyncEngine) -> int:
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(_applied_versions)
+    return applied[-1] if applied else 0
+
+
+async def status(engine: AsyncEngine) -> list[dict]:
+    """Lists every known migration and whether it has been applied."""
+    async with engine.begin() as conn:
+        applied = set(await conn.run_sync(_applied_versions))
+    return [
+        {"version": m.version, "description": m.description, "applied": m.version in applied}
+        for m in load_migrations()
+    ]
+
+
+async def upgrade(engine: AsyncEngine, target: int | None = None) -> list[int]:
+    """
+    Applies pending migrations up to `target` (default: latest), each in its own transaction.
+
+    Returns:
+        list[int]: The versions applied.
+    """
+    async with engine.begin() as conn:
+        applied = set(await conn.run_sync(_applied_versions))
+    done = []
+    for migration in load_migrations():
+        if migration.version in applied or (target is not None and migration.version > target):
+            continue
+        print(f"Applying migration {migration.version}: {migration.description}")
+        async with engine.begin() as conn:
+            await conn.run_sync(_apply, migration, "up")
+        done.append(migration.version)
+    return done
+
+
+async def downgrade(engine: AsyncEngine, target: int) -> list[int]:
+    """
+    Reverts applied migrations newer than `target`, newest first.
+
+    Returns:
+        list[int]: The versions reverted.
+    """
+    async with engine.begin() as conn:
+        applied = set(await conn.run_sync(_applied_versions))
+    done = []
+    for migration in reversed(load_migrations()):
+        if migration.version not in applied or migration.version <= target:
+            continue
+        print(f"Reverting migration {migration.version}: {migration.description}")
+        async with engine.begin() as conn:
+            await conn.run_sync(_apply, migration, "down")
+        done.append(migration.version)
+    return done
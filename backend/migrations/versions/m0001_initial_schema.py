@@ -0,0 +1,59 @@
+"""Tables as they existed before versioned migrations. Existing databases adopt this as-is."""
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+version = 1
+description = "initial schema"
+
+CONTENT_TYPES = ("cold_email", "linkedin_message", "cover_letter")
+
+
+def upgrade(op):
+    op.create_table(
+        "users",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("email", sa.String(255), unique=True, nullable=False),
+        sa.Column("username", sa.String(150), unique=True, nullable=True),
+        sa.Column("password_hash", sa.Text, nullable=False),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("user_context", sa.Text, nullable=True),
+        sa.Column("role", sa.String(50), nullable=False),
+        sa.Column("first_name", sa.String(100)),
+        sa.Column("last_name", sa.String(100)),
+        sa.Column("phone", sa.String(50)),
+        sa.Column("linkedin", sa.String(255)),
+        sa.Column("github", sa.String(255)),
+        sa.Column("portfolio", sa.String(255)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "job_descriptions",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("company", sa.String(255), nullable=False),
+        sa.Column("jd_text", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("generated_context", sa.Text, nullable=True),
+    )
+    op.create_table(
+        "generated_contents",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("jd_id", UUID(as_uuid=True), sa.ForeignKey("job_descriptions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("content_type", sa.Enum(*CONTENT_TYPES, name="content_type_enum"), nullable=False),
+        sa.Column("to_address", sa.Text),
+        sa.Column("subject", sa.Text),
+        sa.Column("body", sa.Text, nullable=False),
+        sa.Column("model_used", sa.String(100)),
+        sa.Column("prompt_version", sa.String(50)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade(op):
+    op.drop_table("generated_contents")
+    op.drop_table("job_descriptions")
+    op.drop_table("users")
+    op.drop_enum("content_type_enum")
@@ -0,0 +1,20 @@
+"""Context cache key on job descriptions and the provisional flag for speculative drafts."""
+import sqlalchemy as sa
+
+version = 2
+description = "context cache key and provisional drafts"
+
+
+def upgrade(op):
+    op.add_column("job_descriptions", sa.Column("context_cache_key", sa.String(64), nullable=True))
+    op.create_index("ix_job_descriptions_context_cache_key", "job_descriptions", ["context_cache_key"])
+    op.add_column(
+        "generated_contents",
+        sa.Column("is_provisional", sa.Boolean, server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade(op):
+    op.drop_column("generated_contents", "is_provisional")
+    op.drop_index("ix_job_descriptions_context_cache_key", "job_descriptions")
+    op.drop_column("job_descriptions", "context_cache_key")
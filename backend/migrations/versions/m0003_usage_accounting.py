@@ -0,0 +1,36 @@
+"""Token usage and timing columns on drafts, and the context_runs table."""
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+version = 3
+description = "usage accounting"
+
+USAGE_COLUMNS = ("prompt_tokens", "completion_tokens", "cached_tokens", "ttft_ms", "latency_ms")
+
+
+def upgrade(op):
+    for column in USAGE_COLUMNS:
+        op.add_column("generated_contents", sa.Column(column, sa.Integer, nullable=True))
+    op.add_column("generated_contents", sa.Column("usage", sa.JSON, nullable=True))
+    op.create_table(
+        "context_runs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("jd_id", UUID(as_uuid=True), sa.ForeignKey("job_descriptions.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("model_used", sa.String(100)),
+        sa.Column("prompt_version", sa.String(50)),
+        sa.Column("cache_hit", sa.Boolean, server_default=sa.false(), nullable=False),
+        sa.Column("succeeded", sa.Boolean, server_default=sa.true(), nullable=False),
+        *(sa.Column(column, sa.Integer) for column in USAGE_COLUMNS),
+        sa.Column("llm_calls", sa.Integer),
+        sa.Column("tool_calls", sa.Integer),
+        sa.Column("usage", sa.JSON),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade(op):
+    op.drop_table("context_runs")
+    op.drop_column("generated_contents", "usage")
+    for column in reversed(USAGE_COLUMNS):
+        op.drop_column("generated_contents", column)
@@ -0,0 +1,22 @@
+"""Composite indexes for the per-user listing, history and lookup queries."""
+
+version = 4
+description = "indexes for hot queries"
+
+INDEXES = [
+    ("ix_job_descriptions_user_id_created_at", "job_descriptions", ["user_id", "created_at"]),
+    ("ix_generated_contents_user_id_created_at", "generated_contents", ["user_id", "created_at"]),
+    ("ix_generated_contents_user_id_content_type_created_at", "generated_contents", ["user_id", "content_type", "created_at"]),
+    ("ix_generated_contents_jd_id_content_type", "generated_contents", ["jd_id", "content_type"]),
+    ("ix_context_runs_user_id_created_at", "context_runs", ["user_id", "created_at"]),
+]
+
+
+def upgrade(op):
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade(op):
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table)
@@ -0,0 +1,97 @@
+"""Chunked, deduplicated user documents; moves each users.user_context blob into one document."""
+import hashlib
+import uuid
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+version = 5
+description = "user documents"
+
+CHUNK_CHARS = 4000
+
+
+def upgrade(op):
+    op.create_table(
+        "user_documents",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("char_count", sa.Integer, nullable=False),
+        sa.Column("chunk_count", sa.Integer, nullable=False),
+        sa.Column("is_active", sa.Boolean, server_default=sa.true(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("user_id", "content_hash", name="uq_user_documents_user_id_content_hash"),
+    )
+    op.create_index("ix_user_documents_user_id_is_active", "user_documents", ["user_id", "is_active"])
+    op.create_table(
+        "user_document_chunks",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("document_id", UUID(as_uuid=True), sa.ForeignKey("user_documents.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("text", sa.Text, nullable=False),
+        sa.UniqueConstraint("document_id", "position", name="uq_user_document_chunks_document_id_position"),
+    )
+
+    users = sa.table("users", sa.column("id", UUID(as_uuid=True)), sa.column("user_context", sa.Text))
+    documents = sa.table(
+        "user_documents",
+        sa.column("id", UUID(as_uuid=True)),
+        sa.column("user_id", UUID(as_uuid=True)),
+        *(sa.column(c) for c in ("filename", "content_hash", "char_count", "chunk_count")),
+    )
+    chunks = sa.table(
+        "user_document_chunks",
+        sa.column("id", UUID(as_uuid=True)),
+        sa.column("document_id", UUID(as_uuid=True)),
+        sa.column("position"),
+        sa.column("text"),
+    )
+    legacy = op.execute(sa.select(users.c.id, users.c.user_context).where(users.c.user_context.is_not(None))).all()
+    for user_id, text in legacy:
+        text = text.strip()
+        if not text:
+            continue
+        document_id = uuid.uuid4()
+        parts = [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+        op.execute(documents.insert().values(
+            id=document_id,
+            user_id=user_id,
+            filename="legacy_context.txt",
+            content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            char_count=len(text),
+            chunk_count=len(parts),
+        ))
+        op.execute(chunks.insert(), [
+            {"id": uuid.uuid4(), "document_id": document_id, "position": i, "text": part}
+            for i, part in enumerate(parts)
+        ])
+    op.execute(users.update().values(user_context=None))
+
+
+def downgrade(op):
+    if op.has_table("user_documents"):
+        users = sa.table("users", sa.column("id", UUID(as_uuid=True)), sa.column("user_context", sa.Text))
+        documents = sa.table(
+            "user_documents",
+            sa.column("id", UUID(as_uuid=True)),
+            sa.column("user_id", UUID(as_uuid=True)),
+            sa.column("is_active", sa.Boolean),
+            sa.column("created_at"),
+        )
+        chunks = sa.table("user_document_chunks", sa.column("document_id", UUID(as_uuid=True)), sa.column("position"), sa.column("text"))
+        rows = op.execute(
+            sa.select(documents.c.user_id, documents.c.id, chunks.c.text)
+            .join(chunks, chunks.c.document_id == documents.c.id)
+            .where(documents.c.is_active.is_(True))
+            .order_by(documents.c.user_id, documents.c.created_at, documents.c.id, chunks.c.position)
+        ).all()
+        contexts = {}
+        for user_id, document_id, text in rows:
+            contexts.setdefault(user_id, {}).setdefault(document_id, []).append(text)
+        for user_id, user_documents in contexts.items():
+            context = "\n\n---\n\n".join("".join(parts) for parts in user_documents.values())
+            op.execute(users.update().where(users.c.id == user_id).values(user_context=context))
+    op.drop_table("user_document_chunks")
+    op.drop_index("ix_user_documents_user_id_is_active", "user_documents")
+    op.drop_table("user_documents")
@@ -0,0 +1,23 @@
+"""Stores job_descriptions.generated_context as JSONB on Postgres.
+
+SQLite keeps the column as TEXT: SQLAlchemy's JSON type stores JSON text there,
+which is what json.dumps already wrote, so existing rows need no conversion.
+"""
+
+version = 6
+description = "generated_context as JSONB"
+
+
+def upgrade(op):
+    if op.dialect.name != "postgresql":
+        return
+    op.execute(
+        "ALTER TABLE job_descriptions ALTER COLUMN generated_context TYPE JSONB "
+        "USING NULLIF(generated_context, 'null')::jsonb"
+    )
+
+
+def downgrade(op):
+    if op.dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE job_descriptions ALTER COLUMN generated_context TYPE TEXT USING generated_context::text")
@@ -0,0 +1,140 @@
+"""Full-text search over job descriptions and drafts.
+
+Postgres: a `search_vector` tsvector column with a GIN index on both tables. The job
+column is generated from title, company and jd_text; the draft column is filled by a
+trigger from subject and body plus its job's title and company, so a draft can be
+found by the company it was written for.
+
+SQLite: FTS5 tables with the same columns, kept in sync by triggers.
+"""
+
+version = 7
+description = "full-text search"
+
+PG_UPGRADE = [
+    """
+    ALTER TABLE job_descriptions ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(company, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(jd_text, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_job_descriptions_search_vector ON job_descriptions USING GIN (search_vector)",
+    "ALTER TABLE generated_contents ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION generated_contents_search_vector() RETURNS trigger AS $$
+    BEGIN
+        SELECT setweight(to_tsvector('english', coalesce(NEW.subject, '')), 'A') ||
+               setweight(to_tsvector('english', coalesce(NEW.body, '')), 'B') ||
+               setweight(to_tsvector('english', coalesce(j.title, '') || ' ' || coalesce(j.company, '')), 'C')
+        INTO NEW.search_vector
+        FROM job_descriptions j
+        WHERE j.id = NEW.jd_id;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS generated_contents_search_vector ON generated_contents",
+    """
+    CREATE TRIGGER generated_contents_search_vector
+    BEFORE INSERT OR UPDATE OF subject, body, jd_id ON generated_contents
+    FOR EACH ROW EXECUTE FUNCTION generated_contents_search_vector()
+    """,
+    """
+    UPDATE generated_contents g SET search_vector =
+        setweight(to_tsvector('english', coalesce(g.subject, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(g.body, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(j.title, '') || ' ' || coalesce(j.company, '')), 'C')
+    FROM job_descriptions j
+    WHERE j.id = g.jd_id
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_generated_contents_search_vector ON generated_contents USING GIN (search_vector)",
+]
+
+PG_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_generated_contents_search_vector",
+    "DROP TRIGGER IF EXISTS generated_contents_search_vector ON generated_contents",
+    "DROP FUNCTION IF EXISTS generated_contents_search_vector()",
+    "ALTER TABLE generated_contents DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS ix_job_descriptions_search_vector",
+    "ALTER TABLE job_descriptions DROP COLUMN IF EXISTS search_vector",
+]
+
+# External content table: the text stays in job_descriptions, FTS5 only keeps the index
+_JOB_COLUMNS = "title, company, jd_text"
+_DRAFT_INSERT = """
+    INSERT INTO generated_contents_fts(rowid, subject, body, job_title, company)
+    SELECT {row}.rowid, {row}.subject, {row}.body, j.title, j.company
+    FROM job_descriptions j WHERE j.id = {row}.jd_id
+"""
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_descriptions_fts USING fts5("
+    f"{_JOB_COLUMNS}, content='job_descriptions', content_rowid='rowid', tokenize='porter unicode61')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS job_descriptions_fts_insert AFTER INSERT ON job_descriptions BEGIN
+        INSERT INTO job_descriptions_fts(rowid, {_JOB_COLUMNS}) VALUES (new.rowid, new.title, new.company, new.jd_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS job_descriptions_fts_delete AFTER DELETE ON job_descriptions BEGIN
+        INSERT INTO job_descriptions_fts(job_descriptions_fts, rowid, {_JOB_COLUMNS})
+        VALUES ('delete', old.rowid, old.title, old.company, old.jd_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS job_descriptions_fts_update AFTER UPDATE OF {_JOB_COLUMNS} ON job_descriptions BEGIN
+        INSERT INTO job_descriptions_fts(job_descriptions_fts, rowid, {_JOB_COLUMNS})
+        VALUES ('delete', old.rowid, old.title, old.company, old.jd_text);
+        INSERT INTO job_descriptions_fts(rowid, {_JOB_COLUMNS}) VALUES (new.rowid, new.title, new.company, new.jd_text);
+    END
+    """,
+    "INSERT INTO job_descriptions_fts(job_descriptions_fts) VALUES ('rebuild')",
+    # Drafts also index their job's title and company, so they keep their own copy
+    "CREATE VIRTUAL TABLE IF NOT EXISTS generated_contents_fts USING fts5("
+    "subject, body, job_title, company, tokenize='porter unicode61')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS generated_contents_fts_insert AFTER INSERT ON generated_contents BEGIN
+        {_DRAFT_INSERT.format(row="new")};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS generated_contents_fts_delete AFTER DELETE ON generated_contents BEGIN
+        DELETE FROM generated_contents_fts WHERE rowid = old.rowid;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS generated_contents_fts_update AFTER UPDATE OF subject, body, jd_id ON generated_contents BEGIN
+        DELETE FROM generated_contents_fts WHERE rowid = old.rowid;
+        {_DRAFT_INSERT.format(row="new")};
+    END
+    """,
+    "DELETE FROM generated_contents_fts",
+    """
+    INSERT INTO generated_contents_fts(rowid, subject, body, job_title, company)
+    SELECT g.rowid, g.subject, g.body, j.title, j.company
+    FROM generated_contents g JOIN job_descriptions j ON j.id = g.jd_id
+    """,
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS generated_contents_fts_update",
+    "DROP TRIGGER IF EXISTS generated_contents_fts_delete",
+    "DROP TRIGGER IF EXISTS generated_contents_fts_insert",
+    "DROP TABLE IF EXISTS generated_contents_fts",
+    "DROP TRIGGER IF EXISTS job_descriptions_fts_update",
+    "DROP TRIGGER IF EXISTS job_descriptions_fts_delete",
+    "DROP TRIGGER IF EXISTS job_descriptions_fts_insert",
+    "DROP TABLE IF EXISTS job_descriptions_fts",
+]
+
+
+def upgrade(op):
+    for statement in PG_UPGRADE if op.dialect.name == "postgresql" else SQLITE_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade(op):
+    for statement in PG_DOWNGRADE if op.dialect.name == "postgresql" else SQLITE_DOWNGRADE:
+        op.execute(statement)
@@ -0,0 +1,20 @@
+"""SQLite only: rewrite whole-second created_at values in the format bound datetimes use."""
+
+version = 9
+description = "sqlite created_at precision"
+
+# Tables whose created_at defaulted to CURRENT_TIMESTAMP ("YYYY-MM-DD HH:MM:SS") before utcnow()
+TABLES = ("users", "job_descriptions", "generated_contents", "context_runs", "user_documents", "refresh_tokens")
+
+
+def upgrade(op):
+    if op.dialect.name != "sqlite":
+        return  # Postgres stores timestamptz, not text
+    for table in TABLES:
+        # Keyset cursors compare created_at as text on SQLite, so every row needs the
+        # "YYYY-MM-DD HH:MM:SS.ffffff" form SQLAlchemy binds datetimes in
+        op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+
+def downgrade(op):
+    pass  # the padded values are still valid timestamps
@@ -0,0 +1,13 @@
+"""Records when a rotated refresh token used its one grace-window replay."""
+import sqlalchemy as sa
+
+version = 10
+description = "refresh token grace use"
+
+
+def upgrade(op):
+    op.add_column("refresh_tokens", sa.Column("grace_used_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade(op):
+    op.drop_column("refresh_tokens", "grace_used_at")
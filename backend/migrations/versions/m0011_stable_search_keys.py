@@ -0,0 +1,122 @@
+"""Full-text search keyed on ids that survive VACUUM, and drafts re-indexed when their job changes.
+
+SQLite: the FTS5 tables from 0007 were keyed on the implicit rowid of tables whose primary
+key is a UUID, which VACUUM may renumber. They are rebuilt as ordinary FTS5 tables holding
+the row's id in an UNINDEXED column, which searches join on. Deleting or updating a row now
+finds its index entry by a scan of the FTS table rather than by rowid.
+
+Both: a draft indexes its job's title and company, so an update to those re-indexes the
+job's drafts.
+"""
+
+version = 11
+description = "stable full-text search keys"
+
+PG_UPGRADE = [
+    """
+    CREATE OR REPLACE FUNCTION job_descriptions_draft_search_vector() RETURNS trigger AS $$
+    BEGIN
+        UPDATE generated_contents g SET search_vector =
+            setweight(to_tsvector('english', coalesce(g.subject, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(g.body, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.title, '') || ' ' || coalesce(NEW.company, '')), 'C')
+        WHERE g.jd_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS job_descriptions_draft_search_vector ON job_descriptions",
+    """
+    CREATE TRIGGER job_descriptions_draft_search_vector
+    AFTER UPDATE OF title, company ON job_descriptions
+    FOR EACH ROW
+    WHEN (OLD.title IS DISTINCT FROM NEW.title OR OLD.company IS DISTINCT FROM NEW.company)
+    EXECUTE FUNCTION job_descriptions_draft_search_vector()
+    """,
+]
+
+PG_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS job_descriptions_draft_search_vector ON job_descriptions",
+    "DROP FUNCTION IF EXISTS job_descriptions_draft_search_vector()",
+]
+
+_DROP_0007 = [
+    "DROP TRIGGER IF EXISTS generated_contents_fts_update",
+    "DROP TRIGGER IF EXISTS generated_contents_fts_delete",
+    "DROP TRIGGER IF EXISTS generated_contents_fts_insert",
+    "DROP TABLE IF EXISTS generated_contents_fts",
+    "DROP TRIGGER IF EXISTS job_descriptions_fts_update",
+    "DROP TRIGGER IF EXISTS job_descriptions_fts_delete",
+    "DROP TRIGGER IF EXISTS job_descriptions_fts_insert",
+    "DROP TABLE IF EXISTS job_descriptions_fts",
+]
+
+_JOB_COLUMNS = "title, company, jd_text"
+_DRAFT_INSERT = """
+    INSERT INTO generated_contents_fts(id, subject, body, job_title, company)
+    SELECT {row}.id, {row}.subject, {row}.body, j.title, j.company
+    FROM job_descriptions j WHERE j.id = {row}.jd_id
+"""
+
+SQLITE_UPGRADE = _DROP_0007 + [
+    "CREATE VIRTUAL TABLE job_descriptions_fts USING fts5("
+    f"id UNINDEXED, {_JOB_COLUMNS}, tokenize='porter unicode61')",
+    f"""
+    CREATE TRIGGER job_descriptions_fts_insert AFTER INSERT ON job_descriptions BEGIN
+        INSERT INTO job_descriptions_fts(id, {_JOB_COLUMNS}) VALUES (new.id, new.title, new.company, new.jd_text);
+    END
+    """,
+    """
+    CREATE TRIGGER job_descriptions_fts_delete AFTER DELETE ON job_descriptions BEGIN
+        DELETE FROM job_descriptions_fts WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER job_descriptions_fts_update AFTER UPDATE OF {_JOB_COLUMNS} ON job_descriptions BEGIN
+        UPDATE job_descriptions_fts SET title = new.title, company = new.company, jd_text = new.jd_text
+        WHERE id = old.id;
+        UPDATE generated_contents_fts SET job_title = new.title, company = new.company
+        WHERE id IN (SELECT id FROM generated_contents WHERE jd_id = new.id);
+    END
+    """,
+    f"INSERT INTO job_descriptions_fts(id, {_JOB_COLUMNS}) SELECT id, {_JOB_COLUMNS} FROM job_descriptions",
+    "CREATE VIRTUAL TABLE generated_contents_fts USING fts5("
+    "id UNINDEXED, subject, body, job_title, company, tokenize='porter unicode61')",
+    f"""
+    CREATE TRIGGER generated_contents_fts_insert AFTER INSERT ON generated_contents BEGIN
+        {_DRAFT_INSERT.format(row="new")};
+    END
+    """,
+    """
+    CREATE TRIGGER generated_contents_fts_delete AFTER DELETE ON generated_contents BEGIN
+        DELETE FROM generated_contents_fts WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER generated_contents_fts_update AFTER UPDATE OF subject, body, jd_id ON generated_contents BEGIN
+        DELETE FROM generated_contents_fts WHERE id = old.id;
+        {_DRAFT_INSERT.format(row="new")};
+    END
+    """,
+    """
+    INSERT INTO generated_contents_fts(id, subject, body, job_title, company)
+    SELECT g.id, g.subject, g.body, j.title, j.company
+    FROM generated_contents g JOIN job_descriptions j ON j.id = g.jd_id
+    """,
+]
+
+
+def upgrade(op):
+    for statement in PG_UPGRADE if op.dialect.name == "postgresql" else SQLITE_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade(op):
+    if op.dialect.name == "postgresql":
+        for statement in PG_DOWNGRADE:
+            op.execute(statement)
+        return
+    from backend.migrations.versions.m0007_full_text_search import SQLITE_UPGRADE as SQLITE_0007
+
+    for statement in _DROP_0007 + SQLITE_0007:
+        op.execute(statement)
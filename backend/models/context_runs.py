@@ -0,0 +1,31 @@
+import uuid
+from sqlalchemy import String, DateTime, ForeignKey, func, Boolean, false, true, Integer, JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from backend.core.database import Base, utcnow
+
+
+class ContextRun(Base):
+    """One /generation/context request: a generate_graph run or a context cache hit."""
+    __tablename__ = "context_runs"
+    __table_args__ = (Index("ix_context_runs_user_id_created_at", "user_id", "created_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    jd_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("job_descriptions.id", ondelete="SET NULL"), nullable=True)
+
+    model_used: Mapped[str] = mapped_column(String(100), nullable=True)
+    prompt_version: Mapped[str] = mapped_column(String(50), nullable=True)
+    cache_hit: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
+    succeeded: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true(), nullable=False)
+
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    ttft_ms: Mapped[int] = mapped_column(Integer, nullable=True)
+    latency_ms: Mapped[int] = mapped_column(Integer, nullable=True)
+    llm_calls: Mapped[int] = mapped_column(Integer, nullable=True)
+    tool_calls: Mapped[int] = mapped_column(Integer, nullable=True)
+    usage: Mapped[dict] = mapped_column(JSON, nullable=True)  # per node and per LLM/tool call breakdown
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
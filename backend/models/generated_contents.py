@@ -1,9 +1,9 @@
 import uuid
 import enum
-from sqlalchemy import String, Text, DateTime, ForeignKey, func, Enum
+from sqlalchemy import String, Text, DateTime, ForeignKey, func, Enum, Boolean, false, Integer, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
-from backend.core.database import Base
+from backend.core.database import Base, utcnow
 
 class ContentTypes(str, enum.Enum):
     COLD_EMAIL = "cold_email"
@@ -12,6 +12,13 @@ class ContentTypes(str, enum.Enum):
 
 class GeneratedContents(Base):
     __tablename__ = "generated_contents"
+    __table_args__ = (
+        Index("ix_generated_contents_user_id_created_at", "user_id", "created_at"),
+        Index("ix_generated_contents_user_id_content_type_created_at", "user_id", "content_type", "created_at"),
+        Index("ix_generated_contents_jd_id_content_type", "jd_id", "content_type"),
+    )
+    # Full-text search lives outside the ORM (migrations 0007 and 0011): a trigger-filled tsvector column on
+    # Postgres, the generated_contents_fts table on SQLite; see backend/utils/full_text_search.py
     
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -26,9 +33,21 @@ class GeneratedContents(Base):
     
     model_used: Mapped[str] = mapped_column(String(100), nullable=True)
     prompt_version: Mapped[str] = mapped_column(String(50), nullable=True)
+
+    # Speculatively pre-drafted rows stay hidden from listings until draft_context claims them
+    is_provisional: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
+
+    # Token usage and timings of the drafter node that produced this row
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    ttft_ms: Mapped[int] = mapped_column(Integer, nullable=True)
+    latency_ms: Mapped[int] = mapped_column(Integer, nullable=True)
+    usage: Mapped[dict] = mapped_column(JSON, nullable=True)  # per LLM/tool call breakdown
     
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), 
+        default=utcnow,
         server_default=func.now(), 
         nullable=False
     )
\ No newline at end of file
@@ -1,18 +1,25 @@
-from sqlalchemy import String, Text, DateTime, ForeignKey, func 
+from sqlalchemy import String, Text, DateTime, ForeignKey, func, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
-from backend.core.database import Base
+from backend.core.database import Base, utcnow
 
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (Index("ix_job_descriptions_user_id_created_at", "user_id", "created_at"),)
+    # Full-text search lives outside the ORM (migrations 0007 and 0011): a generated tsvector column on
+    # Postgres, the job_descriptions_fts table on SQLite; see backend/utils/full_text_search.py
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     company: Mapped[str] = mapped_column(String(255), nullable=False)
     jd_text: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    generated_context: Mapped[str] = mapped_column(Text, nullable=True)
+    # JSONB on Postgres, JSON text elsewhere; none_as_null keeps "no context" as SQL NULL rather than JSON null
+    generated_context: Mapped[dict] = mapped_column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True
+    )
+    context_cache_key: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
 
     
\ No newline at end of file
@@ -0,0 +1,32 @@
+import uuid
+from sqlalchemy import String, DateTime, ForeignKey, func, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from backend.core.database import Base, utcnow
+
+
+class RefreshToken(Base):
+    """
+    One issued refresh token. Only its SHA-256 is stored.
+
+    Every refresh revokes the presented token and issues its replacement in the same
+    family; presenting an already revoked token means it was stolen or replayed, so
+    the whole family is revoked. A just-rotated token may be replayed once, by a
+    concurrent refresh, before that applies.
+    """
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        UniqueConstraint("token_hash", name="uq_refresh_tokens_token_hash"),
+        Index("ix_refresh_tokens_user_id", "user_id"),
+        Index("ix_refresh_tokens_family_id", "family_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)  # shared by one login's rotations
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
+    replaced_by_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    grace_used_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)  # its one concurrent replay
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
@@ -2,7 +2,7 @@ from sqlalchemy import String, Boolean, Text, DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from backend.core.database import Base
+from backend.core.database import Base, utcnow
 
 class User(Base):
     __tablename__ = 'users'
@@ -11,7 +11,8 @@ class User(Base):
     username: Mapped[str] = mapped_column(String(150), unique=True, nullable=True)
     password_hash: Mapped[str] = mapped_column(Text, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    user_context: Mapped[str] = mapped_column(Text, nullable=True)
+    # Legacy blob, migrated into user_documents; deferred so loading a user never reads it
+    user_context: Mapped[str] = mapped_column(Text, nullable=True, deferred=True)
     role: Mapped[str] = mapped_column(String(50), default="user", nullable=False)
     first_name: Mapped[str] = mapped_column(String(100), nullable=True)
     last_name: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -21,6 +22,7 @@ class User(Base):
     portfolio: Mapped[str] = mapped_column(String(255), nullable=True)
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False,
     )
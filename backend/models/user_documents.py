@@ -0,0 +1,37 @@
+import uuid
+from sqlalchemy import String, Text, DateTime, ForeignKey, func, Boolean, true, Integer, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from backend.core.database import Base, utcnow
+
+
+class UserDocument(Base):
+    """One uploaded context document; its text lives in UserDocumentChunk rows."""
+    __tablename__ = "user_documents"
+    __table_args__ = (
+        # The same content uploaded twice is stored once
+        UniqueConstraint("user_id", "content_hash", name="uq_user_documents_user_id_content_hash"),
+        Index("ix_user_documents_user_id_is_active", "user_id", "is_active"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    char_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Only active documents are assembled into the context the graph sees
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
+
+
+class UserDocumentChunk(Base):
+    __tablename__ = "user_document_chunks"
+    __table_args__ = (
+        UniqueConstraint("document_id", "position", name="uq_user_document_chunks_document_id_position"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("user_documents.id", ondelete="CASCADE"), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, distinct
+from typing import Annotated
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from backend.core.database import get_db
+from backend.core.security import get_current_user
+from backend.models.job_descriptions import JobDescription
+from backend.models.generated_contents import GeneratedContents, ContentTypes
+from backend.utils.analytics_cache import analytics_key, get_cached_analytics, cache_analytics
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+user_dependency = Annotated[dict, Depends(get_current_user)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+
+
+def _type_value(content_type) -> str:
+    return content_type.value if isinstance(content_type, ContentTypes) else content_type
+
+
+@router.get('', status_code=status.HTTP_200_OK)
+async def get_analytics(
+    user: user_dependency,
+    db: db_dependency,
+    days: int = Query(30, ge=1, le=365, description="Window for the per-day series"),
+):
+    """
+    Dashboard aggregates computed with GROUP BY: totals, drafts per content type,
+    jobs and drafts per company, drafts per day and drafts per prompt version,
+    plus the required skills that appear in the most job contexts.
+    Cached per user for a short time and dropped whenever the user saves a job or draft.
+    """
+    user_id = user.get("id")
+    cache_key = analytics_key(user_id, (days,))
+    cached = get_cached_analytics(cache_key)
+    if cached is not None:
+        return cached
+
+    drafts = (
+        GeneratedContents.user_id == user_id,
+        GeneratedContents.is_provisional.is_(False),
+    )
+
+    totals = (await db.execute(
+        select(
+            func.count(JobDescription.id).label("jobs"),
+            func.count(distinct(JobDescription.company)).label("companies"),
+        ).where(JobDescription.user_id == user_id)
+    )).one()
+    total_drafts = (await db.execute(select(func.count()).select_from(GeneratedContents).where(*drafts))).scalar_one()
+
+    by_type = await db.execute(
+        select(GeneratedContents.content_type, func.count().label("count"))
+        .where(*drafts)
+        .group_by(GeneratedContents.content_type)
+        .order_by(func.count().desc())
+    )
+
+    draft_counts = (
+        select(GeneratedContents.jd_id, func.count().label("drafts"))
+        .where(*drafts)
+        .group_by(GeneratedContents.jd_id)
+        .subquery()
+    )
+    by_company = await db.execute(
+        select(
+            JobDescription.company,
+            func.count(JobDescription.id).label("jobs"),
+            func.coalesce(func.sum(draft_counts.c.drafts), 0).label("drafts"),
+        )
+        .outerjoin(draft_counts, draft_counts.c.jd_id == JobDescription.id)
+        .where(JobDescription.user_id == user_id)
+        .group_by(JobDescription.company)
+        .order_by(func.count(JobDescription.id).desc(), JobDescription.company)
+    )
+
+    day = func.date(GeneratedContents.created_at)
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    by_day = await db.execute(
+        select(day.label("day"), func.count().label("count"))
+        .where(*drafts, GeneratedContents.created_at >= since)
+        .group_by(day)
+        .order_by(day)
+    )
+
+    by_prompt_version = await db.execute(
+        select(GeneratedContents.content_type, GeneratedContents.prompt_version, func.count().label("count"))
+        .where(*drafts)
+        .group_by(GeneratedContents.content_type, GeneratedContents.prompt_version)
+        .order_by(GeneratedContents.content_type, func.count().desc())
+    )
+
+    # Only the skills array is read out of each context, never the whole document
+    skills = await db.execute(
+        select(JobDescription.generated_context["required_skills"])
+        .where(JobDescription.user_id == user_id, JobDescription.generated_context.is_not(None))
+    )
+    skill_counts = Counter()
+    for (job_skills,) in skills:
+        if isinstance(job_skills, list):
+            skill_counts.update({str(skill).strip().lower() for skill in job_skills if skill})
+
+    result = {
+        "totals": {"drafts": total_drafts, "jobs": totals.jobs, "companies": totals.companies},
+        "by_type": [{"content_type": _type_value(row.content_type), "count": row.count} for row in by_type],
+        "by_company": [{"company": row.company, "jobs": row.jobs, "drafts": int(row.drafts)} for row in by_company],
+        "by_day": [{"day": str(row.day), "count": row.count} for row in by_day],
+        "by_prompt_version": [
+            {"content_type": _type_value(row.content_type), "prompt_version": row.prompt_version, "count": row.count}
+            for row in by_prompt_version
+        ],
+        "top_skills": [{"skill": skill, "jobs": count} for skill, count in skill_counts.most_common(15)],
+    }
+    cache_analytics(cache_key, result)
+    return result
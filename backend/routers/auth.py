@@ -4,14 +4,33 @@ from sqlalchemy import select
 from typing import Annotated
 from fastapi.security import OAuth2PasswordRequestForm
 from backend.core.database import get_db
+from backend.core.config import JWT_ACCESS_TOKEN_EXPIRE_MINUTES
 from backend.models.user import User
-from backend.schemas.auth import LoginRequest, TokenResponse
-from backend.core.security import create_access_token, authenticate_user
-from backend.utils.password_hash import verify_password
+from backend.schemas.auth import LoginRequest, TokenResponse, RefreshRequest
+from backend.core.security import (
+    create_access_token,
+    authenticate_user,
+    issue_refresh_token,
+    rotate_refresh_token,
+    revoke_refresh_token,
+)
+from backend.utils.password_hash import averify_password
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _token_response(db: AsyncSession, user: User, refresh_token: str | None = None, session_id=None) -> TokenResponse:
+    if refresh_token is None:
+        refresh_token, session_id = await issue_refresh_token(db, user.id)
+    token = create_access_token(username=user.username, user_id=str(user.id), role=user.role, session_id=str(session_id))
+    return TokenResponse(
+        access_token=token,
+        token_type="bearer",
+        refresh_token=refresh_token,
+        expires_in=JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
 @router.post('/login', response_model=TokenResponse)
 async def login(
     payload: LoginRequest,
@@ -21,7 +40,7 @@ async def login(
         select(User).where(User.username == payload.username)
     )
     user = result.scalars().first()
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await averify_password(payload.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password."
@@ -31,8 +50,7 @@ async def login(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive."
         )
-    token = create_access_token(username=user.username, user_id=str(user.id), role=user.role)
-    return TokenResponse(access_token=token, token_type="bearer")
+    return await _token_response(db, user)
 
 
 @router.post('/token', response_model=TokenResponse)
@@ -47,5 +65,26 @@ async def login_for_access_token(
             detail="Invalid username or password.",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    token = create_access_token(username=user.username, user_id=str(user.id), role=user.role)
-    return TokenResponse(access_token=token, token_type="bearer")
\ No newline at end of file
+    return await _token_response(db, user)
+
+
+@router.post('/refresh', response_model=TokenResponse)
+async def refresh(
+    payload: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchanges a refresh token for a new access token and a new refresh token.
+    The presented refresh token stops working; reusing it revokes the whole login.
+    """
+    user, refresh_token, session_id = await rotate_refresh_token(db, payload.refresh_token)
+    return await _token_response(db, user, refresh_token, session_id)
+
+
+@router.post('/logout', status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Revokes the refresh token, every token rotated from the same login and their access tokens."""
+    await revoke_refresh_token(db, payload.refresh_token)
@@ -1,25 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Form, UploadFile, File
 import uuid
+import json
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Annotated
-from backend.core.database import get_db
+from sqlalchemy import and_
+from sqlalchemy.orm import load_only
+from typing import Annotated, Literal
+from backend.core.database import get_db, async_session_maker, LazySession
 from backend.models.user import User
 from backend.models.job_descriptions import JobDescription
 from backend.models.generated_contents import GeneratedContents
 from backend.models.generated_contents import ContentTypes
+from backend.models.context_runs import ContextRun
 from backend.schemas.user import Usercreate, UserRead
+from backend.schemas.generation import GeneratedContentItem, GeneratedContentPage, GeneratedContentSummary, GeneratedContentSummaryPage
+from backend.core.config import LIST_PAGE_SIZE_DEFAULT, LIST_PAGE_SIZE_MAX, EXPORT_BATCH_SIZE
 from backend.core.security import get_current_user
 from backend.graph.main import draft_graph, generate_graph
+from backend.graph.checkpointer import draft_thread_id, batch_thread_id, delete_thread
+from backend.graph.chains import llm
+from backend.graph.nodes import CONTEXT_PROMPT
+from backend.graph.usage import UsageTracker
+from backend.utils.context_cache import build_context_cache_key
+from backend.utils.draft_store import DRAFT_TYPES, build_generated_content, build_user_details, draft_from_row, draft_usage, context_text
+from backend.utils.percentiles import summarize
+from backend.utils.pagination import encode_cursor, after_cursor
+from backend.utils.analytics_cache import invalidate_analytics
+from backend.utils.document_store import active_documents_digest, assemble_user_context
+from backend.utils.speculative_drafts import start_predrafts, claim_predraft
 from backend.utils.email_sender import send_email
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from langchain_core.messages import AIMessageChunk
+from langchain_core.utils.json import parse_partial_json
 from backend.utils.pdf_generator import create_pdf
 
 router = APIRouter(prefix="/generation", tags=["generation"])
 
 user_dependency = Annotated[dict, Depends(get_current_user)]
-db_dependency = Annotated[AsyncSession, Depends(get_db)]
+db_dependency = Annotated[LazySession, Depends(get_db)]
 
 
 @router.post('/context', status_code=status.HTTP_200_OK)
@@ -27,25 +50,65 @@ async def generate_context(
     user: user_dependency,
     db: db_dependency,
     job_description: str = Form(..., description="A detailed description of the job role."),
+    refresh: bool = Form(False, description="Regenerate the context even if a cached one exists."),
+    prefetch_drafts: bool = Form(False, description="Pre-draft the user's most used content types in the background."),
 ):
-    
+    """
+    Runs in three phases so no pooled connection is held while the graph waits on the LLM:
+    a short read (user, documents, context cache), the graph run with the session released,
+    and a short write of the job description and its usage.
+    """
+    tracker = UsageTracker()
+
+    # Phase 1: read the inputs
     result = await db.execute(select(User).where(User.id == user.get("id")))
     db_user = result.scalars().first()
-    if db_user.user_context is None:
+    # Keyed on the hashes of the active documents, so a cache hit never loads their text
+    documents_digest = await active_documents_digest(db, user.get("id"))
+    if documents_digest is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User context not found. Please create a user context first.")
+
+    cache_key = build_context_cache_key(
+        job_description,
+        documents_digest,
+        prompt_version=CONTEXT_PROMPT,
+        model_name=llm.model_name,
+    )
+    if not refresh:
+        cached = await db.execute(
+            select(JobDescription.id, JobDescription.generated_context)
+            .where(
+                JobDescription.user_id == user.get("id"),
+                JobDescription.context_cache_key == cache_key,
+                JobDescription.generated_context.is_not(None),
+            )
+            .order_by(JobDescription.created_at.desc())
+            .limit(1)
+        )
+        cached_row = cached.first()
+        if cached_row:
+            await _record_context_run(db, user.get("id"), cached_row.id, tracker, cache_hit=True)
+            if prefetch_drafts:
+                await start_predrafts(db, cached_row.id, user.get("id"), context_text(cached_row.generated_context), build_user_details(db_user))
+            return {**cached_row.generated_context, "jd_id": str(cached_row.id)}
+
     state = {
-        "user_context": db_user.user_context,
+        "user_context": await assemble_user_context(db, user.get("id")),
         "job_description": job_description,
     }
-    
-    # Generate a random thread_id for this request since we are using a checkpointer
+    user_details = build_user_details(db_user)
+    await db.release()
+
+    # Phase 2: run the graph with no connection checked out
+    # generate_graph is not checkpointed; the thread_id only tags this run
     thread_id = str(uuid.uuid4())
-    config = {"configurable": {"thread_id": thread_id}}
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": [tracker]}
     
     try:
         result_state = await generate_graph.ainvoke(state, config=config)
     except Exception as e:
         print(f"Error generating context: {e}")
+        await _record_context_run(db, user.get("id"), None, tracker, succeeded=False)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate context")
     context = result_state.get('context', {})
     
@@ -53,30 +116,35 @@ async def generate_context(
     context_dict = {}
     if isinstance(context, str):
         try:
-            import json
             context_dict = json.loads(context)
         except json.JSONDecodeError:
             # Fallback if it's just a string but not JSON
             context_dict = {"raw_content": context}
     elif isinstance(context, dict):
         context_dict = context
-        
+
+    # Phase 3: persist the result in one short transaction
     if context_dict:
         try:
-            import json
-            # Ensure we serialize it back to string for the DB 'generated_context' field
             job_description = JobDescription(
                 title=context_dict.get('job_title'),
                 company=context_dict.get('company_name'),
                 jd_text=job_description,
                 user_id=user.get("id"),
-                generated_context=json.dumps(context_dict)
+                generated_context=context_dict,
+                context_cache_key=cache_key
             )
             db.add(job_description)
+            await db.flush()
+            db.add(_context_run(user.get("id"), job_description.id, tracker, result_state))
             await db.commit()
+            invalidate_analytics(user.get("id"))
         except Exception as e:
             print(f"Error saving job description: {e}")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to save job description")
+        if prefetch_drafts:
+            await start_predrafts(db, job_description.id, user.get("id"), context_text(context_dict), user_details)
+        return {**context_dict, "jd_id": str(job_description.id)}
         
     return context_dict
 
@@ -89,78 +157,53 @@ async def draft_context(
     db: db_dependency,
     feedback: str | None = Form(None, description="Feedback for the generated content"),
 ):
-    if type not in ["email", "linkedin_message", "cover_letter"]:
+    """
+    Runs in three phases like /context: read the inputs, run the drafter with the
+    session released, then insert the draft in one short transaction.
+    """
+    if type not in DRAFT_TYPES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type")
 
-    type_mapping = {
-        "email": ContentTypes.COLD_EMAIL,
-        "linkedin_message": ContentTypes.LINKEDIN_MESSAGE,
-        "cover_letter": ContentTypes.COVER_LETTER
-    }
-    
-    # Fetch job description and verify ownership
-    result = await db.execute(select(JobDescription).where(JobDescription.id == jd_id, JobDescription.user_id == user.get("id")))
-    job_description = result.scalars().first()
-    
-    if not job_description:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
-        
-    if not job_description.generated_context:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No generated context found for this job description. Please generate context first.")
-    
-    user_result = await db.execute(select(User).where(User.id == user.get("id")))
-    db_user = user_result.scalars().first()
-    user_details = {
-        "name": f"{db_user.first_name} {db_user.last_name}",
-        "email": db_user.email,
-        "phone": db_user.phone,
-        "linkedin_url": db_user.linkedin,
-        "github_url": db_user.github,
-      
-    }
-    
+    # Phase 1: read the inputs
+    # A first draft may already have been pre-drafted (or be in flight) since the context was generated
+    if not feedback:
+        predraft = await claim_predraft(db, jd_id, user.get("id"), type)
+        if predraft:
+            return draft_from_row(predraft)
+
+    job_description, user_details = await _load_draft_inputs(db, jd_id, user.get("id"))
+    await db.release()
+
+    # Phase 2: run the drafter with no connection checked out
+
     # Prepare state with existing context and explicit start point
     state = {
-        "context": job_description.generated_context, # Reuse stored context
+        "context": context_text(job_description.generated_context), # Reuse stored context
         "type": type,
         "user_details": user_details,
         "feedback": feedback
     }
 
-    thread_id = str(uuid.uuid4())
-    config = {"configurable": {"thread_id": thread_id}}
+    # Revisions of the same (jd, type) continue the conversation saved on this thread
+    tracker = UsageTracker()
+    config = {"configurable": {"thread_id": draft_thread_id(jd_id, type)}, "callbacks": [tracker]}
     
     # Invoke graph - logic in graph.py will route to 'start_at' node
     try:
-        result_state = await draft_graph.ainvoke(state, config=config)
+        result_state = await draft_graph.ainvoke(state, config=config, durability="exit")
     except Exception as e:
         print(f"Error drafting context: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to draft context")
     
-    # Save Generated Content
+    # Phase 3: save the generated content
     try:
-        import json
-        context_dict = json.loads(job_description.generated_context)
-        
-        db_content_type = type_mapping.get(type)
-        if not db_content_type:
-             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type")
-
-        generated_data = result_state.get(type, {})
-        
-        generated_content = GeneratedContents(
-            jd_id=job_description.id,
-            user_id=user.get("id"),
-            content_type=db_content_type,
-            to_address=result_state.get(type).get('recipient'),
-            subject=result_state.get(type).get('subject'),
-            body=result_state.get(type).get('body'),
-            model_used=result_state.get('model_used'),
-            prompt_version=result_state.get('prompt_version')
+        generated_content = build_generated_content(
+            job_description.id, user.get("id"), type, result_state, usage=draft_usage(tracker, type)
         )
             
         db.add(generated_content)
         await db.commit()
+        invalidate_analytics(user.get("id"))
     except Exception as e:
         print(f"Error saving generated content: {e}")
         # We still return the response even if saving fails, or we could raise. 
@@ -169,10 +212,269 @@ async def draft_context(
     return result_state.get(type)
 
 
+@router.post('/draft_context/stream', status_code=status.HTTP_200_OK)
+async def draft_context_stream(
+    jd_id: uuid.UUID,
+    type: str,
+    user: user_dependency,
+    db: db_dependency,
+    feedback: str | None = Form(None, description="Feedback for the generated content"),
+):
+    """
+    Streaming variant of /draft_context. Emits Server-Sent Events:
+    `token` events with {"field", "text"} deltas of the recipient/subject/body as the
+    model produces them, then a final `done` event with the full draft and the id of
+    the persisted row (or an `error` event).
+    """
+    if type not in DRAFT_TYPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type")
+
+    if not feedback:
+        predraft = await claim_predraft(db, jd_id, user.get("id"), type)
+        if predraft:
+            async def predraft_stream():
+                yield _sse("done", {"id": str(predraft.id), "type": type, **draft_from_row(predraft)})
+            return StreamingResponse(predraft_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    job_description, user_details = await _load_draft_inputs(db, jd_id, user.get("id"))
+    # The stream writes with its own session, so the request's connection is done here
+    await db.release()
+    state = {
+        "context": context_text(job_description.generated_context),
+        "type": type,
+        "user_details": user_details,
+        "feedback": feedback
+    }
+    tracker = UsageTracker()
+    config = {"configurable": {"thread_id": draft_thread_id(jd_id, type)}, "callbacks": [tracker]}
+    user_id = user.get("id")
+    job_id = job_description.id
+
+    async def event_stream():
+        buffer = ""
+        sent = {"recipient": "", "subject": "", "body": ""}
+        result_state = None
+        try:
+            async for mode, payload in draft_graph.astream(state, config=config, stream_mode=["messages", "values"], durability="exit"):
+                if mode == "values":
+                    result_state = payload
+                    continue
+                # Only LLM token chunks; whole messages written to the saved conversation are skipped
+                if not isinstance(payload[0], AIMessageChunk):
+                    continue
+                buffer += _message_chunk_text(payload[0])
+                partial = parse_partial_json(buffer) if buffer.strip() else None
+                if not isinstance(partial, dict):
+                    continue
+                for field, previous in sent.items():
+                    value = partial.get(field)
+                    if isinstance(value, str) and len(value) > len(previous) and value.startswith(previous):
+                        yield _sse("token", {"field": field, "text": value[len(previous):]})
+                        sent[field] = value
+        except Exception as e:
+            print(f"Error streaming draft: {e}")
+            yield _sse("error", {"detail": "Failed to draft context"})
+            return
+
+        draft = (result_state or {}).get(type)
+        if not draft:
+            yield _sse("error", {"detail": "Failed to draft context"})
+            return
+
+        content_id = None
+        try:
+            # The request session is not used while streaming; persist with a short-lived one
+            async with async_session_maker() as session:
+                generated_content = build_generated_content(
+                    job_id, user_id, type, result_state, usage=draft_usage(tracker, type)
+                )
+                session.add(generated_content)
+                await session.commit()
+                content_id = str(generated_content.id)
+            invalidate_analytics(user_id)
+        except Exception as e:
+            print(f"Error saving generated content: {e}")
+
+        yield _sse("done", {"id": content_id, "type": type, **draft})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _message_chunk_text(chunk) -> str:
+    """Extracts streamed text from a message chunk, whether the model streams JSON content or tool-call arguments."""
+    text = ""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        text += content
+    elif isinstance(content, list):
+        text += "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    for tool_chunk in getattr(chunk, "tool_call_chunks", None) or []:
+        text += tool_chunk.get("args") or ""
+    return text
+
+
+@router.post('/draft_contexts', status_code=status.HTTP_200_OK)
+async def draft_contexts(
+    jd_id: uuid.UUID,
+    user: user_dependency,
+    db: db_dependency,
+    types: list[str] = Query(..., description="Content types to draft in parallel"),
+    feedback: str | None = Form(None, description="Feedback applied to every generated content"),
+):
+    types = list(dict.fromkeys(types))
+    if not types or any(t not in DRAFT_TYPES for t in types):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type")
+
+    job_description, user_details = await _load_draft_inputs(db, jd_id, user.get("id"))
+    # Don't hold a pooled connection while the drafters run; the insert below takes a fresh one
+    await db.release()
+
+    # One graph run fans out to every requested drafter, so wall time is that of the slowest one
+    state = {
+        "context": context_text(job_description.generated_context),
+        "types": types,
+        "user_details": user_details,
+        "feedback": feedback
+    }
+    thread_id = batch_thread_id(jd_id)
+    tracker = UsageTracker()
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": [tracker]}
+
+    try:
+        result_state = await draft_graph.ainvoke(state, config=config, durability="exit")
+    except Exception as e:
+        print(f"Error drafting contexts: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to draft context")
+    finally:
+        await delete_thread(draft_graph.checkpointer, thread_id)
+
+    try:
+        db.add_all([
+            build_generated_content(
+                job_description.id, user.get("id"), draft_type, result_state, usage=draft_usage(tracker, draft_type)
+            )
+            for draft_type in types
+        ])
+        await db.commit()
+        invalidate_analytics(user.get("id"))
+    except Exception as e:
+        await db.rollback()
+        print(f"Error saving generated contents: {e}")
+
+    return {draft_type: result_state.get(draft_type) for draft_type in types}
+
+
+def _context_run(user_id, jd_id, tracker: UsageTracker, result_state: dict | None = None, **fields) -> ContextRun:
+    summary = tracker.summary()
+    result_state = result_state or {}
+    return ContextRun(
+        user_id=user_id,
+        jd_id=jd_id,
+        model_used=result_state.get('model_used') or llm.model_name,
+        prompt_version=result_state.get('prompt_version') or CONTEXT_PROMPT,
+        prompt_tokens=summary["prompt_tokens"],
+        completion_tokens=summary["completion_tokens"],
+        cached_tokens=summary["cached_tokens"],
+        ttft_ms=summary["ttft_ms"],
+        latency_ms=summary["latency_ms"],
+        llm_calls=summary["llm_calls"],
+        tool_calls=summary["tool_calls"],
+        usage=summary["calls"],
+        **fields,
+    )
+
+
+async def _record_context_run(db: AsyncSession, user_id, jd_id, tracker: UsageTracker, **fields) -> None:
+    """Saves a ContextRun for a request that did not save a job description; failures are only logged."""
+    try:
+        db.add(_context_run(user_id, jd_id, tracker, **fields))
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        print(f"Error saving context run: {e}")
+
+
+@router.get('/stats', status_code=status.HTTP_200_OK)
+async def generation_stats(
+    user: user_dependency,
+    db: db_dependency,
+    days: int = Query(30, ge=1, le=365, description="Only include generations from the last N days"),
+):
+    """
+    Latency, time-to-first-token and token percentiles of the user's generations,
+    per content type and prompt version for drafts and per prompt version for context runs.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    metrics = ("latency_ms", "ttft_ms", "prompt_tokens", "completion_tokens", "cached_tokens")
+
+    drafts = await db.execute(
+        select(GeneratedContents.content_type, GeneratedContents.prompt_version, *(getattr(GeneratedContents, m) for m in metrics))
+        .where(
+            GeneratedContents.user_id == user.get("id"),
+            GeneratedContents.created_at >= since,
+            GeneratedContents.latency_ms.is_not(None),
+        )
+    )
+    draft_groups = defaultdict(list)
+    for row in drafts:
+        content_type = row.content_type.value if isinstance(row.content_type, ContentTypes) else row.content_type
+        draft_groups[(content_type, row.prompt_version)].append(row)
+
+    runs = await db.execute(
+        select(ContextRun.prompt_version, ContextRun.cache_hit, *(getattr(ContextRun, m) for m in metrics))
+        .where(
+            ContextRun.user_id == user.get("id"),
+            ContextRun.created_at >= since,
+            ContextRun.succeeded.is_(True),
+        )
+    )
+    run_groups = defaultdict(list)
+    for row in runs:
+        run_groups[(row.prompt_version, row.cache_hit)].append(row)
+
+    def _metrics(rows) -> dict:
+        return {metric: summarize(getattr(row, metric) for row in rows) for metric in metrics}
+
+    return {
+        "days": days,
+        "drafts": [
+            {"content_type": content_type, "prompt_version": prompt_version, "count": len(rows), **_metrics(rows)}
+            for (content_type, prompt_version), rows in sorted(draft_groups.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+        ],
+        "context_runs": [
+            {"prompt_version": prompt_version, "cache_hit": cache_hit, "count": len(rows), **_metrics(rows)}
+            for (prompt_version, cache_hit), rows in sorted(run_groups.items(), key=lambda item: (item[0][0] or "", item[0][1]))
+        ],
+    }
+
+
+async def _load_draft_inputs(db: AsyncSession, jd_id: uuid.UUID, user_id):
+    """Loads the job description (verifying ownership) and the user details used by the drafters."""
+    result = await db.execute(select(JobDescription).where(JobDescription.id == jd_id, JobDescription.user_id == user_id))
+    job_description = result.scalars().first()
+    
+    if not job_description:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
+        
+    if not job_description.generated_context:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No generated context found for this job description. Please generate context first.")
+    
+    user_result = await db.execute(select(User).where(User.id == user_id))
+    db_user = user_result.scalars().first()
+    return job_description, build_user_details(db_user)
+
+
 @router.post('/send_email', status_code=status.HTTP_200_OK)
 async def send_email_endpoint(
     user: user_dependency,
-    db: db_dependency,
     to_address: str = Form(..., description="Recipient email address"),
     subject: str = Form(..., description="Email subject"),
     body: str = Form(..., description="Email body"),
@@ -213,12 +515,160 @@ async def send_email_endpoint(
     
     
 
-@router.get('/generated_contents', status_code=status.HTTP_200_OK)
+class ContentListParams:
+    """Paging and filter query parameters shared by the content list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(LIST_PAGE_SIZE_DEFAULT, ge=1, le=LIST_PAGE_SIZE_MAX, description="Page size"),
+        cursor: str | None = Query(None, description="next_cursor from the previous page"),
+        content_type: list[ContentTypes] | None = Query(None, description="Only these content types"),
+        jd_id: uuid.UUID | None = Query(None, description="Only drafts for this job description"),
+        company: list[str] | None = Query(None, description="Only drafts for jobs at these companies"),
+        created_after: datetime | None = Query(None, description="Only drafts created at or after this time"),
+        created_before: datetime | None = Query(None, description="Only drafts created before this time"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.content_type = content_type
+        self.jd_id = jd_id
+        self.company = company
+        self.created_after = created_after
+        self.created_before = created_before
+
+
+content_list_params = Annotated[ContentListParams, Depends()]
+
+
+async def _content_page(db: AsyncSession, user_id, params: ContentListParams, columns: list) -> tuple[list, str | None]:
+    """Runs one keyset page of the user's drafts (newest first), selecting only `columns`."""
+    stmt = (
+        select(
+            *columns,
+            JobDescription.title.label("job_title"),
+            JobDescription.company.label("company_name"),
+        )
+        .join(JobDescription, GeneratedContents.jd_id == JobDescription.id)
+        .where(GeneratedContents.user_id == user_id, GeneratedContents.is_provisional.is_(False))
+    )
+    if params.content_type:
+        stmt = stmt.where(GeneratedContents.content_type.in_(params.content_type))
+    if params.jd_id:
+        stmt = stmt.where(GeneratedContents.jd_id == params.jd_id)
+    if params.company:
+        stmt = stmt.where(JobDescription.company.in_(params.company))
+    if params.created_after:
+        stmt = stmt.where(GeneratedContents.created_at >= params.created_after)
+    if params.created_before:
+        stmt = stmt.where(GeneratedContents.created_at < params.created_before)
+    if params.cursor:
+        stmt = stmt.where(after_cursor(GeneratedContents.created_at, GeneratedContents.id, params.cursor))
+
+    # One extra row tells us whether there is a next page
+    stmt = stmt.order_by(GeneratedContents.created_at.desc(), GeneratedContents.id.desc()).limit(params.limit + 1)
+    rows = (await db.execute(stmt)).mappings().all()
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+def _json_response(model) -> Response:
+    # Serialize straight to JSON in pydantic-core, skipping FastAPI's jsonable_encoder pass
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+@router.get('/contents', status_code=status.HTTP_200_OK, response_model=GeneratedContentPage)
+async def list_generated_contents(user: user_dependency, db: db_dependency, params: content_list_params):
+    """
+    Lists the user's drafts newest first, one page at a time.
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page; it is null on the last page.
+    """
+    rows, next_cursor = await _content_page(db, user.get("id"), params, [
+        GeneratedContents.id,
+        GeneratedContents.jd_id,
+        GeneratedContents.content_type,
+        GeneratedContents.to_address,
+        GeneratedContents.subject,
+        GeneratedContents.body,
+        GeneratedContents.model_used,
+        GeneratedContents.prompt_version,
+        GeneratedContents.created_at,
+    ])
+    return _json_response(GeneratedContentPage(
+        items=[GeneratedContentItem.model_validate(dict(row)) for row in rows],
+        next_cursor=next_cursor,
+    ))
+
+
+@router.get('/contents/summary', status_code=status.HTTP_200_OK, response_model=GeneratedContentSummaryPage)
+async def list_generated_contents_summary(user: user_dependency, db: db_dependency, params: content_list_params):
+    """Same paging and filters as /contents, without the draft bodies."""
+    rows, next_cursor = await _content_page(db, user.get("id"), params, [
+        GeneratedContents.id,
+        GeneratedContents.jd_id,
+        GeneratedContents.content_type,
+        GeneratedContents.to_address,
+        GeneratedContents.subject,
+        GeneratedContents.prompt_version,
+        GeneratedContents.created_at,
+    ])
+    return _json_response(GeneratedContentSummaryPage(
+        items=[GeneratedContentSummary.model_validate(dict(row)) for row in rows],
+        next_cursor=next_cursor,
+    ))
+
+
+@router.get('/contents/{content_id}', status_code=status.HTTP_200_OK, response_model=GeneratedContentItem)
+async def get_generated_content(content_id: uuid.UUID, user: user_dependency, db: db_dependency):
+    result = await db.execute(
+        select(GeneratedContents, JobDescription.title, JobDescription.company)
+        .options(load_only(
+            GeneratedContents.id,
+            GeneratedContents.jd_id,
+            GeneratedContents.content_type,
+            GeneratedContents.to_address,
+            GeneratedContents.subject,
+            GeneratedContents.body,
+            GeneratedContents.model_used,
+            GeneratedContents.prompt_version,
+            GeneratedContents.created_at,
+        ))
+        .join(JobDescription, GeneratedContents.jd_id == JobDescription.id)
+        .where(
+            GeneratedContents.id == content_id,
+            GeneratedContents.user_id == user.get("id"),
+            GeneratedContents.is_provisional.is_(False),
+        )
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Generated content not found")
+    content, job_title, company_name = row
+    return GeneratedContentItem(
+        id=content.id,
+        jd_id=content.jd_id,
+        content_type=content.content_type,
+        to_address=content.to_address,
+        subject=content.subject,
+        body=content.body,
+        model_used=content.model_used,
+        prompt_version=content.prompt_version,
+        created_at=content.created_at,
+        job_title=job_title,
+        company_name=company_name,
+    )
+
+
+@router.get('/generated_contents', status_code=status.HTTP_200_OK, deprecated=True)
 async def get_all_generated_contents(user:user_dependency, db:db_dependency):
+    """Deprecated: returns every row unpaginated. Use GET /generation/contents."""
     stmt = (
         select(GeneratedContents, JobDescription.title, JobDescription.company)
         .join(JobDescription, GeneratedContents.jd_id == JobDescription.id)
-        .where(GeneratedContents.user_id == user.get("id"))
+        .where(GeneratedContents.user_id == user.get("id"), GeneratedContents.is_provisional.is_(False))
     )
     result = await db.execute(stmt)
     rows = result.all()
@@ -234,13 +684,15 @@ async def get_all_generated_contents(user:user_dependency, db:db_dependency):
 
     
     
-@router.get('/generated_contents/{content_type}', status_code=status.HTTP_200_OK)
+@router.get('/generated_contents/{content_type}', status_code=status.HTTP_200_OK, deprecated=True)
 async def get_generated_contents_by_type(user:user_dependency, db:db_dependency, content_type: str):
+    """Deprecated: returns every row unpaginated. Use GET /generation/contents."""
     stmt = (
         select(GeneratedContents, JobDescription.title, JobDescription.company)
         .join(JobDescription, GeneratedContents.jd_id == JobDescription.id)
         .where(
             GeneratedContents.user_id == user.get("id"),
+            GeneratedContents.is_provisional.is_(False),
             GeneratedContents.content_type == content_type
         )
     )
@@ -256,13 +708,15 @@ async def get_generated_contents_by_type(user:user_dependency, db:db_dependency,
         
     return response
     
-@router.get('/generated_contents/job/{jd_id}', status_code=status.HTTP_200_OK)
+@router.get('/generated_contents/job/{jd_id}', status_code=status.HTTP_200_OK, deprecated=True)
 async def get_generated_contents_by_job(user:user_dependency, db:db_dependency, jd_id: uuid.UUID):
+    """Deprecated: returns every row unpaginated. Use GET /generation/contents."""
     stmt = (
         select(GeneratedContents, JobDescription.title, JobDescription.company)
         .join(JobDescription, GeneratedContents.jd_id == JobDescription.id)
         .where(
             GeneratedContents.user_id == user.get("id"),
+            GeneratedContents.is_provisional.is_(False),
             GeneratedContents.jd_id == jd_id
         )
     )
@@ -279,6 +733,118 @@ async def get_generated_contents_by_job(user:user_dependency, db:db_dependency,
     return response
 
 
+EXPORT_JOB_COLUMNS = ["jd_id", "job_title", "company", "jd_text", "generated_context", "job_created_at"]
+EXPORT_DRAFT_COLUMNS = ["content_id", "content_type", "to_address", "subject", "body", "model_used", "prompt_version", "created_at"]
+
+
+def _export_query(user_id):
+    # Jobs without drafts still get a row; provisional pre-drafts are not exported
+    return (
+        select(
+            JobDescription.id.label("jd_id"),
+            JobDescription.title.label("job_title"),
+            JobDescription.company,
+            JobDescription.jd_text,
+            JobDescription.generated_context,
+            JobDescription.created_at.label("job_created_at"),
+            GeneratedContents.id.label("content_id"),
+            GeneratedContents.content_type,
+            GeneratedContents.to_address,
+            GeneratedContents.subject,
+            GeneratedContents.body,
+            GeneratedContents.model_used,
+            GeneratedContents.prompt_version,
+            GeneratedContents.created_at,
+        )
+        .outerjoin(GeneratedContents, and_(
+            GeneratedContents.jd_id == JobDescription.id,
+            GeneratedContents.is_provisional.is_(False),
+        ))
+        .where(JobDescription.user_id == user_id)
+        # Grouped by job, so NDJSON can emit each job once its last draft has been read
+        .order_by(JobDescription.created_at, JobDescription.id, GeneratedContents.created_at)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def _export_value(value):
+    if isinstance(value, ContentTypes):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _export_rows(user_id):
+    # The request session is gone once streaming starts; read through a server-side cursor on our own
+    async with async_session_maker() as session:
+        result = await session.stream(_export_query(user_id))
+        async for partition in result.mappings().partitions():
+            for row in partition:
+                yield {key: _export_value(value) for key, value in row.items()}
+
+
+async def _export_ndjson(user_id):
+    job, lines = None, []
+    async for row in _export_rows(user_id):
+        if job is None or job["jd_id"] != row["jd_id"]:
+            if job is not None:
+                lines.append(json.dumps(job, ensure_ascii=False) + "\n")
+            job = {column: row[column] for column in EXPORT_JOB_COLUMNS}
+            job["drafts"] = []
+        if row["content_id"] is not None:
+            job["drafts"].append({column: row[column] for column in EXPORT_DRAFT_COLUMNS})
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "".join(lines)
+            lines = []
+    if job is not None:
+        lines.append(json.dumps(job, ensure_ascii=False) + "\n")
+    if lines:
+        yield "".join(lines)
+
+
+async def _export_csv(user_id):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_JOB_COLUMNS + EXPORT_DRAFT_COLUMNS)
+    rows = 0
+    async for row in _export_rows(user_id):
+        context = row["generated_context"]
+        row["generated_context"] = json.dumps(context, ensure_ascii=False) if context is not None else None
+        writer.writerow([row[column] for column in EXPORT_JOB_COLUMNS + EXPORT_DRAFT_COLUMNS])
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get('/export', status_code=status.HTTP_200_OK)
+async def export_history(
+    user: user_dependency,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson: one job per line with its drafts; csv: one row per draft"),
+):
+    """
+    Streams every job description and final draft of the user as a download.
+    Rows are read through a server-side cursor and written in batches, so memory
+    stays flat however long the history is.
+    """
+    user_id = user.get("id")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    if format == "csv":
+        body, media_type = _export_csv(user_id), "text/csv"
+    else:
+        body, media_type = _export_ndjson(user_id), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="agent-mailer-export-{stamp}.{format}"'},
+    )
+
+
 @router.post('/pdf', status_code=status.HTTP_200_OK)
 async def generate_pdf_endpoint(
     body: str = Form(..., description="Content to be converted to PDF")
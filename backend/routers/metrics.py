@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, status
+from backend.graph.prompt_registry import prompt_registry
+from backend.graph.web_search_tool import search_cache
+from backend.utils.analytics_cache import analytics_cache
+from backend.core.database import pool_metrics
+from backend.utils import password_hash, parse_pool
+from backend.core.security import get_current_user, verified_tokens
+
+# Pool sizes, auth counters and latencies are operational detail, not for anonymous callers
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(get_current_user)])
+
+
+@router.get('/prompts', status_code=status.HTTP_200_OK)
+async def get_prompt_cache_metrics():
+    return prompt_registry.stats()
+
+
+@router.get('/search', status_code=status.HTTP_200_OK)
+async def get_search_cache_metrics():
+    return search_cache.stats()
+
+
+@router.get('/analytics', status_code=status.HTTP_200_OK)
+async def get_analytics_cache_metrics():
+    return analytics_cache.stats()
+
+
+@router.get('/db', status_code=status.HTTP_200_OK)
+async def get_db_pool_metrics():
+    return pool_metrics()
+
+
+@router.get('/password_hash', status_code=status.HTTP_200_OK)
+async def get_password_hash_metrics():
+    return password_hash.stats()
+
+
+@router.get('/auth', status_code=status.HTTP_200_OK)
+async def get_verified_token_cache_metrics():
+    return verified_tokens.stats()
+
+
+@router.get('/parse', status_code=status.HTTP_200_OK)
+async def get_document_parse_metrics():
+    return parse_pool.stats()
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Literal
+from backend.core.database import get_db
+from backend.core.security import get_current_user
+from backend.core.config import SEARCH_PAGE_SIZE_DEFAULT, SEARCH_MAX_OFFSET, LIST_PAGE_SIZE_MAX
+from backend.schemas.search import SearchPage
+from backend.utils.full_text_search import search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+user_dependency = Annotated[dict, Depends(get_current_user)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+
+SEARCH_KINDS = {"all": {"job", "draft"}, "jobs": {"job"}, "drafts": {"draft"}}
+
+
+@router.get('', status_code=status.HTTP_200_OK, response_model=SearchPage)
+async def search_history(
+    user: user_dependency,
+    db: db_dependency,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in job titles, companies, job descriptions, draft subjects and bodies"),
+    kind: Literal["all", "jobs", "drafts"] = "all",
+    limit: int = Query(SEARCH_PAGE_SIZE_DEFAULT, ge=1, le=LIST_PAGE_SIZE_MAX),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+):
+    """
+    Full-text search over the user's jobs and final drafts, best match first.
+    Backed by tsvector + GIN indexes on Postgres and FTS5 tables on SQLite (see migrations 0007 and 0011).
+    Pass `next_offset` back as `offset` for the next page.
+    """
+    items, has_more = await search(db, user.get("id"), q, SEARCH_KINDS[kind], limit, offset)
+    return SearchPage(items=items, next_offset=offset + limit if has_more else None)
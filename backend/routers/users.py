@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, delete, cast, Text
+from sqlalchemy.orm import load_only
+import uuid
 from typing import Annotated
 from backend.core.database import get_db
 from backend.models.user import User
 from backend.models.job_descriptions import JobDescription
-from backend.utils.password_hash import hashed_password
-from backend.schemas.user import Usercreate, UserRead
-from backend.schemas.jobs import JobsResponse
+from backend.models.generated_contents import GeneratedContents
+from backend.models.user_documents import UserDocument, UserDocumentChunk
+from backend.utils.password_hash import ahashed_password
+from backend.schemas.user import Usercreate, UserRead, UserDocumentRead, UserDocumentDetail, UserDocumentUpdate
+from backend.schemas.jobs import JobsResponse, JobSummary
 from backend.core.security import get_current_user
-from backend.utils.file_parser import parse_file
-from backend.utils.context_builder import build_user_context
+from backend.utils.parse_pool import aparse_bytes, read_upload
+from backend.utils.document_store import store_document, document_text
 
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -35,7 +41,7 @@ async def create_user(
         username=payload.username,
         email=payload.email,
         role=payload.role,
-        password_hash=hashed_password(payload.password),
+        password_hash=await ahashed_password(payload.password),
         first_name=payload.first_name,
         last_name=payload.last_name,
         phone=payload.phone,
@@ -63,49 +69,148 @@ async def upload_user_context(
     db: db_dependency,
     files: list[UploadFile] = File(...,description="Upload multiple context files")
 ):
-    parsed_texts = []
-    for file in files:
-        # file.file is the file-like object
+    async def parse(file: UploadFile) -> tuple[str, str]:
         try:
-            content = parse_file(file.file, file.filename)
-            parsed_texts.append(content)
+            return file.filename, await aparse_bytes(await read_upload(file), file.filename)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error parsing file {file.filename}: {str(e)}"
             )
-        
-    context_str = build_user_context(str(user.get("id")), parsed_texts)
-    
-    # Update user in DB
-    result = await db.execute(select(User).where(User.id == user.get("id")))
-    db_user = result.scalars().first()
-    if db_user:
-        if db_user.user_context is None:
-            db_user.user_context = ""
-        db_user.user_context += context_str
-        await db.commit()
-        await db.refresh(db_user)
-        
-    return {"message": "User context updated successfully", "files_processed": len(files)}
+
+    # Files are parsed in parallel in worker processes; no DB connection is held meanwhile
+    parsed = await asyncio.gather(*(parse(file) for file in files))
+
+    # Each file becomes its own document; content that is already stored is not stored again
+    documents = []
+    for filename, content in parsed:
+        if not content.strip():
+            continue
+        document, created = await store_document(db, user.get("id"), filename, content)
+        documents.append({"id": str(document.id), "filename": document.filename, "duplicate": not created})
+    await db.commit()
+
+    return {"message": "User context updated successfully", "files_processed": len(files), "documents": documents}
 
 
 @router.delete('/context', status_code=status.HTTP_200_OK)
 async def delete_user_context(user: user_dependency, db: db_dependency):
-    result = await db.execute(select(User).where(User.id == user.get("id")))
-    db_user = result.scalars().first()
-    
-    if db_user:
-        db_user.user_context = None
-        await db.commit()
-        await db.refresh(db_user)
-        
+    # Chunks are deleted explicitly so this does not depend on the database enforcing ON DELETE CASCADE
+    documents = select(UserDocument.id).where(UserDocument.user_id == user.get("id"))
+    await db.execute(delete(UserDocumentChunk).where(UserDocumentChunk.document_id.in_(documents)))
+    await db.execute(delete(UserDocument).where(UserDocument.user_id == user.get("id")))
+    await db.commit()
     return {"message": "User context deleted successfully"}
 
 
+@router.get('/documents', status_code=status.HTTP_200_OK, response_model=list[UserDocumentRead])
+async def list_documents(user: user_dependency, db: db_dependency):
+    """Lists the user's context documents (metadata only)."""
+    result = await db.execute(
+        select(UserDocument).where(UserDocument.user_id == user.get("id")).order_by(UserDocument.created_at)
+    )
+    return result.scalars().all()
+
+
+@router.get('/documents/{document_id}', status_code=status.HTTP_200_OK, response_model=UserDocumentDetail)
+async def get_document(document_id: uuid.UUID, user: user_dependency, db: db_dependency):
+    document = await _get_document(db, document_id, user.get("id"))
+    return UserDocumentDetail(**UserDocumentRead.model_validate(document).model_dump(), text=await document_text(db, document.id))
+
+
+@router.patch('/documents/{document_id}', status_code=status.HTTP_200_OK, response_model=UserDocumentRead)
+async def update_document(document_id: uuid.UUID, payload: UserDocumentUpdate, user: user_dependency, db: db_dependency):
+    """Includes or excludes a document from the context used for generation."""
+    document = await _get_document(db, document_id, user.get("id"))
+    document.is_active = payload.is_active
+    await db.commit()
+    return document
+
+
+@router.delete('/documents/{document_id}', status_code=status.HTTP_200_OK)
+async def delete_document(document_id: uuid.UUID, user: user_dependency, db: db_dependency):
+    document = await _get_document(db, document_id, user.get("id"))
+    await db.execute(delete(UserDocumentChunk).where(UserDocumentChunk.document_id == document.id))
+    await db.delete(document)
+    await db.commit()
+    return {"message": "Document deleted successfully"}
+
+
+async def _get_document(db: AsyncSession, document_id: uuid.UUID, user_id) -> UserDocument:
+    result = await db.execute(select(UserDocument).where(UserDocument.id == document_id, UserDocument.user_id == user_id))
+    document = result.scalars().first()
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    return document
+
+
+@router.get('/jobs/summary', status_code=status.HTTP_200_OK, response_model=list[JobSummary])
+async def get_jobs_summary(
+    user: user_dependency,
+    db: db_dependency,
+    skill: str | None = Query(None, description="Only jobs whose generated context lists this required skill"),
+    location: str | None = Query(None, description="Only jobs whose generated context location contains this text"),
+):
+    """
+    Lists the user's jobs newest first with their draft counts, without the job text.
+    Location and required skills are pulled out of the generated context by the database.
+    """
+    draft_counts = (
+        select(GeneratedContents.jd_id, func.count().label("draft_count"))
+        .where(GeneratedContents.user_id == user.get("id"), GeneratedContents.is_provisional.is_(False))
+        .group_by(GeneratedContents.jd_id)
+        .subquery()
+    )
+    context_location = JobDescription.generated_context["location"].as_string()
+    context_skills = JobDescription.generated_context["required_skills"]
+    stmt = (
+        select(JobDescription, func.coalesce(draft_counts.c.draft_count, 0), context_location, context_skills)
+        .options(load_only(JobDescription.id, JobDescription.title, JobDescription.company, JobDescription.created_at))
+        .outerjoin(draft_counts, draft_counts.c.jd_id == JobDescription.id)
+        .where(JobDescription.user_id == user.get("id"))
+        .order_by(JobDescription.created_at.desc())
+    )
+    if skill:
+        # Matches the quoted element in the serialized skills array, so "java" does not match "javascript"
+        stmt = stmt.where(func.lower(cast(context_skills, Text)).contains(f'"{skill.lower()}"'))
+    if location:
+        stmt = stmt.where(func.lower(context_location).contains(location.lower()))
+    result = await db.execute(stmt)
+    return [
+        JobSummary(
+            id=job.id,
+            title=job.title,
+            company=job.company,
+            created_at=job.created_at,
+            draft_count=draft_count,
+            location=job_location,
+            required_skills=skills or [],
+        )
+        for job, draft_count, job_location, skills in result.all()
+    ]
+
+
+@router.get('/jobs/{jd_id}', status_code=status.HTTP_200_OK, response_model=JobsResponse)
+async def get_job(jd_id: uuid.UUID, user:user_dependency, db:db_dependency):
+    result = await db.execute(select(JobDescription).where(JobDescription.id == jd_id, JobDescription.user_id == user.get("id")))
+    job = result.scalars().first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
+    return JobsResponse(
+        id=job.id,
+        title=job.title,
+        company=job.company,
+        jd_text=job.jd_text,
+        generated_context=job.generated_context,
+        created_at=job.created_at,
+    )
+
 
-@router.get('/jobs', status_code=status.HTTP_200_OK, response_model=list[JobsResponse])
+@router.get('/jobs', status_code=status.HTTP_200_OK, response_model=list[JobsResponse], deprecated=True)
 async def get_jobs(user:user_dependency, db:db_dependency):
+    """Deprecated: returns every job with its full text. Use /users/jobs/summary and /users/jobs/{jd_id}."""
     result = await db.execute(select(JobDescription).where(JobDescription.user_id == user.get("id")))
     jobs = result.scalars().all()
     response = []
@@ -7,4 +7,9 @@ class LoginRequest(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    token_type: str = "bearer"
+    refresh_token: str | None = None
+    expires_in: int | None = None  # access token lifetime in seconds
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
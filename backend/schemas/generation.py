@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from datetime import datetime
+import uuid
+from backend.models.generated_contents import ContentTypes
+
+
+class GeneratedContentItem(BaseModel):
+    id: uuid.UUID
+    jd_id: uuid.UUID
+    content_type: ContentTypes
+    to_address: str | None = None
+    subject: str | None = None
+    body: str
+    model_used: str | None = None
+    prompt_version: str | None = None
+    created_at: datetime
+    job_title: str | None = None
+    company_name: str | None = None
+
+
+class GeneratedContentPage(BaseModel):
+    items: list[GeneratedContentItem]
+    next_cursor: str | None = None
+
+
+class GeneratedContentSummary(BaseModel):
+    """A list entry without the body; fetch GET /generation/contents/{id} for the full draft."""
+    id: uuid.UUID
+    jd_id: uuid.UUID
+    content_type: ContentTypes
+    to_address: str | None = None
+    subject: str | None = None
+    prompt_version: str | None = None
+    created_at: datetime
+    job_title: str | None = None
+    company_name: str | None = None
+
+
+class GeneratedContentSummaryPage(BaseModel):
+    items: list[GeneratedContentSummary]
+    next_cursor: str | None = None
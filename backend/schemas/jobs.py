@@ -1,8 +1,38 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
 import uuid
+
+
+class GeneratedContext(BaseModel):
+    """Typed view of JobDescription.generated_context; unknown keys (e.g. raw_content) are kept."""
+    model_config = ConfigDict(extra="allow")
+
+    job_title: str | None = None
+    company_name: str | None = None
+    location: str | None = None
+    required_skills: list[str] = []
+    responsibilities: list[str] = []
+    company_summary: str | None = None
+    recent_company_news: list[str] = []
+    hiring_contact: str | None = None
+    matching_experience: list[str] = []
+    talking_points: list[str] = []
+
+
 class JobsResponse(BaseModel):
     id: uuid.UUID
     title: str
     company: str
     jd_text: str
-    generated_context: str | None = None
\ No newline at end of file
+    generated_context: GeneratedContext | None = None
+    created_at: datetime | None = None
+
+
+class JobSummary(BaseModel):
+    id: uuid.UUID
+    title: str
+    company: str
+    created_at: datetime
+    draft_count: int = 0
+    location: str | None = None
+    required_skills: list[str] = []
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Literal
+import uuid
+from backend.models.generated_contents import ContentTypes
+
+
+class SearchResult(BaseModel):
+    """A matching job (`id` == `jd_id`) or draft; `snippet` marks matched words with [ ]."""
+    kind: Literal["job", "draft"]
+    id: uuid.UUID
+    jd_id: uuid.UUID
+    title: str | None = None
+    company: str | None = None
+    content_type: ContentTypes | None = None
+    subject: str | None = None
+    snippet: str | None = None
+    rank: float
+    created_at: datetime
+
+
+class SearchPage(BaseModel):
+    items: list[SearchResult]
+    next_offset: int | None = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, validator, Field
 from uuid import UUID
+from datetime import datetime
 
 class Usercreate(BaseModel):
     username: str
@@ -25,7 +26,26 @@ class UserRead(BaseModel):
     linkedin: str | None = None
     github: str | None = None
     portfolio: str | None = None
-    user_context: str | None = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class UserDocumentRead(BaseModel):
+    id: UUID
+    filename: str
+    char_count: int
+    chunk_count: int
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class UserDocumentDetail(UserDocumentRead):
+    text: str
+
+
+class UserDocumentUpdate(BaseModel):
+    is_active: bool
\ No newline at end of file
@@ -0,0 +1,39 @@
+import itertools
+from backend.core.config import ANALYTICS_CACHE_TTL_SECONDS, ANALYTICS_CACHE_MAX_ENTRIES
+from backend.utils.ttl_cache import TTLCache
+
+# (user_id, generation, query params) -> analytics result; each variant keeps its own TTL
+analytics_cache = TTLCache(maxsize=ANALYTICS_CACHE_MAX_ENTRIES, ttl=ANALYTICS_CACHE_TTL_SECONDS)
+
+# user_id -> generation; bumping it orphans every cached variant for that user, which then expire unread.
+# Generations are never reused, so a user whose generation expired or was evicted just gets a new one
+# and misses once; twice the entry TTL so that rarely happens while their entries are still live.
+_generations = TTLCache(maxsize=ANALYTICS_CACHE_MAX_ENTRIES, ttl=2 * ANALYTICS_CACHE_TTL_SECONDS)
+_next_generation = itertools.count(1)
+
+
+def analytics_key(user_id, params: tuple) -> tuple:
+    """
+    Take the key before querying, so a result computed across a write is stored under the old generation.
+
+    Assumes a single process: a write in another worker does not bump this worker's generation, so its
+    cached analytics stay stale for up to ANALYTICS_CACHE_TTL_SECONDS.
+    """
+    generation = _generations.get(str(user_id))
+    if generation is None:
+        generation = next(_next_generation)
+        _generations.set(str(user_id), generation)
+    return str(user_id), generation, params
+
+
+def get_cached_analytics(key: tuple):
+    return analytics_cache.get(key)
+
+
+def cache_analytics(key: tuple, result: dict) -> None:
+    analytics_cache.set(key, result)
+
+
+def invalidate_analytics(user_id) -> None:
+    """Call after any write that changes the user's jobs or drafts."""
+    _generations.set(str(user_id), next(_next_generation))
@@ -0,0 +1,37 @@
+import hashlib
+import re
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalizes a job description so that copies differing only in case or
+    whitespace produce the same cache key.
+    """
+    return re.sub(r"\s+", " ", job_description).strip().lower()
+
+
+def digest_text(text: str | None) -> str:
+    """Returns the hex SHA-256 digest of `text` (empty string for None)."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def build_context_cache_key(job_description: str, user_context_digest: str, prompt_version: str, model_name: str) -> str:
+    """
+    Builds the content address of a generated JD context.
+
+    Args:
+        job_description (str): The raw job description text.
+        user_context_digest (str): Digest of the user context the context was generated from.
+        prompt_version (str): The context generator prompt name/version.
+        model_name (str): The model used by the context agent.
+
+    Returns:
+        str: A hex SHA-256 key that changes whenever any of the inputs change.
+    """
+    parts = [
+        digest_text(normalize_job_description(job_description)),
+        user_context_digest,
+        prompt_version,
+        model_name,
+    ]
+    return digest_text("\x1f".join(parts))
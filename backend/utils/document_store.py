@@ -0,0 +1,96 @@
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.core.config import USER_DOCUMENT_CHUNK_CHARS
+from backend.models.user_documents import UserDocument, UserDocumentChunk
+from backend.utils.context_builder import build_user_context
+from backend.utils.context_cache import digest_text
+
+
+def chunk_text(text: str, max_chars: int = USER_DOCUMENT_CHUNK_CHARS) -> list[str]:
+    """Splits text into chunks of at most `max_chars`, preferring paragraph and line boundaries."""
+    chunks = []
+    while len(text) > max_chars:
+        cut = text.rfind("\n\n", 0, max_chars)
+        if cut <= 0:
+            cut = text.rfind("\n", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        chunks.append(text[:cut])
+        text = text[cut:]
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+async def store_document(db: AsyncSession, user_id, filename: str, text: str) -> tuple[UserDocument, bool]:
+    """
+    Stores an uploaded document as chunks, deduplicated by content hash.
+    Re-uploading a stored document re-activates it instead of storing it again.
+
+    Returns:
+        tuple[UserDocument, bool]: The document and whether it was newly stored.
+    """
+    text = text.strip()
+    content_hash = digest_text(text)
+    result = await db.execute(
+        select(UserDocument).where(UserDocument.user_id == user_id, UserDocument.content_hash == content_hash)
+    )
+    existing = result.scalars().first()
+    if existing:
+        existing.is_active = True
+        return existing, False
+
+    chunks = chunk_text(text)
+    document = UserDocument(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        filename=filename[:255],
+        content_hash=content_hash,
+        char_count=len(text),
+        chunk_count=len(chunks),
+    )
+    db.add(document)
+    db.add_all(UserDocumentChunk(document_id=document.id, position=i, text=chunk) for i, chunk in enumerate(chunks))
+    # Flush so a duplicate later in the same upload finds this one
+    await db.flush()
+    return document, True
+
+
+async def active_documents_digest(db: AsyncSession, user_id) -> str | None:
+    """
+    Digest of the user's active documents, computed from their hashes without loading any text.
+    Returns None when the user has no active documents.
+    """
+    result = await db.execute(
+        select(UserDocument.content_hash)
+        .where(UserDocument.user_id == user_id, UserDocument.is_active.is_(True))
+        .order_by(UserDocument.content_hash)
+    )
+    hashes = result.scalars().all()
+    return digest_text(",".join(hashes)) if hashes else None
+
+
+async def assemble_user_context(db: AsyncSession, user_id) -> str | None:
+    """Builds the user context from the user's active documents only (None when there are none)."""
+    result = await db.execute(
+        select(UserDocumentChunk.document_id, UserDocumentChunk.text)
+        .join(UserDocument, UserDocument.id == UserDocumentChunk.document_id)
+        .where(UserDocument.user_id == user_id, UserDocument.is_active.is_(True))
+        .order_by(UserDocument.created_at, UserDocument.id, UserDocumentChunk.position)
+    )
+    documents = {}
+    for document_id, text in result:
+        documents.setdefault(document_id, []).append(text)
+    if not documents:
+        return None
+    return build_user_context(str(user_id), ["".join(chunks) for chunks in documents.values()])
+
+
+async def document_text(db: AsyncSession, document_id) -> str:
+    result = await db.execute(
+        select(UserDocumentChunk.text)
+        .where(UserDocumentChunk.document_id == document_id)
+        .order_by(UserDocumentChunk.position)
+    )
+    return "".join(result.scalars())
@@ -0,0 +1,85 @@
+import json
+import uuid
+from backend.models.generated_contents import GeneratedContents, ContentTypes
+
+# Maps the graph's draft type names to the stored content types
+DRAFT_TYPES = {
+    "email": ContentTypes.COLD_EMAIL,
+    "linkedin_message": ContentTypes.LINKEDIN_MESSAGE,
+    "cover_letter": ContentTypes.COVER_LETTER,
+}
+
+# The draft_graph node that writes each draft type, used to attribute usage to a row
+DRAFT_NODES = {
+    "email": "email_drafter_agent",
+    "linkedin_message": "linkedin_message_agent",
+    "cover_letter": "cover_letter_agent",
+}
+
+
+def build_generated_content(
+    jd_id: uuid.UUID,
+    user_id,
+    draft_type: str,
+    result_state: dict,
+    usage: dict | None = None,
+) -> GeneratedContents:
+    """
+    Builds a GeneratedContents row from a finished draft_graph state.
+
+    Args:
+        jd_id: The job description the draft belongs to.
+        user_id: The owner of the draft.
+        draft_type (str): One of the keys of DRAFT_TYPES.
+        result_state (dict): The state returned by draft_graph.
+        usage (dict | None): The drafter node's UsageTracker summary, if the run was tracked.
+
+    Returns:
+        GeneratedContents: The unsaved row.
+    """
+    draft = result_state.get(draft_type) or {}
+    prompt_version = (result_state.get('prompt_versions') or {}).get(draft_type, result_state.get('prompt_version'))
+    usage = usage or {}
+    return GeneratedContents(
+        jd_id=jd_id,
+        user_id=user_id,
+        content_type=DRAFT_TYPES[draft_type],
+        to_address=draft.get('recipient'),
+        subject=draft.get('subject'),
+        body=draft.get('body'),
+        model_used=result_state.get('model_used'),
+        prompt_version=prompt_version,
+        prompt_tokens=usage.get('prompt_tokens'),
+        completion_tokens=usage.get('completion_tokens'),
+        cached_tokens=usage.get('cached_tokens'),
+        ttft_ms=usage.get('ttft_ms'),
+        latency_ms=usage.get('latency_ms'),
+        usage=usage.get('calls'),
+    )
+
+
+def draft_usage(tracker, draft_type: str) -> dict:
+    """Returns the usage summary of the node that drafted `draft_type`."""
+    return tracker.summary(DRAFT_NODES[draft_type])
+
+
+def context_text(context: dict) -> str:
+    """Renders a stored generated_context as the JSON text the drafter prompts take."""
+    return json.dumps(context, ensure_ascii=False)
+
+
+def build_user_details(db_user) -> dict:
+    """Builds the sender details the drafter prompts sign messages with."""
+    return {
+        "name": f"{db_user.first_name} {db_user.last_name}",
+        "email": db_user.email,
+        "phone": db_user.phone,
+        "linkedin_url": db_user.linkedin,
+        "github_url": db_user.github,
+    }
+
+
+def draft_from_row(row: GeneratedContents) -> dict:
+    """Returns a stored row in the same shape draft_graph returns a draft."""
+    draft = {"recipient": row.to_address, "subject": row.subject, "body": row.body}
+    return {key: value for key, value in draft.items() if value is not None}
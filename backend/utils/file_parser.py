@@ -43,3 +43,8 @@ def parse_file(file_obj, filename: str) -> str:
     except Exception as e:
         # Log or re-raise with context if needed
         raise ValueError(f"Error parsing file {filename}: {str(e)}")
+
+
+def parse_bytes(data: bytes, filename: str) -> str:
+    """parse_file over an upload's raw bytes; a picklable entry point for the parsing worker processes."""
+    return parse_file(io.BytesIO(data), filename)
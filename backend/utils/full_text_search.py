@@ -0,0 +1,156 @@
+import re
+from sqlalchemy import select, literal, literal_column, union_all, func, table, column
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.core.database import engine
+from backend.models.job_descriptions import JobDescription
+from backend.models.generated_contents import GeneratedContents
+
+# Search text config on Postgres; must match the one migration 0007 indexes with
+_ts_config = literal_column("'english'")
+_headline_options = "StartSel=[, StopSel=], MaxFragments=2, MaxWords=20, MinWords=8"
+
+# Keyed on the row's id (migration 0011): rowids of UUID-keyed tables are not stable across VACUUM
+_jobs_fts = table("job_descriptions_fts", column("id"))
+_drafts_fts = table("generated_contents_fts", column("id"))
+
+
+def fts5_query(text: str) -> str:
+    """Turns free text into an FTS5 query that matches every word, so user input can never be a syntax error."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+
+class _Postgres:
+    """tsvector columns with GIN indexes, ranked by ts_rank_cd."""
+
+    def __init__(self, text: str):
+        self.query = func.websearch_to_tsquery(_ts_config, text)
+
+    def jobs(self, stmt):
+        vector = literal_column("job_descriptions.search_vector")
+        return stmt.where(vector.op("@@")(self.query)), func.ts_rank_cd(vector, self.query)
+
+    def drafts(self, stmt):
+        vector = literal_column("generated_contents.search_vector")
+        return stmt.where(vector.op("@@")(self.query)), func.ts_rank_cd(vector, self.query)
+
+    def job_snippet(self, stmt):
+        return stmt, func.ts_headline(_ts_config, JobDescription.jd_text, self.query, _headline_options)
+
+    def draft_snippet(self, stmt):
+        return stmt, func.ts_headline(_ts_config, GeneratedContents.body, self.query, _headline_options)
+
+
+class _SQLite:
+    """FTS5 tables ranked by bm25 (negated, so higher is better like ts_rank)."""
+
+    def __init__(self, text: str):
+        self.query = fts5_query(text)
+
+    def _match(self, stmt, fts, model, name):
+        return (
+            stmt.join(fts, fts.c.id == literal_column(f"{model.__tablename__}.id"))
+            .where(literal_column(name).op("MATCH")(self.query))
+        )
+
+    def jobs(self, stmt):
+        stmt = self._match(stmt, _jobs_fts, JobDescription, "job_descriptions_fts")
+        # Weights per column: id (unindexed), title, company, jd_text
+        return stmt, -func.bm25(literal_column("job_descriptions_fts"), 0.0, 10.0, 10.0, 1.0)
+
+    def drafts(self, stmt):
+        stmt = self._match(stmt, _drafts_fts, GeneratedContents, "generated_contents_fts")
+        # Weights per column: id (unindexed), subject, body, job_title, company
+        return stmt, -func.bm25(literal_column("generated_contents_fts"), 0.0, 10.0, 4.0, 1.0, 1.0)
+
+    def job_snippet(self, stmt):
+        stmt = self._match(stmt, _jobs_fts, JobDescription, "job_descriptions_fts")
+        return stmt, func.snippet(literal_column("job_descriptions_fts"), 3, "[", "]", "…", 16)
+
+    def draft_snippet(self, stmt):
+        stmt = self._match(stmt, _drafts_fts, GeneratedContents, "generated_contents_fts")
+        return stmt, func.snippet(literal_column("generated_contents_fts"), 2, "[", "]", "…", 16)
+
+
+def _search_backend(text: str):
+    return _Postgres(text) if engine.dialect.name == "postgresql" else _SQLite(text)
+
+
+async def search(db: AsyncSession, user_id, text: str, kinds: set[str], limit: int, offset: int) -> tuple[list[dict], bool]:
+    """
+    Ranks the user's jobs and/or final drafts matching `text`, best match first.
+
+    Only the ids and ranks of the requested page are computed over every match;
+    snippets and the remaining columns are then loaded for that page alone.
+
+    Returns:
+        tuple[list[dict], bool]: The page of results and whether more follow it.
+    """
+    backend = _search_backend(text)
+    if isinstance(backend, _SQLite) and not backend.query:
+        return [], False
+
+    ranked = []
+    if "job" in kinds:
+        stmt = select(JobDescription.id, JobDescription.created_at).where(JobDescription.user_id == user_id)
+        stmt, rank = backend.jobs(stmt)
+        ranked.append(stmt.add_columns(literal("job").label("kind"), rank.label("rank")))
+    if "draft" in kinds:
+        stmt = select(GeneratedContents.id, GeneratedContents.created_at).where(
+            GeneratedContents.user_id == user_id, GeneratedContents.is_provisional.is_(False)
+        )
+        stmt, rank = backend.drafts(stmt)
+        ranked.append(stmt.add_columns(literal("draft").label("kind"), rank.label("rank")))
+
+    matches = (union_all(*ranked) if len(ranked) > 1 else ranked[0]).subquery()
+    page = (await db.execute(
+        select(matches)
+        .order_by(matches.c.rank.desc(), matches.c.created_at.desc(), matches.c.id)
+        .limit(limit + 1)
+        .offset(offset)
+    )).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    job_ids = [row.id for row in page if row.kind == "job"]
+    draft_ids = [row.id for row in page if row.kind == "draft"]
+    details = {}
+    if job_ids:
+        stmt, snippet = backend.job_snippet(
+            select(JobDescription.id, JobDescription.title, JobDescription.company).where(JobDescription.id.in_(job_ids))
+        )
+        for row in await db.execute(stmt.add_columns(snippet.label("snippet"))):
+            details[("job", row.id)] = {
+                "jd_id": row.id,
+                "title": row.title,
+                "company": row.company,
+                "snippet": row.snippet,
+            }
+    if draft_ids:
+        stmt, snippet = backend.draft_snippet(
+            select(
+                GeneratedContents.id,
+                GeneratedContents.jd_id,
+                GeneratedContents.content_type,
+                GeneratedContents.subject,
+                JobDescription.title,
+                JobDescription.company,
+            )
+            .join(JobDescription, GeneratedContents.jd_id == JobDescription.id)
+            .where(GeneratedContents.id.in_(draft_ids))
+        )
+        for row in await db.execute(stmt.add_columns(snippet.label("snippet"))):
+            details[("draft", row.id)] = {
+                "jd_id": row.jd_id,
+                "title": row.title,
+                "company": row.company,
+                "content_type": row.content_type,
+                "subject": row.subject,
+                "snippet": row.snippet,
+            }
+
+    results = [
+        {"kind": row.kind, "id": row.id, "rank": row.rank, "created_at": row.created_at, **details[(row.kind, row.id)]}
+        for row in page
+        if (row.kind, row.id) in details
+    ]
+    return results, has_more
@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, UploadFile, status
+from backend.core.config import DOCUMENT_PARSE_WORKERS, DOCUMENT_PARSE_TIMEOUT_SECONDS, DOCUMENT_MAX_BYTES
+from backend.utils.file_parser import parse_bytes
+
+# Each parse gets its own child process, so one that overruns can be killed without touching the others.
+# Not forked from the server: the children must not inherit the event loop, DB pools or threads.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _context = multiprocessing.get_context("forkserver")
+    _context.set_forkserver_preload(["backend.utils.file_parser"])
+else:
+    _context = multiprocessing.get_context("spawn")
+
+# One thread per parse slot; it starts the child, waits on it and kills it on timeout
+_slots: ThreadPoolExecutor | None = None
+_children = set()
+_children_lock = threading.Lock()
+_pending = 0
+_timeouts = 0
+_killed = 0
+
+
+def _get_slots() -> ThreadPoolExecutor:
+    global _slots
+    if _slots is None:
+        _slots = ThreadPoolExecutor(max_workers=DOCUMENT_PARSE_WORKERS, thread_name_prefix="document-parse")
+    return _slots
+
+
+def _parse_in_child(conn, parse, data: bytes, filename: str) -> None:
+    conn.send(None)  # the parse starts now; the timeout counts from here, not from when the file was queued
+    try:
+        conn.send((True, parse(data, filename)))
+    except Exception as e:
+        conn.send((False, str(e)))
+    finally:
+        conn.close()
+
+
+def _parse_in_process(parse, data: bytes, filename: str) -> str:
+    """Runs on a slot thread: `parse` in a fresh child process, killed if it overruns the timeout."""
+    global _killed
+    receiver, sender = _context.Pipe(duplex=False)
+    process = _context.Process(target=_parse_in_child, args=(sender, parse, data, filename), daemon=True)
+    with _children_lock:
+        _children.add(process)
+    try:
+        process.start()
+        sender.close()
+        receiver.recv()
+        if not receiver.poll(DOCUMENT_PARSE_TIMEOUT_SECONDS):
+            raise TimeoutError(filename)
+        ok, value = receiver.recv()
+    except EOFError:
+        raise ValueError(f"Error parsing file {filename}: parser process crashed")
+    finally:
+        receiver.close()
+        with _children_lock:
+            _children.discard(process)
+            if process.is_alive():
+                process.kill()
+                _killed += 1
+        if process.pid is not None:
+            process.join()
+    if not ok:
+        raise ValueError(value)
+    return value
+
+
+def _too_large(filename: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{filename} is larger than {DOCUMENT_MAX_BYTES // (1024 * 1024)} MB.",
+    )
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    """
+    Reads an upload, raising 413 once it is over DOCUMENT_MAX_BYTES.
+
+    Uses the size the upload reports when there is one, and never reads more than one byte past the limit.
+    """
+    if file.size is not None and file.size > DOCUMENT_MAX_BYTES:
+        raise _too_large(file.filename)
+    data = await file.read(DOCUMENT_MAX_BYTES + 1)
+    if len(data) > DOCUMENT_MAX_BYTES:
+        raise _too_large(file.filename)
+    return data
+
+
+async def aparse_bytes(data: bytes, filename: str) -> str:
+    """
+    parse_bytes in a child process, off the event loop.
+
+    Raises 413 for files over DOCUMENT_MAX_BYTES and 400 for files that take longer than
+    DOCUMENT_PARSE_TIMEOUT_SECONDS; parse errors surface as ValueError like parse_file.
+    """
+    global _pending, _timeouts
+    if len(data) > DOCUMENT_MAX_BYTES:
+        raise _too_large(filename)
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_slots(), _parse_in_process, parse_bytes, data, filename
+        )
+    except TimeoutError:
+        _timeouts += 1
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error parsing file {filename}: took longer than {DOCUMENT_PARSE_TIMEOUT_SECONDS:g}s",
+        )
+    finally:
+        _pending -= 1
+
+
+def shutdown() -> None:
+    global _slots
+    with _children_lock:
+        for process in _children:
+            if process.is_alive():
+                process.kill()
+    if _slots is not None:
+        _slots.shutdown(wait=False, cancel_futures=True)
+        _slots = None
+
+
+def stats() -> dict:
+    return {
+        "workers": DOCUMENT_PARSE_WORKERS,
+        "pending": _pending,
+        "timeouts": _timeouts,
+        "killed": _killed,
+        "timeout_seconds": DOCUMENT_PARSE_TIMEOUT_SECONDS,
+        "max_bytes": DOCUMENT_MAX_BYTES,
+    }
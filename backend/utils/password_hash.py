@@ -1,10 +1,48 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from backend.core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+# argon2-cffi releases the GIL while hashing, so threads run hashes in parallel off the event loop
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_pending = 0
+
 
 def hashed_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def _run(fn, *args):
+    global _pending
+    # Admission control: beyond this many queued hashes a login would only wait longer, so shed it now
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins at once, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def ahashed_password(password: str) -> str:
+    """hashed_password on the hashing pool; raises 503 when the pool is saturated."""
+    return await _run(hashed_password, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool; raises 503 when the pool is saturated."""
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+def stats() -> dict:
+    return {"workers": PASSWORD_HASH_WORKERS, "pending": _pending, "max_pending": PASSWORD_HASH_MAX_PENDING}
@@ -0,0 +1,22 @@
+import math
+
+
+def percentile(sorted_values: list[float], pct: float) -> float | None:
+    """Linearly interpolated percentile of an already sorted list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(values, percentiles: tuple[int, ...] = (50, 90, 99)) -> dict:
+    """Returns count, mean and the requested percentiles of `values`, ignoring None."""
+    data = sorted(v for v in values if v is not None)
+    summary = {"count": len(data), "mean": round(sum(data) / len(data), 1) if data else None}
+    for pct in percentiles:
+        value = percentile(data, pct)
+        summary[f"p{pct}"] = round(value, 1) if value is not None else None
+    return summary
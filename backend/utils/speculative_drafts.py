@@ -0,0 +1,186 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from langchain_core.messages import RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.core.config import (
+    SPECULATIVE_DRAFT_MAX_TYPES,
+    SPECULATIVE_DRAFT_CONCURRENCY,
+    SPECULATIVE_DRAFT_TTL_HOURS,
+    SPECULATIVE_DRAFT_GC_INTERVAL_SECONDS,
+)
+from backend.core.database import async_session_maker
+from backend.graph.main import draft_graph, DRAFTER_NODES
+from backend.graph.checkpointer import draft_thread_id, predraft_thread_id, delete_thread
+from backend.models.generated_contents import GeneratedContents
+from backend.graph.usage import UsageTracker
+from backend.utils.draft_store import DRAFT_TYPES, build_generated_content, draft_usage
+from backend.utils.analytics_cache import invalidate_analytics
+
+# In-flight speculative runs keyed by (jd_id, draft type), so draft_context can join them
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+# Caps how many speculative runs compete with interactive requests for the LLM
+_semaphore = asyncio.Semaphore(SPECULATIVE_DRAFT_CONCURRENCY)
+
+
+async def most_used_types(db: AsyncSession, user_id, limit: int = SPECULATIVE_DRAFT_MAX_TYPES) -> list[str]:
+    """Returns the user's most drafted content types, most used first (defaults to email)."""
+    result = await db.execute(
+        select(GeneratedContents.content_type, func.count().label("uses"))
+        .where(GeneratedContents.user_id == user_id, GeneratedContents.is_provisional.is_(False))
+        .group_by(GeneratedContents.content_type)
+        .order_by(func.count().desc())
+        .limit(limit)
+    )
+    draft_types = {content_type: draft_type for draft_type, content_type in DRAFT_TYPES.items()}
+    types = [draft_types[row.content_type] for row in result]
+    return types or ["email"]
+
+
+def schedule_predrafts(jd_id: uuid.UUID, user_id, context: str, user_details: dict, types: list[str]) -> None:
+    """Starts a background draft_graph run for every type that is not already being pre-drafted."""
+    for draft_type in types:
+        key = (str(jd_id), draft_type)
+        if key in _inflight:
+            continue
+        task = asyncio.create_task(_predraft(jd_id, user_id, draft_type, context, user_details))
+        _inflight[key] = task
+        task.add_done_callback(lambda _, key=key: _inflight.pop(key, None))
+
+
+async def start_predrafts(db: AsyncSession, jd_id: uuid.UUID, user_id, context: str, user_details: dict) -> None:
+    """Pre-drafts the user's most used content types for a job, skipping types already pre-drafted."""
+    types = await most_used_types(db, user_id)
+    result = await db.execute(
+        select(GeneratedContents.content_type)
+        .where(
+            GeneratedContents.user_id == user_id,
+            GeneratedContents.jd_id == jd_id,
+            GeneratedContents.is_provisional.is_(True),
+        )
+        .distinct()
+    )
+    ready = {content_type for content_type in result.scalars()}
+    schedule_predrafts(jd_id, user_id, context, user_details, [t for t in types if DRAFT_TYPES[t] not in ready])
+
+
+async def claim_predraft(db: AsyncSession, jd_id: uuid.UUID, user_id, draft_type: str) -> GeneratedContents | None:
+    """
+    Returns the pre-drafted row for (jd_id, draft_type) and marks it as final.
+    Waits for an in-flight speculative run instead of starting a second one.
+    Returns None when no pre-draft exists or it failed.
+    """
+    task = _inflight.get((str(jd_id), draft_type))
+    if task is not None:
+        # Shield so a cancelled request does not cancel the shared background run
+        await asyncio.shield(task)
+
+    result = await db.execute(
+        select(GeneratedContents)
+        .where(
+            GeneratedContents.user_id == user_id,
+            GeneratedContents.jd_id == jd_id,
+            GeneratedContents.content_type == DRAFT_TYPES[draft_type],
+            GeneratedContents.is_provisional.is_(True),
+        )
+        .order_by(GeneratedContents.created_at.desc())
+        .limit(1)
+    )
+    row = result.scalars().first()
+    if row is None:
+        return None
+
+    # Only one concurrent request may claim a given row
+    claimed = await db.execute(
+        update(GeneratedContents)
+        .where(GeneratedContents.id == row.id, GeneratedContents.is_provisional.is_(True))
+        .values(is_provisional=False)
+    )
+    await db.commit()
+    if claimed.rowcount != 1:
+        return None
+    # A claimed pre-draft now counts as one of the user's drafts
+    invalidate_analytics(user_id)
+    try:
+        await _adopt_conversation(jd_id, draft_type, row.id)
+    except Exception as e:
+        print(f"Error adopting pre-draft conversation {row.id}: {e}")
+    return row
+
+
+async def _adopt_conversation(jd_id: uuid.UUID, draft_type: str, content_id: uuid.UUID) -> None:
+    """Moves a claimed pre-draft's conversation onto the (jd, type) thread, so feedback on it continues there."""
+    saver = draft_graph.checkpointer
+    if saver is None:
+        return
+    source = predraft_thread_id(content_id)
+    snapshot = await draft_graph.aget_state({"configurable": {"thread_id": source}})
+    if snapshot.values:
+        values = dict(snapshot.values)
+        # Replaces the thread's conversation, as a first interactive draft would
+        values["messages"] = [RemoveMessage(id=REMOVE_ALL_MESSAGES), *values.get("messages", [])]
+        await draft_graph.aupdate_state(
+            {"configurable": {"thread_id": draft_thread_id(jd_id, draft_type)}},
+            values,
+            as_node=DRAFTER_NODES[draft_type],
+        )
+    await delete_thread(saver, source)
+
+
+async def _predraft(jd_id: uuid.UUID, user_id, draft_type: str, context: str, user_details: dict) -> None:
+    state = {
+        "context": context,
+        "type": draft_type,
+        "user_details": user_details,
+        "feedback": None,
+    }
+    # Its own thread, so it never interleaves with an interactive draft of the same (jd, type)
+    content_id = uuid.uuid4()
+    thread_id = predraft_thread_id(content_id)
+    try:
+        async with _semaphore:
+            tracker = UsageTracker()
+            config = {"configurable": {"thread_id": thread_id}, "callbacks": [tracker]}
+            result_state = await draft_graph.ainvoke(state, config=config, durability="exit")
+        async with async_session_maker() as session:
+            generated_content = build_generated_content(
+                jd_id, user_id, draft_type, result_state, usage=draft_usage(tracker, draft_type)
+            )
+            generated_content.id = content_id
+            generated_content.is_provisional = True
+            session.add(generated_content)
+            await session.commit()
+    except Exception as e:
+        print(f"Error pre-drafting {draft_type} for job {jd_id}: {e}")
+        await delete_thread(draft_graph.checkpointer, thread_id)
+
+
+async def purge_stale_predrafts(max_age_hours: int = SPECULATIVE_DRAFT_TTL_HOURS) -> int:
+    """Deletes unclaimed pre-drafts older than `max_age_hours` and their threads. Returns the number deleted."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+    async with async_session_maker() as session:
+        result = await session.execute(
+            delete(GeneratedContents)
+            .where(GeneratedContents.is_provisional.is_(True), GeneratedContents.created_at < cutoff)
+            .returning(GeneratedContents.id)
+        )
+        stale = list(result.scalars())
+        await session.commit()
+    for content_id in stale:
+        await delete_thread(draft_graph.checkpointer, predraft_thread_id(content_id))
+    return len(stale)
+
+
+async def run_predraft_gc(interval: int = SPECULATIVE_DRAFT_GC_INTERVAL_SECONDS) -> None:
+    """Purges stale pre-drafts forever; run as a background task."""
+    while True:
+        try:
+            deleted = await purge_stale_predrafts()
+            if deleted:
+                print(f"Pre-draft GC deleted {deleted} unclaimed pre-drafts")
+        except Exception as e:
+            print(f"Error purging stale pre-drafts: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,84 @@
+"""
+Concurrent drafting throughput: async graph nodes vs the old sync nodes, with a fake LLM.
+
+The fake LLM answers after a fixed latency. The "sync" graph drafts with a node that calls
+`invoke` (as the nodes did before), which LangGraph runs on its worker thread pool under
+`ainvoke`; the "async" graph is the real draft_graph, whose nodes await `ainvoke`.
+
+    python -m benchmarks.async_nodes [--requests 200] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+
+from langchain_core.prompts import ChatPromptTemplate
+from langgraph.graph import StateGraph, START, END
+
+from backend.graph import nodes
+from backend.graph.main import draft_graph
+from backend.graph.schemas import EmailSchema
+from backend.graph.state import DraftState
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "Draft an email."), ("human", "{context}\n{user_details}")])
+
+
+class FakeStructuredLLM:
+    """email_llm stand-in: a fixed network latency, then a canned EmailSchema."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, messages):
+        time.sleep(self.latency)
+        return EmailSchema(recipient="hr@acme.test", subject="Hello", body="Hi")
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency)
+        return EmailSchema(recipient="hr@acme.test", subject="Hello", body="Hi")
+
+
+def sync_email_drafter(state: DraftState) -> dict:
+    """The email node as it was before: blocking prompt and LLM calls."""
+    messages = PROMPT.invoke({"context": state["context"], "user_details": state["user_details"]}).to_messages()
+    return {"email": nodes.email_llm.invoke(messages).model_dump()}
+
+
+def build_sync_graph():
+    graph = StateGraph(DraftState)
+    graph.add_node("email_drafter_agent", sync_email_drafter)
+    graph.add_edge(START, "email_drafter_agent")
+    graph.add_edge("email_drafter_agent", END)
+    return graph.compile()
+
+
+async def run(graph, requests: int) -> float:
+    state = {"context": "Engineer at Acme", "user_details": "Jane", "type": "email"}
+    started = time.perf_counter()
+    await asyncio.gather(*(graph.ainvoke(state) for _ in range(requests)))
+    return time.perf_counter() - started
+
+
+async def main(requests: int, latency: float) -> None:
+    nodes.email_llm = FakeStructuredLLM(latency)
+
+    async def cached_prompt(name):
+        return PROMPT
+
+    nodes.prompt_registry.aget = cached_prompt
+
+    print(f"{requests} concurrent drafts, fake LLM latency {latency * 1000:.0f} ms")
+    for name, graph in (("sync nodes", build_sync_graph()), ("async nodes", draft_graph)):
+        elapsed = await run(graph, requests)
+        print(f"  {name:<12} {elapsed:6.2f} s  {requests / elapsed:7.1f} drafts/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency))
@@ -0,0 +1,116 @@
+"""
+Parsing a batch of context uploads inline on the event loop vs in the parsing process pool.
+
+Generates a corpus of multi-page PDFs and long DOCX files, parses it both ways and reports
+wall time and the worst event-loop stall (a 10 ms ticker runs alongside). The speedup from
+parallel parsing needs as many cores as DOCUMENT_PARSE_WORKERS.
+
+    python -m benchmarks.document_parsing [--pdfs 4] [--docx 4] [--pages 60]
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import docx
+
+from backend.utils import parse_pool
+from backend.utils.file_parser import parse_bytes
+
+
+def make_pdf(pages: int) -> bytes:
+    """A PDF with `pages` pages of 60 text lines each, written by hand so no PDF library is needed."""
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for page in range(pages):
+        content_id, page_id = 4 + 2 * page, 5 + 2 * page
+        text = "".join(
+            f"BT /F1 9 Tf 20 {800 - line * 12} Td (Line {line} of page {page}: senior python engineer, APIs, data) Tj ET\n"
+            for line in range(60)
+        )
+        objects[content_id] = f"<< /Length {len(text)} >>\nstream\n{text}endstream"
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number in sorted(objects):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode()
+    return out
+
+
+def make_docx(paragraphs: int) -> bytes:
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"Paragraph {i}: experienced python engineer building APIs and data pipelines. " * 5)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def timed(parse) -> tuple[float, float, list[str]]:
+    """Runs `parse()` next to a 10 ms ticker; returns wall time, worst tick delay (ms) and the texts."""
+    delays = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            delays.append((time.perf_counter() - started - 0.01) * 1000)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    texts = await parse()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await task
+    return elapsed, max(delays, default=elapsed * 1000), texts
+
+
+async def main(args) -> None:
+    corpus = [(make_pdf(args.pages), f"resume-{i}.pdf") for i in range(args.pdfs)]
+    corpus += [(make_docx(args.pages * 50), f"resume-{i}.docx") for i in range(args.docx)]
+    size_kib = sum(len(data) for data, _ in corpus) // 1024
+    print(f"{len(corpus)} files ({size_kib} KiB), {parse_pool.DOCUMENT_PARSE_WORKERS} parse workers, {os.cpu_count()} CPUs")
+
+    async def inline():
+        return [parse_bytes(data, name) for data, name in corpus]
+
+    async def pooled():
+        return await asyncio.gather(*(parse_pool.aparse_bytes(data, name) for data, name in corpus))
+
+    # Start the workers (and their imports) outside the timed run
+    await parse_pool.aparse_bytes(b"warm up", "warm-up.txt")
+    try:
+        results = {}
+        for label, parse in (("inline", inline), ("pooled", pooled)):
+            elapsed, worst_delay, results[label] = await timed(parse)
+            print(f"  {label:<7} {elapsed:6.2f} s  worst event-loop stall {worst_delay:8.1f} ms")
+        assert results["inline"] == results["pooled"]
+    finally:
+        parse_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdfs", type=int, default=4)
+    parser.add_argument("--docx", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=60)
+    asyncio.run(main(parser.parse_args()))
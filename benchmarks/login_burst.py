@@ -0,0 +1,90 @@
+"""
+Latency of an unrelated endpoint during a burst of logins, with Argon2 on the event loop vs on the hashing pool.
+
+Runs the app in-process on a temporary SQLite database. While `--logins` concurrent logins
+are verified, GET /metrics/password_hash (authenticated, but no database work, so only the
+event loop can delay it) is probed every 10 ms and its latency percentiles reported.
+"inline" verifies passwords synchronously in the handler, as login did before.
+
+    python -m benchmarks.login_burst [--logins 60]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='login-burst-')}/bench.db"
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI
+
+from backend.core.database import engine
+from backend.migrations import upgrade
+from backend.routers import auth, users, metrics
+from backend.utils import password_hash
+from backend.utils.percentiles import summarize
+
+
+async def inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return password_hash.verify_password(plain_password, hashed_password)
+
+
+async def burst(client: httpx.AsyncClient, headers: dict, logins: int) -> tuple[dict, float]:
+    probes = []
+    done = asyncio.Event()
+
+    async def probe():
+        # Latency counts from when each probe was due, so time the loop spent blocked is not hidden
+        due = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(max(due - time.perf_counter(), 0))
+            await client.get("/metrics/password_hash", headers=headers)
+            finished = time.perf_counter()
+            probes.append((finished - due) * 1000)
+            due = max(due + 0.01, finished)
+
+    async def login():
+        response = await client.post("/auth/login", json={"username": "bench", "password": "bench-password"})
+        return response.status_code
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    statuses = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    assert all(status in (200, 503) for status in statuses), statuses
+    return summarize(probes, (50, 99, 100)), elapsed
+
+
+async def main(logins: int) -> None:
+    await upgrade(engine)
+    app = FastAPI()
+    app.include_router(users.router)
+    app.include_router(auth.router)
+    app.include_router(metrics.router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post("/users/", json={"username": "bench", "email": "bench@example.com", "password": "bench-password"})
+        token = (await client.post("/auth/login", json={"username": "bench", "password": "bench-password"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"{logins} concurrent logins, {password_hash.PASSWORD_HASH_WORKERS} hashing workers")
+        pooled = password_hash.averify_password
+        for label, verify in (("inline", inline_verify), ("pooled", pooled)):
+            auth.averify_password = verify
+            stats, elapsed = await burst(client, headers, logins)
+            print(
+                f"  {label:<7} burst {elapsed:5.2f} s  probe during burst: "
+                f"p50 {stats['p50']:7.1f} ms  p99 {stats['p99']:7.1f} ms  max {stats['p100']:7.1f} ms  ({stats['count']} probes)"
+            )
+        auth.averify_password = pooled
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=60)
+    asyncio.run(main(parser.parse_args().logins))
@@ -1,6 +1,8 @@
 import requests
 import streamlit as st
 import os
+import json
+import time
 
 class APIClient:
     def __init__(self, base_url=None):
@@ -8,8 +10,18 @@ class APIClient:
             self.base_url = base_url
         else:
             self.base_url = os.getenv("BACKEND_URL", "http://localhost:8000")
+        # Called after a token refresh, so the caller can persist the rotated tokens (see auth_utils)
+        self.on_tokens_refreshed = None
 
     def _get_headers(self):
+        # Swap an access token that is about to expire before the request, not after a 401
+        expires_at = st.session_state.get("access_token_expires_at")
+        if st.session_state.get("refresh_token") and expires_at and time.time() > expires_at - 60:
+            tokens = self.refresh(st.session_state.refresh_token)
+            if "error" not in tokens:
+                self.store_tokens(tokens)
+                if self.on_tokens_refreshed:
+                    self.on_tokens_refreshed()
         token = st.session_state.get("access_token")
         if token:
             return {"Authorization": f"Bearer {token}"}
@@ -24,6 +36,31 @@ class APIClient:
         except requests.exceptions.RequestException as e:
             return {"error": str(e), "details": response.text if 'response' in locals() else ""}
 
+    def refresh(self, refresh_token):
+        """Exchanges a refresh token for a new token pair; the old refresh token stops working."""
+        url = f"{self.base_url}/auth/refresh"
+        try:
+            response = requests.post(url, json={"refresh_token": refresh_token})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
+    def logout(self, refresh_token):
+        url = f"{self.base_url}/auth/logout"
+        try:
+            requests.post(url, json={"refresh_token": refresh_token}).raise_for_status()
+            return True
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
+    def store_tokens(self, tokens):
+        """Keeps a token response from login or refresh in the session."""
+        st.session_state.access_token = tokens["access_token"]
+        st.session_state.refresh_token = tokens.get("refresh_token")
+        expires_in = tokens.get("expires_in")
+        st.session_state.access_token_expires_at = time.time() + expires_in if expires_in else None
+
     def register(self, username, email, password, first_name=None, last_name=None, phone=None, linkedin=None, github=None, portfolio=None, role="user"):
         url = f"{self.base_url}/users/"
         payload = {
@@ -76,6 +113,42 @@ class APIClient:
         except requests.exceptions.RequestException as e:
              return {"error": str(e), "details": response.text if 'response' in locals() else ""}
 
+    def list_documents(self):
+        url = f"{self.base_url}/users/documents"
+        try:
+            response = requests.get(url, headers=self._get_headers())
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException:
+            return []
+
+    def get_document(self, document_id):
+        url = f"{self.base_url}/users/documents/{document_id}"
+        try:
+            response = requests.get(url, headers=self._get_headers())
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
+    def set_document_active(self, document_id, is_active):
+        url = f"{self.base_url}/users/documents/{document_id}"
+        try:
+            response = requests.patch(url, headers=self._get_headers(), json={"is_active": is_active})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
+    def delete_document(self, document_id):
+        url = f"{self.base_url}/users/documents/{document_id}"
+        try:
+            response = requests.delete(url, headers=self._get_headers())
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
     def get_jobs(self):
         url = f"{self.base_url}/users/jobs"
         try:
@@ -85,9 +158,27 @@ class APIClient:
         except requests.exceptions.RequestException:
             return []
 
-    def generate_context(self, job_description):
+    def get_jobs_summary(self):
+        url = f"{self.base_url}/users/jobs/summary"
+        try:
+            response = requests.get(url, headers=self._get_headers())
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException:
+            return []
+
+    def get_job(self, jd_id):
+        url = f"{self.base_url}/users/jobs/{jd_id}"
+        try:
+            response = requests.get(url, headers=self._get_headers())
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
+    def generate_context(self, job_description, refresh=False, prefetch_drafts=False):
         url = f"{self.base_url}/generation/context"
-        data = {"job_description": job_description}
+        data = {"job_description": job_description, "refresh": refresh, "prefetch_drafts": prefetch_drafts}
         try:
             response = requests.post(url, headers=self._get_headers(), data=data)
             response.raise_for_status()
@@ -109,6 +200,41 @@ class APIClient:
         except requests.exceptions.RequestException as e:
             return {"error": str(e), "details": response.text if 'response' in locals() else ""}
             
+    def draft_context_stream(self, jd_id, type_, feedback=None):
+        """Yields (event, data) pairs from the Server-Sent Events draft stream."""
+        url = f"{self.base_url}/generation/draft_context/stream"
+        params = {"jd_id": jd_id, "type": type_}
+        data = {}
+        if feedback:
+            data["feedback"] = feedback
+
+        try:
+            with requests.post(url, headers=self._get_headers(), params=params, data=data, stream=True) as response:
+                response.raise_for_status()
+                event = "message"
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        event = line[len("event:"):].strip()
+                    elif line.startswith("data:"):
+                        yield event, json.loads(line[len("data:"):].strip())
+                        event = "message"
+        except requests.exceptions.RequestException as e:
+            yield "error", {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
+    def draft_contexts(self, jd_id, types, feedback=None):
+        url = f"{self.base_url}/generation/draft_contexts"
+        params = {"jd_id": jd_id, "types": list(types)}
+        data = {}
+        if feedback:
+            data["feedback"] = feedback
+
+        try:
+            response = requests.post(url, headers=self._get_headers(), params=params, data=data)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
     def send_email(self, to_address, subject, body, files=None):
         url = f"{self.base_url}/generation/send_email"
         data = {
@@ -127,6 +253,56 @@ class APIClient:
         except requests.exceptions.RequestException as e:
             return {"error": str(e), "details": response.text if 'response' in locals() else ""}
 
+    def list_generated_contents(self, limit=50, cursor=None, content_types=None, jd_id=None, companies=None, created_after=None, created_before=None, summary=False):
+        """
+        Fetches one page of drafts; returns {"items": [...], "next_cursor": str | None}.
+        With summary=True the items omit the body (see get_generated_content).
+        """
+        url = f"{self.base_url}/generation/contents/summary" if summary else f"{self.base_url}/generation/contents"
+        params = {
+            "limit": limit,
+            "cursor": cursor,
+            "content_type": content_types or None,
+            "jd_id": jd_id,
+            "company": companies or None,
+            "created_after": created_after,
+            "created_before": created_before,
+        }
+        try:
+            response = requests.get(url, headers=self._get_headers(), params={k: v for k, v in params.items() if v is not None})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"items": [], "next_cursor": None, "error": str(e)}
+
+    def search(self, q, kind="all", limit=20, offset=0):
+        """Full-text search over jobs and drafts; returns {"items": [...], "next_offset": int | None}."""
+        url = f"{self.base_url}/search"
+        try:
+            response = requests.get(url, headers=self._get_headers(), params={"q": q, "kind": kind, "limit": limit, "offset": offset})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"items": [], "next_offset": None, "error": str(e)}
+
+    def get_analytics(self, days=30):
+        url = f"{self.base_url}/analytics"
+        try:
+            response = requests.get(url, headers=self._get_headers(), params={"days": days})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
+    def get_generated_content(self, content_id):
+        url = f"{self.base_url}/generation/contents/{content_id}"
+        try:
+            response = requests.get(url, headers=self._get_headers())
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e), "details": response.text if 'response' in locals() else ""}
+
     def get_all_generated_contents(self):
         url = f"{self.base_url}/generation/generated_contents"
         try:
@@ -154,6 +330,16 @@ class APIClient:
         except requests.exceptions.RequestException:
             return []
 
+    def export_history(self, format="ndjson"):
+        """Downloads every job and draft as NDJSON or CSV; returns the file bytes or {"error": ...}."""
+        url = f"{self.base_url}/generation/export"
+        try:
+            with requests.get(url, headers=self._get_headers(), params={"format": format}, stream=True) as response:
+                response.raise_for_status()
+                return b"".join(response.iter_content(chunk_size=64 * 1024))
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
     def generate_pdf(self, body):
         url = f"{self.base_url}/generation/pdf"
         data = {"body": body}
@@ -3,6 +3,9 @@ import extra_streamlit_components as stx
 from api import api
 
 import os
+import json
+import time
+import base64
 
 # Singleton manager
 @st.cache_resource
@@ -31,24 +34,56 @@ def restore_session():
     if st.session_state.get("access_token"):
         return
 
-    # Check cookie
+    # Check cookie. A still-valid access token is reused as is: refreshing rotates the refresh
+    # token, which every other open tab holds too, so only an expired one is refreshed
     token = cookie_manager.get("access_token")
+    refresh_token = cookie_manager.get("refresh_token")
+    st.session_state.refresh_token = refresh_token
+    expires_at = _token_expiry(token)
+    if token and expires_at and expires_at > time.time() and _start_session(token, expires_at):
+        return
+    if refresh_token:
+        tokens = api.refresh(refresh_token)
+        if "error" not in tokens:
+            api.store_tokens(tokens)
+            _save_token_cookies()
+            if _start_session(tokens["access_token"], st.session_state.access_token_expires_at):
+                return
+    # Token invalid/expired or user fetch failed
+    st.session_state.access_token = None
     if token:
-        st.session_state.access_token = token
-        # Validate/Fetch user info
-        user_info = api.get_user_me()
-        if user_info and isinstance(user_info, dict) and "username" in user_info:
-            st.session_state.user = user_info
-        else:
-            # Token invalid/expired or user fetch failed
-            st.session_state.access_token = None
-            cookie_manager.delete("access_token")
+        cookie_manager.delete("access_token")
+
+def _token_expiry(token):
+    """The exp claim of an access token, read without verifying it (the backend does that)."""
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["exp"]
+    except (AttributeError, IndexError, ValueError, KeyError, TypeError):
+        return None
+
+def _start_session(token, expires_at):
+    """Validates the token by fetching the user; keeps it in the session if that works."""
+    st.session_state.access_token = token
+    st.session_state.access_token_expires_at = expires_at
+    user_info = api.get_user_me()
+    if user_info and isinstance(user_info, dict) and "username" in user_info:
+        st.session_state.user = user_info
+        return True
+    return False
+
+def _save_token_cookies():
+    cookie_manager.set("access_token", st.session_state.access_token, key="set_auth_token")
+    if st.session_state.get("refresh_token"):
+        cookie_manager.set("refresh_token", st.session_state.refresh_token, key="set_refresh_token")
+
+# The old refresh token stops working once rotated, so the cookie must always hold the latest
+api.on_tokens_refreshed = _save_token_cookies
 
 def login_user(token_response):
     """Sets session and cookie"""
-    token = token_response["access_token"]
-    st.session_state.access_token = token
-    cookie_manager.set("access_token", token, key="set_auth_token")
+    api.store_tokens(token_response)
+    _save_token_cookies()
     
     # Fetch user info
     user_info = api.get_user_me()
@@ -57,6 +92,11 @@ def login_user(token_response):
 
 def logout_user():
     """Clears session and cookie"""
+    if st.session_state.get("refresh_token"):
+        api.logout(st.session_state.refresh_token)
     st.session_state.access_token = None
+    st.session_state.refresh_token = None
+    st.session_state.access_token_expires_at = None
     st.session_state.user = None
     cookie_manager.delete("access_token", key="del_auth_token")
+    cookie_manager.delete("refresh_token", key="del_refresh_token")
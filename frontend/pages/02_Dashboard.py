@@ -20,11 +20,11 @@ if not st.session_state.get("access_token"):
     st.warning("⚠️ Please login to access the dashboard.")
     st.stop()
 
-# Fetch jobs for both tabs
-jobs = api.get_jobs()
+# Fetch job summaries for both tabs; the job text and context are loaded per job on demand
+jobs = api.get_jobs_summary()
 
 # Navigation Tabs
-tab_jobs, tab_analytics = st.tabs(["📋 Jobs", "📈 Analytics"])
+tab_jobs, tab_search, tab_analytics = st.tabs(["📋 Jobs", "🔎 Search", "📈 Analytics"])
 
 # ──────────────────────────────────────────────────────────────────────────────
 # JOBS TAB
@@ -50,12 +50,20 @@ with tab_jobs:
                 </div>
                 """, unsafe_allow_html=True)
                 
-                with st.expander("📄 View Details & Actions"):
-                    st.text_area("Job Description", job.get('jd_text', ''), height=100, disabled=True, key=f"jd_{job['id']}")
-                    
-                    if job.get('generated_context'):
-                        st.markdown("**Generated Context:**")
-                        st.json(job.get('generated_context'))
+                with st.expander(f"📄 View Details & Actions ({job.get('draft_count', 0)} drafts)"):
+                    details = st.session_state.setdefault("job_details", {}).get(job['id'])
+                    if details is None:
+                        if st.button("Load job description & context", key=f"load_{job['id']}"):
+                            st.session_state.job_details[job['id']] = api.get_job(job['id'])
+                            st.rerun()
+                    elif details.get("error"):
+                        st.error(f"Could not load details: {details['error']}")
+                    else:
+                        st.text_area("Job Description", details.get('jd_text', ''), height=100, disabled=True, key=f"jd_{job['id']}")
+                        
+                        if details.get('generated_context'):
+                            st.markdown("**Generated Context:**")
+                            st.json(details.get('generated_context'))
                     
                     col1, col2, col3 = st.columns(3)
                     with col1:
@@ -82,21 +90,70 @@ with tab_jobs:
         </div>
         """, unsafe_allow_html=True)
 
+# ──────────────────────────────────────────────────────────────────────────────
+# SEARCH TAB
+# ──────────────────────────────────────────────────────────────────────────────
+with tab_search:
+    col_q, col_kind = st.columns([3, 1])
+    with col_q:
+        query = st.text_input("Search jobs and drafts", placeholder="e.g. fintech kafka", key="search_query")
+    with col_kind:
+        kind_label = st.selectbox("In", ["Everything", "Jobs", "Drafts"], key="search_kind")
+    kind = {"Everything": "all", "Jobs": "jobs", "Drafts": "drafts"}[kind_label]
+
+    # Keep the loaded pages until the query or scope changes
+    search_key = (query.strip(), kind)
+    if st.session_state.get("search_key") != search_key:
+        st.session_state.search_key = search_key
+        st.session_state.search_results = []
+        st.session_state.search_next_offset = 0 if query.strip() else None
+
+    if query.strip() and not st.session_state.search_results and st.session_state.search_next_offset == 0:
+        page = api.search(query.strip(), kind=kind)
+        if page.get("error"):
+            st.error(f"Search failed: {page['error']}")
+        st.session_state.search_results = page.get("items", [])
+        st.session_state.search_next_offset = page.get("next_offset")
+
+    results = st.session_state.search_results
+    if query.strip() and not results:
+        st.info("No matches.")
+    for result in results:
+        if result["kind"] == "job":
+            heading = f"📋 **{result.get('title') or 'Untitled'}** · {result.get('company') or ''}"
+        else:
+            content_type = (result.get('content_type') or '').replace('_', ' ').title()
+            heading = f"✉️ **{result.get('subject') or content_type}** · {content_type} for {result.get('title') or ''} at {result.get('company') or ''}"
+        st.markdown(heading)
+        st.caption(f"{result.get('snippet') or ''}  \n{result['created_at'][:10]}")
+
+    if st.session_state.get("search_next_offset"):
+        if st.button("Load more results", key="search_more"):
+            page = api.search(query.strip(), kind=kind, offset=st.session_state.search_next_offset)
+            st.session_state.search_results = results + page.get("items", [])
+            st.session_state.search_next_offset = page.get("next_offset")
+            st.rerun()
+
 # ──────────────────────────────────────────────────────────────────────────────
 # ANALYTICS TAB
 # ──────────────────────────────────────────────────────────────────────────────
 with tab_analytics:
-    contents = api.get_all_generated_contents()
-    all_companies = list(set([j.get('company', 'Unknown') for j in jobs])) if jobs else []
+    # Counts are aggregated server-side, so this tab costs the same however long the history is
+    analytics = api.get_analytics()
+    if analytics.get("error"):
+        st.error(f"Could not load analytics: {analytics['error']}")
+        st.stop()
+    totals = analytics.get("totals", {})
+    all_companies = [row['company'] for row in analytics.get("by_company", [])]
     
-    if contents or jobs:
+    if totals.get("drafts") or totals.get("jobs"):
         # Metrics Row
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.markdown(f"""
             <div class="premium-card stat-card">
-                <div class="stat-value">{len(contents) if contents else 0}</div>
+                <div class="stat-value">{totals.get('drafts', 0)}</div>
                 <div class="stat-label">Documents Generated</div>
             </div>
             """, unsafe_allow_html=True)
@@ -104,7 +161,7 @@ with tab_analytics:
         with col2:
             st.markdown(f"""
             <div class="premium-card stat-card">
-                <div class="stat-value">{len(jobs) if jobs else 0}</div>
+                <div class="stat-value">{totals.get('jobs', 0)}</div>
                 <div class="stat-label">Jobs Analyzed</div>
             </div>
             """, unsafe_allow_html=True)
@@ -112,50 +169,75 @@ with tab_analytics:
         with col3:
             st.markdown(f"""
             <div class="premium-card stat-card">
-                <div class="stat-value">{len(all_companies)}</div>
+                <div class="stat-value">{totals.get('companies', 0)}</div>
                 <div class="stat-label">Companies</div>
             </div>
             """, unsafe_allow_html=True)
         
         st.markdown("---")
         
-        if contents:
-            df = pd.DataFrame(contents)
+        if totals.get("drafts"):
+            # Charts
+            st.markdown("### Content Distribution")
+            type_counts = pd.DataFrame(analytics["by_type"]).set_index("content_type")["count"]
+            st.bar_chart(type_counts)
+            
+            if analytics.get("by_day"):
+                st.markdown("### Drafts per Day (last 30 days)")
+                st.line_chart(pd.DataFrame(analytics["by_day"]).set_index("day")["count"])
+            
+            if analytics.get("top_skills"):
+                st.markdown("### Most Requested Skills")
+                st.bar_chart(pd.DataFrame(analytics["top_skills"]).set_index("skill")["jobs"])
             
-            # Chart
-            if 'content_type' in df.columns:
-                st.markdown("### Content Distribution")
-                type_counts = df['content_type'].value_counts()
-                st.bar_chart(type_counts)
+            with st.expander("Drafts per prompt version"):
+                st.dataframe(pd.DataFrame(analytics.get("by_prompt_version", [])), use_container_width=True, hide_index=True)
             
             # Filters
             st.markdown("### Recent Generations")
             
             col_f1, col_f2 = st.columns(2)
             with col_f1:
-                type_options = df['content_type'].unique().tolist() if 'content_type' in df.columns else []
+                type_options = type_counts.index.tolist()
                 type_filter = st.multiselect("Filter by Type", options=type_options)
             with col_f2:
                 company_filter = st.multiselect("Filter by Company", options=all_companies)
             
-            filtered_df = df.copy()
-            if type_filter:
-                filtered_df = filtered_df[filtered_df['content_type'].isin(type_filter)]
-            if company_filter and 'company_name' in df.columns:
-                filtered_df = filtered_df[filtered_df['company_name'].isin(company_filter)]
+            # Filtering and paging happen server-side; reset the loaded pages when the filters or the draft count change
+            filters = (tuple(type_filter), tuple(company_filter), totals.get("drafts"))
+            if st.session_state.get("recent_filters") != filters:
+                st.session_state.recent_filters = filters
+                page = api.list_generated_contents(content_types=type_filter, companies=company_filter, summary=True)
+                st.session_state.recent_items = page.get("items", [])
+                st.session_state.recent_cursor = page.get("next_cursor")
+            
+            recent_df = pd.DataFrame(st.session_state.recent_items)
             
             # Display Table
             display_cols = []
-            for col in ['company_name', 'job_title', 'content_type', 'to_address', 'subject']:
-                if col in filtered_df.columns:
+            for col in ['company_name', 'job_title', 'content_type', 'to_address', 'subject', 'created_at']:
+                if col in recent_df.columns:
                     display_cols.append(col)
             
             if display_cols:
                 st.dataframe(
-                    filtered_df[display_cols],
+                    recent_df[display_cols],
                     use_container_width=True,
                     hide_index=True
                 )
+            else:
+                st.info("No generations match these filters.")
+            
+            if st.session_state.recent_cursor and st.button("Load more", key="recent_load_more"):
+                page = api.list_generated_contents(
+                    cursor=st.session_state.recent_cursor,
+                    content_types=type_filter,
+                    companies=company_filter,
+                    summary=True,
+                )
+                st.session_state.recent_items += page.get("items", [])
+                st.session_state.recent_cursor = page.get("next_cursor")
+                st.rerun()
         else:
             st.info("No generated content yet. Use the Generator to create your first draft!")
     else:
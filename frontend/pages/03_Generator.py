@@ -67,16 +67,24 @@ if st.session_state.gen_step == 1:
         label_visibility="collapsed"
     )
     
+    refresh_context = st.checkbox("Re-analyze even if this job description was analyzed before", value=False)
+    prefetch_drafts = st.checkbox("Start drafting my usual content types in the background", value=False)
+    
     st.markdown("<br>", unsafe_allow_html=True)
     
     if st.button("Analyze & Continue →", type="primary", use_container_width=True):
         if jd_text:
             with st.spinner("Analyzing job description..."):
-                response = api.generate_context(jd_text)
-                if "job_title" in response or "raw_content" in response:
-                    jobs = api.get_jobs()
+                response = api.generate_context(jd_text, refresh=refresh_context, prefetch_drafts=prefetch_drafts)
+                if response.get("jd_id"):
+                    st.session_state.current_jd_id = response["jd_id"]
+                    st.success("✅ Analysis complete!")
+                    st.session_state.gen_step = 2
+                    st.rerun()
+                elif "job_title" in response or "raw_content" in response:
+                    jobs = api.get_jobs_summary()
                     if jobs:
-                        latest_job = jobs[-1] 
+                        latest_job = jobs[0]
                         st.session_state.current_jd_id = latest_job['id']
                         st.success("✅ Analysis complete!")
                         st.session_state.gen_step = 2
@@ -135,15 +143,27 @@ if st.session_state.gen_step == 2:
     with col_next:
         if st.button("Generate Draft →", type="primary", use_container_width=True):
             if st.session_state.current_jd_id:
+                # Render tokens as they stream in instead of waiting on a spinner
+                subject_placeholder = st.empty()
+                body_placeholder = st.empty()
+                partial = {"recipient": "", "subject": "", "body": ""}
+                response = None
                 with st.spinner(f"Generating {draft_type}..."):
-                    response = api.draft_context(st.session_state.current_jd_id, draft_type, feedback)
-                    if "body" in response:
-                        st.session_state.generated_draft = response
-                        st.session_state.generated_draft['type'] = draft_type
-                        st.session_state.gen_step = 3
-                        st.rerun()
-                    else:
-                        st.error(f"Error: {response}")
+                    for event, data in api.draft_context_stream(st.session_state.current_jd_id, draft_type, feedback):
+                        if event == "token":
+                            partial[data["field"]] += data["text"]
+                            if partial["subject"]:
+                                subject_placeholder.markdown(f"**📋 {partial['subject']}**")
+                            body_placeholder.markdown(partial["body"] + "▌")
+                        elif event == "done":
+                            response = data
+                        elif event == "error":
+                            st.error(f"Error: {data}")
+                if response and "body" in response:
+                    st.session_state.generated_draft = response
+                    st.session_state.generated_draft['type'] = draft_type
+                    st.session_state.gen_step = 3
+                    st.rerun()
 
 # ──────────────────────────────────────────────────────────────────────────────
 # STEP 3: Edit & Send
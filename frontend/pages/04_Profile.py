@@ -135,12 +135,11 @@ if st.button("📤 Upload & Process", type="primary", use_container_width=True):
             if "error" in result:
                 st.error(f"Error: {result['error']}")
             else:
-                st.success(f"✅ Context updated! ({len(uploaded_files)} files processed)")
+                duplicates = sum(1 for doc in result.get("documents", []) if doc.get("duplicate"))
+                note = f", {duplicates} already stored" if duplicates else ""
+                st.success(f"✅ Context updated! ({len(uploaded_files)} files processed{note})")
                 st.session_state.uploader_key += 1
-                updated_user = api.get_user_me()
-                if updated_user:
-                    st.session_state.user = updated_user
-                    st.rerun()
+                st.rerun()
     else:
         st.warning("Please select files first.")
 
@@ -149,19 +148,53 @@ st.markdown("<br>", unsafe_allow_html=True)
 # ──────────────────────────────────────────────────────────────────────────────
 # CONTEXT DISPLAY
 # ──────────────────────────────────────────────────────────────────────────────
-user = st.session_state.user
-context_length = len(user.get('user_context', '') or '') if user else 0
+documents = api.list_documents()
+active_documents = [doc for doc in documents if doc.get("is_active")]
+context_length = sum(doc.get("char_count", 0) for doc in active_documents)
 
-st.markdown(f"""
-<div class="premium-card stat-card">
-    <div class="stat-value">{context_length:,}</div>
-    <div class="stat-label">Characters in Context</div>
-</div>
-""", unsafe_allow_html=True)
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown(f"""
+    <div class="premium-card stat-card">
+        <div class="stat-value">{context_length:,}</div>
+        <div class="stat-label">Characters in Context</div>
+    </div>
+    """, unsafe_allow_html=True)
+with col2:
+    st.markdown(f"""
+    <div class="premium-card stat-card">
+        <div class="stat-value">{len(active_documents)} / {len(documents)}</div>
+        <div class="stat-label">Documents in Use</div>
+    </div>
+    """, unsafe_allow_html=True)
 
-if user and user.get('user_context'):
-    with st.expander("📄 View Stored Context"):
-        st.text(user.get('user_context', 'No context found.'))
+if documents:
+    st.caption("Only documents marked as in use are sent to the AI when analyzing a job.")
+    for doc in documents:
+        with st.expander(f"📄 {doc['filename']} · {doc['char_count']:,} characters"):
+            in_use = st.checkbox("Use in generation", value=doc["is_active"], key=f"doc_active_{doc['id']}")
+            if in_use != doc["is_active"]:
+                res = api.set_document_active(doc["id"], in_use)
+                if "error" in res:
+                    st.error(res["error"])
+                else:
+                    st.rerun()
+            
+            text = st.session_state.setdefault("document_texts", {}).get(doc["id"])
+            if text is None:
+                if st.button("Show text", key=f"doc_show_{doc['id']}"):
+                    detail = api.get_document(doc["id"])
+                    st.session_state.document_texts[doc["id"]] = detail.get("text", detail.get("error", ""))
+                    st.rerun()
+            else:
+                st.text(text)
+            
+            if st.button("🗑️ Delete document", key=f"doc_delete_{doc['id']}"):
+                res = api.delete_document(doc["id"])
+                if "error" in res:
+                    st.error(res["error"])
+                else:
+                    st.rerun()
     
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -172,9 +205,31 @@ if user and user.get('user_context'):
                 st.error(res['error'])
             else:
                 st.success("Context cleared successfully.")
-                updated_user = api.get_user_me()
-                if updated_user:
-                    st.session_state.user = updated_user
-                    st.rerun()
+                st.rerun()
 else:
     st.info("No context uploaded yet. Upload your documents above to get started.")
+
+# Export
+st.markdown("### Export History")
+st.caption("Download every saved job and draft, e.g. as a backup.")
+col_format, col_export = st.columns([1, 2])
+with col_format:
+    export_format = st.selectbox("Format", ["ndjson", "csv"], key="export_format", label_visibility="collapsed")
+with col_export:
+    if st.button("📦 Prepare export", use_container_width=True):
+        with st.spinner("Exporting..."):
+            st.session_state.export_file = (export_format, api.export_history(export_format))
+
+export = st.session_state.get("export_file")
+if export:
+    export_format, data = export
+    if isinstance(data, dict):
+        st.error(f"Export failed: {data['error']}")
+    else:
+        st.download_button(
+            f"⬇️ Download .{export_format}",
+            data=data,
+            file_name=f"agent-mailer-export.{export_format}",
+            mime="text/csv" if export_format == "csv" else "application/x-ndjson",
+            use_container_width=True,
+        )
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+
+# The backend reads its settings at import time, so point it at a throwaway SQLite file first
+_db_dir = tempfile.mkdtemp(prefix="agent-mailer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ["LANGSMITH_TRACING"] = "false"
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from backend.core import database
+from backend.migrations import upgrade
+from backend.routers import auth, users, generation, metrics, analytics, search
+
+asyncio.run(upgrade(database.engine))
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    # The routers without main.py's lifespan: no prompt hub warm-up or checkpointer
+    app = FastAPI()
+    for router in (users, auth, generation, metrics, analytics, search):
+        app.include_router(router.router)
+    return app
+
+
+@pytest.fixture
+def client(app) -> TestClient:
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def user(client) -> dict:
+    """A fresh signed-up user: its id, credentials and bearer headers."""
+    username = f"user-{uuid.uuid4().hex[:12]}"
+    response = client.post("/users/", json={"username": username, "email": f"{username}@example.com", "password": "pw"})
+    assert response.status_code == 201, response.text
+    tokens = client.post("/auth/login", json={"username": username, "password": "pw"}).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    user_id = uuid.UUID(jwt.get_unverified_claims(tokens["access_token"])["id"])
+    return {"id": user_id, "username": username, "password": "pw", "tokens": tokens, "headers": headers}
@@ -0,0 +1,57 @@
+import time
+import uuid
+
+from backend.utils import analytics_cache
+from backend.utils.analytics_cache import analytics_key, get_cached_analytics, cache_analytics, invalidate_analytics
+
+
+def test_each_days_variant_expires_on_its_own_ttl(monkeypatch):
+    clock = [time.monotonic()]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(analytics_cache.analytics_cache, "ttl", 60)
+    user_id = uuid.uuid4()
+
+    cache_analytics(analytics_key(user_id, (7,)), {"days": 7})
+    clock[0] += 50
+    cache_analytics(analytics_key(user_id, (30,)), {"days": 30})
+    clock[0] += 20
+
+    assert get_cached_analytics(analytics_key(user_id, (7,))) is None
+    assert get_cached_analytics(analytics_key(user_id, (30,))) == {"days": 30}
+
+
+def test_invalidation_drops_every_variant_for_that_user_only():
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    for days in (7, 30):
+        cache_analytics(analytics_key(user_id, (days,)), {"days": days})
+    cache_analytics(analytics_key(other_id, (7,)), {"days": 7})
+
+    invalidate_analytics(user_id)
+
+    assert get_cached_analytics(analytics_key(user_id, (7,))) is None
+    assert get_cached_analytics(analytics_key(user_id, (30,))) is None
+    assert get_cached_analytics(analytics_key(other_id, (7,))) == {"days": 7}
+
+
+def test_result_computed_across_a_write_is_not_served_after_it():
+    user_id = uuid.uuid4()
+    key = analytics_key(user_id, (30,))
+    invalidate_analytics(user_id)  # a draft is saved while the analytics query runs
+    cache_analytics(key, {"days": 30})
+
+    assert get_cached_analytics(analytics_key(user_id, (30,))) is None
+
+
+def test_generations_are_bounded_and_never_reused(monkeypatch):
+    monkeypatch.setattr(analytics_cache._generations, "maxsize", 2)
+    user_id = uuid.uuid4()
+    key = analytics_key(user_id, (7,))
+    cache_analytics(key, {"days": 7})
+
+    # Other users' writes push this user's generation out
+    for _ in range(3):
+        invalidate_analytics(uuid.uuid4())
+
+    assert len(analytics_cache._generations) == 2
+    assert analytics_key(user_id, (7,)) != key
+    assert get_cached_analytics(analytics_key(user_id, (7,))) is None
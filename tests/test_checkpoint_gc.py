@@ -0,0 +1,46 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+
+from backend.graph.checkpointer import checkpoint_id_at, collect_stale_threads, open_checkpointer
+
+
+def test_checkpoint_id_at_orders_like_langgraph_ids():
+    now = datetime.now(timezone.utc)
+    issued = str(uuid6(clock_seq=0))
+    assert checkpoint_id_at(now - timedelta(seconds=1)) < issued < checkpoint_id_at(now + timedelta(seconds=1))
+
+
+async def _put(saver, thread_id: str, checkpoint_id: str) -> None:
+    checkpoint = empty_checkpoint()
+    checkpoint["id"] = checkpoint_id
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    await saver.aput(config, checkpoint, {}, {})
+
+
+def test_collect_stale_threads_deletes_only_threads_without_recent_checkpoints(tmp_path):
+    async def scenario():
+        async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+            old = checkpoint_id_at(datetime.now(timezone.utc) - timedelta(days=40))
+            await _put(saver, "stale", old)
+            await _put(saver, "revived", old)
+            await _put(saver, "revived", str(uuid6(clock_seq=1)))
+            await _put(saver, "fresh", str(uuid6(clock_seq=0)))
+
+            async def no_full_scan(*args, **kwargs):
+                raise AssertionError("GC must not load every checkpoint")
+                yield
+
+            saver.alist = no_full_scan
+            deleted = await collect_stale_threads(saver, max_age_days=30)
+            remaining = {
+                thread_id
+                for (thread_id,) in await (await saver.conn.execute("SELECT DISTINCT thread_id FROM checkpoints")).fetchall()
+            }
+            return deleted, remaining
+
+    deleted, remaining = asyncio.run(scenario())
+    assert deleted == 1
+    assert remaining == {"revived", "fresh"}
@@ -0,0 +1,48 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+
+from backend.core.config import CONTEXT_AGENT_MAX_TOOL_CALLS
+from backend.graph.chains import create_context_agent
+
+SUBTASK = "Research the company in depth"
+
+
+class ScriptedModel(GenericFakeChatModel):
+    """Main agent: keeps delegating to a `task` subagent. Subagent: searches until told to stop."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        last = messages[-1]
+        in_subagent = any(isinstance(m, HumanMessage) and m.content == SUBTASK for m in messages)
+        if in_subagent:
+            searches = sum(isinstance(m, ToolMessage) and m.name == "internet_search" for m in messages)
+            if searches < 20:
+                call = {"name": "internet_search", "args": {"query": f"acme {searches}"}, "id": f"s{len(messages)}"}
+                message = AIMessage(content="", tool_calls=[call])
+            else:
+                message = AIMessage(content="done")
+        else:
+            call = {"name": "task", "args": {"description": SUBTASK, "subagent_type": "general-purpose"}, "id": f"t{len(messages)}"}
+            message = AIMessage(content="", tool_calls=[call])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def test_task_delegation_cannot_exceed_the_search_budget():
+    searches = []
+
+    @tool
+    def internet_search(query: str) -> str:
+        """Search the web."""
+        searches.append(query)
+        return "result"
+
+    agent = create_context_agent(ScriptedModel(messages=iter(())), [internet_search])
+    asyncio.run(agent.ainvoke({"messages": [HumanMessage(content="Job: engineer at Acme")]}))
+
+    assert len(searches) <= CONTEXT_AGENT_MAX_TOOL_CALLS
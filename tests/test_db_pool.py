@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core import db_pool
+from backend.core.db_pool import InstrumentedPool, asyncpg_statement_options, detect_connection_mode
+
+
+@pytest.mark.parametrize("url, mode", [
+    ("postgresql+asyncpg://u:p@db.example.com:5432/app", "direct"),
+    ("postgresql+asyncpg://u:p@aws-0-eu.pooler.supabase.com:6543/postgres", "transaction"),
+    ("postgresql+asyncpg://u:p@aws-0-eu.pooler.supabase.com:5432/postgres", "session"),
+    ("postgresql+asyncpg://u:p@pgbouncer.internal:6432/app?pgbouncer=true", "transaction"),
+])
+def test_detects_connection_mode_from_url(url, mode):
+    assert detect_connection_mode(url) == mode
+
+
+def test_configured_connection_mode_wins(monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_CONNECTION_MODE", "transaction")
+    assert detect_connection_mode("postgresql+asyncpg://u:p@db.example.com/app") == "transaction"
+    monkeypatch.setattr(db_pool, "DB_CONNECTION_MODE", "bogus")
+    with pytest.raises(ValueError):
+        detect_connection_mode("postgresql+asyncpg://u:p@db.example.com/app")
+
+
+def test_statement_cache_only_outside_transaction_pooling():
+    url = "postgresql+asyncpg://u:p@db.example.com/app"
+    uncached_url, uncached = asyncpg_statement_options(url, "transaction")
+    cached_url, cached = asyncpg_statement_options(url, "direct")
+
+    assert uncached["statement_cache_size"] == 0
+    assert uncached_url.query["prepared_statement_cache_size"] == "0"
+    assert uncached["prepared_statement_name_func"]() != uncached["prepared_statement_name_func"]()
+    assert cached["statement_cache_size"] > 0
+    assert "prepared_statement_name_func" not in cached
+
+
+def test_pool_records_checkouts_and_timeouts(tmp_path):
+    async def scenario():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedPool, pool_size=1, max_overflow=0, pool_timeout=0.1,
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                busy = engine.pool.stats()
+                with pytest.raises(Exception):
+                    async with engine.connect():
+                        pass
+            return busy, engine.pool.stats()
+        finally:
+            await engine.dispose()
+
+    busy, after = asyncio.run(scenario())
+    assert busy["checked_out"] == 1
+    assert after["checked_out"] == 0
+    assert after["checkouts"] == 2
+    assert after["timeouts"] == 1
@@ -0,0 +1,60 @@
+import asyncio
+import uuid
+
+from sqlalchemy import text, update
+
+from backend.core.database import async_session_maker, engine
+from backend.models.generated_contents import GeneratedContents, ContentTypes
+from backend.models.job_descriptions import JobDescription
+
+
+def _add_job(user_id, title: str, company: str, jd_text: str, draft_body: str | None = None) -> str:
+    async def add():
+        async with async_session_maker() as session:
+            job = JobDescription(title=title, company=company, jd_text=jd_text, user_id=user_id)
+            session.add(job)
+            await session.flush()
+            if draft_body:
+                session.add(GeneratedContents(
+                    user_id=user_id, jd_id=job.id, content_type=ContentTypes.COLD_EMAIL, subject="Hello", body=draft_body,
+                ))
+            await session.commit()
+            return str(job.id)
+
+    return asyncio.run(add())
+
+
+def _search(client, user, q: str, kind: str = "all") -> list[dict]:
+    response = client.get("/search", params={"q": q, "kind": kind}, headers=user["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+def test_search_survives_renumbered_rowids(client, user):
+    first = _add_job(user["id"], "Data engineer", "Initech", "Spark pipelines")
+    second = _add_job(user["id"], "Platform engineer", "Hooli", "Kubernetes clusters")
+
+    async def renumber():
+        # What VACUUM may do to a table whose primary key is not an INTEGER PRIMARY KEY
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE job_descriptions SET rowid = rowid + 100000"))
+
+    asyncio.run(renumber())
+
+    assert [item["jd_id"] for item in _search(client, user, "kubernetes", "jobs")] == [second]
+    assert [item["jd_id"] for item in _search(client, user, "spark", "jobs")] == [first]
+
+
+def test_draft_is_found_by_its_jobs_new_company(client, user):
+    jd_id = _add_job(user["id"], "Backend engineer", "Globex", "Go services", draft_body="I would love to join.")
+
+    async def rename():
+        async with async_session_maker() as session:
+            await session.execute(update(JobDescription).where(JobDescription.id == uuid.UUID(jd_id)).values(company="Umbrella"))
+            await session.commit()
+
+    asyncio.run(rename())
+
+    drafts = _search(client, user, "umbrella", "drafts")
+    assert [item["jd_id"] for item in drafts] == [jd_id]
+    assert _search(client, user, "globex", "drafts") == []
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+
+from backend.core import database
+from backend.core.database import LazySession
+from backend.models.user import User
+
+
+def _run(scenario):
+    async def with_session():
+        session = LazySession()
+        try:
+            return await scenario(session)
+        finally:
+            await session.close()
+
+    return asyncio.run(with_session())
+
+
+def test_release_after_reads_frees_the_connection_and_keeps_objects_usable(user):
+    async def scenario(db):
+        loaded = (await db.execute(select(User).where(User.id == user["id"]))).scalars().first()
+        await db.release()
+        return database.engine.pool.checkedout(), loaded.username
+
+    assert _run(scenario) == (0, user["username"])
+
+
+@pytest.mark.parametrize("write", ["pending", "flushed", "statement"])
+def test_release_refuses_uncommitted_writes(user, write):
+    async def scenario(db):
+        loaded = (await db.execute(select(User).where(User.id == user["id"]))).scalars().first()
+        if write == "statement":
+            await db.execute(update(User).where(User.id == user["id"]).values(role="half-finished"))
+        else:
+            loaded.role = "half-finished"
+            if write == "flushed":
+                await db.flush()
+        with pytest.raises(RuntimeError):
+            await db.release()
+        await db.rollback()
+        return (await db.execute(select(User.role).where(User.id == user["id"]))).scalar()
+
+    assert _run(scenario) != "half-finished"
+
+
+def test_release_after_an_explicit_commit(user):
+    async def scenario(db):
+        await db.execute(update(User).where(User.id == user["id"]).values(role="reviewer"))
+        await db.commit()
+        await db.release()
+        return (await db.execute(select(User.role).where(User.id == user["id"]))).scalar()
+
+    assert _run(scenario) == "reviewer"
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from backend.core import database
+from backend.routers import generation
+from backend.utils.document_store import store_document
+
+
+def _checked_out() -> dict:
+    return {"writer": database.engine.pool.checkedout(), "reader": database.read_engine.pool.checkedout()}
+
+
+class StubGraph:
+    """Stands in for a compiled graph: records pool usage at the moment the LLM would run."""
+
+    checkpointer = None
+
+    def __init__(self, result):
+        self.result = result
+        self.seen = []
+
+    async def ainvoke(self, state, config=None, **kwargs):
+        self.seen.append(_checked_out())
+        return self.result(state)
+
+
+@pytest.fixture
+def user_with_documents(user):
+    async def add_document():
+        async with database.async_session_maker() as session:
+            await store_document(session, user["id"], "resume.txt", "Python engineer, ten years of FastAPI.")
+            await session.commit()
+
+    asyncio.run(add_document())
+    return user
+
+
+def test_no_connection_is_held_while_the_llm_runs(client, user_with_documents, monkeypatch):
+    headers = user_with_documents["headers"]
+    generate_graph = StubGraph(lambda state: {"context": {"job_title": "Engineer", "company_name": "Acme"}})
+    draft_graph = StubGraph(lambda state: {
+        state["type"]: {"recipient": "hr@acme.test", "subject": "Hello", "body": "Hi"},
+        "model_used": "fake",
+        "prompt_version": "test",
+    })
+    monkeypatch.setattr(generation, "generate_graph", generate_graph)
+    monkeypatch.setattr(generation, "draft_graph", draft_graph)
+
+    response = client.post("/generation/context", data={"job_description": "Engineer at Acme"}, headers=headers)
+    assert response.status_code == 200, response.text
+    jd_id = response.json()["jd_id"]
+
+    response = client.post("/generation/draft_context", params={"jd_id": jd_id, "type": "email"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    assert generate_graph.seen == [{"writer": 0, "reader": 0}]
+    assert draft_graph.seen == [{"writer": 0, "reader": 0}]
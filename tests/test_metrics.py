@@ -0,0 +1,15 @@
+import pytest
+
+from backend.routers.metrics import router
+
+METRICS_PATHS = [route.path for route in router.routes]
+
+
+@pytest.mark.parametrize("path", METRICS_PATHS)
+def test_metrics_require_authentication(client, path):
+    assert client.get(path).status_code == 401
+
+
+@pytest.mark.parametrize("path", METRICS_PATHS)
+def test_metrics_are_served_to_signed_in_users(client, user, path):
+    assert client.get(path, headers=user["headers"]).status_code == 200
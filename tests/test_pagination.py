@@ -0,0 +1,80 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from backend.core.database import async_session_maker, engine
+from backend.migrations.runner import Operations
+from backend.migrations.versions import m0009_sqlite_created_at_precision
+from backend.models.generated_contents import GeneratedContents, ContentTypes
+from backend.models.job_descriptions import JobDescription
+
+
+async def _add_job(user_id) -> uuid.UUID:
+    async with async_session_maker() as session:
+        job = JobDescription(title="Engineer", company="Acme", jd_text="Python", user_id=user_id)
+        session.add(job)
+        await session.commit()
+        return job.id
+
+
+async def _add_drafts(user_id, jd_id, count: int, created_at=None) -> None:
+    async with async_session_maker() as session:
+        for i in range(count):
+            session.add(GeneratedContents(
+                user_id=user_id, jd_id=jd_id, content_type=ContentTypes.COLD_EMAIL, body=f"draft {i}", created_at=created_at,
+            ))
+        await session.commit()
+
+
+async def _add_legacy_drafts(user_id, jd_id, count: int) -> None:
+    """Rows written before utcnow(): created_at from SQLite's CURRENT_TIMESTAMP, whole seconds."""
+    async with engine.begin() as conn:
+        for i in range(count):
+            await conn.execute(
+                text("INSERT INTO generated_contents (id, user_id, jd_id, content_type, body) VALUES (:id, :user_id, :jd_id, 'cold_email', :body)"),
+                {"id": uuid.uuid4().hex, "user_id": user_id.hex, "jd_id": jd_id.hex, "body": f"legacy {i}"},
+            )
+        await conn.run_sync(lambda sync_conn: m0009_sqlite_created_at_precision.upgrade(Operations(sync_conn)))
+
+
+def _page_through(client, headers, path: str, limit: int) -> list[str]:
+    ids, cursor = [], None
+    for _ in range(50):
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = client.get(path, params=params, headers=headers).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+    raise AssertionError("pagination never ended")
+
+
+def test_pages_through_rows_created_in_the_same_second(client, user):
+    jd_id = asyncio.run(_add_job(user["id"]))
+    asyncio.run(_add_drafts(user["id"], jd_id, 7))
+
+    for path in ("/generation/contents", "/generation/contents/summary"):
+        ids = _page_through(client, user["headers"], path, limit=3)
+        assert len(ids) == 7
+        assert len(set(ids)) == 7
+
+
+def test_pages_through_identical_timestamps_by_id(client, user):
+    jd_id = asyncio.run(_add_job(user["id"]))
+    asyncio.run(_add_drafts(user["id"], jd_id, 5, created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)))
+
+    ids = _page_through(client, user["headers"], "/generation/contents", limit=2)
+    assert len(set(ids)) == 5
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_pages_through_rows_from_before_the_precision_migration(client, user):
+    jd_id = asyncio.run(_add_job(user["id"]))
+    asyncio.run(_add_legacy_drafts(user["id"], jd_id, 4))
+    asyncio.run(_add_drafts(user["id"], jd_id, 3))
+
+    ids = _page_through(client, user["headers"], "/generation/contents", limit=2)
+    assert len(ids) == 7
+    assert len(set(ids)) == 7
@@ -0,0 +1,96 @@
+import asyncio
+import io
+import time
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from backend.utils import parse_pool
+
+
+def slow_parse(data: bytes, filename: str) -> str:
+    time.sleep(float(data))
+    return filename
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    parse_pool.shutdown()
+    yield
+    parse_pool.shutdown()
+
+
+def test_oversized_upload_is_rejected_with_413(client, user, monkeypatch):
+    monkeypatch.setattr(parse_pool, "DOCUMENT_MAX_BYTES", 10)
+    response = client.post(
+        "/users/context", headers=user["headers"], files=[("files", ("notes.txt", b"x" * 11, "text/plain"))]
+    )
+
+    assert response.status_code == 413
+
+
+def test_upload_without_a_size_is_read_only_up_to_the_limit(monkeypatch):
+    monkeypatch.setattr(parse_pool, "DOCUMENT_MAX_BYTES", 10)
+    stream = io.BytesIO(b"x" * 1000)
+    upload = UploadFile(stream, filename="notes.txt")
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(parse_pool.read_upload(upload))
+    assert raised.value.status_code == 413
+    assert stream.tell() == 11
+
+
+def test_parse_error_is_a_400(client, user):
+    response = client.post(
+        "/users/context", headers=user["headers"], files=[("files", ("notes.exe", b"MZ", "application/octet-stream"))]
+    )
+
+    assert response.status_code == 400
+    assert "Unsupported file extension" in response.json()["detail"]
+
+
+def test_timed_out_parse_is_killed(monkeypatch):
+    monkeypatch.setattr(parse_pool, "parse_bytes", slow_parse)
+    monkeypatch.setattr(parse_pool, "DOCUMENT_PARSE_TIMEOUT_SECONDS", 1)
+    killed = parse_pool.stats()["killed"]
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(parse_pool.aparse_bytes(b"60", "stuck.txt"))
+
+    assert raised.value.status_code == 400
+    assert parse_pool.stats()["killed"] == killed + 1
+    assert not parse_pool._children
+
+
+def test_queued_file_is_timed_from_when_its_parse_starts(monkeypatch):
+    monkeypatch.setattr(parse_pool, "parse_bytes", slow_parse)
+    monkeypatch.setattr(parse_pool, "DOCUMENT_PARSE_WORKERS", 1)
+    monkeypatch.setattr(parse_pool, "DOCUMENT_PARSE_TIMEOUT_SECONDS", 1.5)
+
+    async def scenario():
+        # With one slot the second file waits behind the first for longer than the timeout
+        return await asyncio.gather(
+            parse_pool.aparse_bytes(b"1", "first.txt"),
+            parse_pool.aparse_bytes(b"1", "second.txt"),
+            return_exceptions=True,
+        )
+
+    assert asyncio.run(scenario()) == ["first.txt", "second.txt"]
+
+
+def test_a_timeout_does_not_fail_other_parses(monkeypatch):
+    monkeypatch.setattr(parse_pool, "parse_bytes", slow_parse)
+    monkeypatch.setattr(parse_pool, "DOCUMENT_PARSE_WORKERS", 2)
+    monkeypatch.setattr(parse_pool, "DOCUMENT_PARSE_TIMEOUT_SECONDS", 1)
+
+    async def scenario():
+        return await asyncio.gather(
+            parse_pool.aparse_bytes(b"60", "stuck.txt"),
+            parse_pool.aparse_bytes(b"0", "a.txt"),
+            parse_pool.aparse_bytes(b"0", "b.txt"),
+            return_exceptions=True,
+        )
+
+    stuck, a, b = asyncio.run(scenario())
+    assert isinstance(stuck, HTTPException) and stuck.status_code == 400
+    assert (a, b) == ("a.txt", "b.txt")
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+
+from backend.utils import password_hash
+
+
+def test_hashing_runs_on_the_pool_not_the_event_loop(monkeypatch):
+    threads = []
+    verify = password_hash.verify_password
+
+    def recording_verify(plain_password, hashed_password):
+        threads.append(threading.current_thread().name)
+        return verify(plain_password, hashed_password)
+
+    monkeypatch.setattr(password_hash, "verify_password", recording_verify)
+
+    async def scenario():
+        hashed = await password_hash.ahashed_password("secret")
+        return await password_hash.averify_password("secret", hashed), await password_hash.averify_password("nope", hashed)
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert threads and all(name.startswith("password-hash") for name in threads)
+
+
+def test_login_is_shed_with_503_when_the_pool_is_saturated(client, user, monkeypatch):
+    monkeypatch.setattr(password_hash, "PASSWORD_HASH_MAX_PENDING", 0)
+    response = client.post("/auth/login", json={"username": user["username"], "password": user["password"]})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,43 @@
+import asyncio
+
+from sqlalchemy import select
+
+from backend.core import database
+from backend.models.job_descriptions import JobDescription
+
+
+def _checkouts() -> dict:
+    return {name: pool["checkouts"] for name, pool in database.pool_metrics()["pools"].items()}
+
+
+def test_search_reads_on_the_reader_pool(client, user):
+    before = _checkouts()
+    response = client.get("/search", params={"q": "python engineer"}, headers=user["headers"])
+    after = _checkouts()
+
+    assert response.status_code == 200
+    assert after["writer"] == before["writer"]
+    assert after["reader"] > before["reader"]
+
+
+def test_bare_get_bind_does_not_pin_the_writer():
+    async def check():
+        async with database.async_session_maker() as session:
+            session.get_bind()
+            await session.execute(select(JobDescription.id).limit(1))
+            return session.info.get("uses_writer")
+
+    assert not asyncio.run(check())
+
+
+def test_session_reads_its_own_writes(user):
+    async def check():
+        async with database.async_session_maker() as session:
+            job = JobDescription(title="Engineer", company="Acme", jd_text="unflushed", user_id=user["id"])
+            session.add(job)
+            await session.flush()
+            found = await session.scalar(select(JobDescription.id).where(JobDescription.id == job.id))
+            await session.rollback()
+            return found == job.id, session.info.get("uses_writer")
+
+    assert asyncio.run(check()) == (True, None)
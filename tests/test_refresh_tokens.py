@@ -0,0 +1,72 @@
+from backend.core import security
+
+
+def _refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_rotation_issues_a_new_token_pair(client, user):
+    response = _refresh(client, user["tokens"]["refresh_token"])
+    assert response.status_code == 200
+    assert response.json()["refresh_token"] != user["tokens"]["refresh_token"]
+
+
+def test_concurrent_replay_within_grace_keeps_the_family(client, user):
+    original = user["tokens"]["refresh_token"]
+    first = _refresh(client, original)
+    # A second tab restoring the same cookie before the rotated value is written back
+    second = _refresh(client, original)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert _refresh(client, first.json()["refresh_token"]).status_code == 200
+    assert _refresh(client, second.json()["refresh_token"]).status_code == 200
+
+
+def test_replay_after_grace_revokes_the_family(client, user, monkeypatch):
+    monkeypatch.setattr(security, "JWT_REFRESH_TOKEN_REUSE_GRACE_SECONDS", 0)
+    original = user["tokens"]["refresh_token"]
+    successor = _refresh(client, original).json()["refresh_token"]
+
+    assert _refresh(client, original).status_code == 401
+    assert _refresh(client, successor).status_code == 401
+
+
+def test_replay_within_grace_after_logout_is_rejected(client, user):
+    original = user["tokens"]["refresh_token"]
+    successor = _refresh(client, original).json()["refresh_token"]
+    assert client.post("/auth/logout", json={"refresh_token": successor}).status_code == 204
+
+    assert _refresh(client, original).status_code == 401
+
+
+def test_second_replay_within_grace_revokes_the_family(client, user):
+    original = user["tokens"]["refresh_token"]
+    first = _refresh(client, original)
+    second = _refresh(client, original)
+    assert (first.status_code, second.status_code) == (200, 200)
+
+    # A third presentation is not a concurrent refresh any more
+    assert _refresh(client, original).status_code == 401
+    assert _refresh(client, first.json()["refresh_token"]).status_code == 401
+    assert _refresh(client, second.json()["refresh_token"]).status_code == 401
+
+
+def test_logout_ends_the_sessions_access_tokens(client, user):
+    refreshed = _refresh(client, user["tokens"]["refresh_token"]).json()
+    headers = {"Authorization": f"Bearer {refreshed['access_token']}"}
+    assert client.get("/users/me", headers=headers).status_code == 200  # now in verified_tokens
+    assert client.get("/users/me", headers=user["headers"]).status_code == 200
+
+    assert client.post("/auth/logout", json={"refresh_token": refreshed["refresh_token"]}).status_code == 204
+
+    assert client.get("/users/me", headers=headers).status_code == 401
+    assert client.get("/users/me", headers=user["headers"]).status_code == 401
+
+
+def test_logout_leaves_other_logins_signed_in(client, user):
+    other = client.post("/auth/login", json={"username": user["username"], "password": user["password"]}).json()
+    assert client.post("/auth/logout", json={"refresh_token": user["tokens"]["refresh_token"]}).status_code == 204
+
+    headers = {"Authorization": f"Bearer {other['access_token']}"}
+    assert client.get("/users/me", headers=headers).status_code == 200
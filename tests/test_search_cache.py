@@ -0,0 +1,28 @@
+import time
+
+from backend.graph.web_search_tool import SearchCache
+
+
+def test_persistent_hit_is_kept_in_memory_only_until_its_stored_expiry(tmp_path):
+    path = str(tmp_path / "search_cache.sqlite")
+    SearchCache(maxsize=10, ttl=3600, path=path).set("k", {"results": []}, latency=1.5)
+
+    # A restart: memory is empty, the persistent entry has 5 of its 3600 seconds left
+    cache = SearchCache(maxsize=10, ttl=3600, path=path)
+    cache._db.execute("UPDATE search_cache SET expires_at = ?", (time.time() + 5,))
+    assert cache.get("k") == {"results": []}
+    assert cache.persistent_hits == 1
+
+    memory_expires_at, _ = cache.memory._data["k"]
+    assert memory_expires_at - time.monotonic() <= 5
+
+
+def test_expired_persistent_entry_is_not_served(tmp_path):
+    path = str(tmp_path / "search_cache.sqlite")
+    cache = SearchCache(maxsize=10, ttl=3600, path=path)
+    cache.set("k", {"results": []}, latency=1.5)
+    cache.memory.clear()
+    cache._db.execute("UPDATE search_cache SET expires_at = ?", (time.time() - 1,))
+
+    assert cache.get("k") is None
+    assert len(cache.memory) == 0
@@ -0,0 +1,89 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from sqlalchemy import select
+
+from backend.core.database import async_session_maker
+from backend.graph.checkpointer import draft_thread_id, predraft_thread_id
+from backend.graph.main import draft_graph
+from backend.models.generated_contents import GeneratedContents, ContentTypes
+from backend.models.job_descriptions import JobDescription
+from backend.utils import speculative_drafts
+
+
+@pytest.fixture
+def saver(monkeypatch):
+    saver = InMemorySaver()
+    monkeypatch.setattr(draft_graph, "checkpointer", saver)
+    return saver
+
+
+def _add_job(user_id) -> uuid.UUID:
+    async def add():
+        async with async_session_maker() as session:
+            job = JobDescription(title="Engineer", company="Acme", jd_text="Python", user_id=user_id)
+            session.add(job)
+            await session.commit()
+            return job.id
+
+    return asyncio.run(add())
+
+
+async def _provisional_ids(user_id) -> set[uuid.UUID]:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(GeneratedContents.id).where(
+                GeneratedContents.user_id == user_id, GeneratedContents.is_provisional.is_(True)
+            )
+        )
+        return set(result.scalars())
+
+
+def test_predraft_runs_on_its_own_thread_and_is_adopted_on_claim(user, saver, monkeypatch):
+    jd_id = _add_job(user["id"])
+    conversation = [HumanMessage(content="Write an email", id="prompt"), AIMessage(content='{"body": "Hi"}', id="draft")]
+
+    async def fake_ainvoke(state, config=None, **kwargs):
+        # What the email drafter node leaves on the thread it runs on
+        await draft_graph.aupdate_state(config, {"messages": conversation}, as_node="email_drafter_agent")
+        return {"email": {"subject": "Hello", "body": "Hi"}}
+
+    monkeypatch.setattr(draft_graph, "ainvoke", fake_ainvoke)
+    interactive = {"configurable": {"thread_id": draft_thread_id(jd_id, "email")}}
+
+    async def scenario():
+        await speculative_drafts._predraft(jd_id, user["id"], "email", "context", {})
+        # Nothing was written to the thread interactive drafts use
+        assert not (await draft_graph.aget_state(interactive)).values
+        (content_id,) = await _provisional_ids(user["id"])
+        async with async_session_maker() as session:
+            claimed = await speculative_drafts.claim_predraft(session, jd_id, user["id"], "email")
+        assert claimed.id == content_id
+        return content_id, await draft_graph.aget_state(interactive)
+
+    content_id, adopted = asyncio.run(scenario())
+    assert [m.id for m in adopted.values["messages"]] == ["prompt", "draft"]
+    assert not any(key[0] == predraft_thread_id(content_id) for key in saver.storage)
+
+
+def test_unclaimed_predrafts_are_purged_after_their_ttl(user):
+    jd_id = _add_job(user["id"])
+    old, recent = uuid.uuid4(), uuid.uuid4()
+
+    async def add_predrafts():
+        async with async_session_maker() as session:
+            for content_id, age in ((old, timedelta(hours=25)), (recent, timedelta(hours=1))):
+                session.add(GeneratedContents(
+                    id=content_id, user_id=user["id"], jd_id=jd_id, content_type=ContentTypes.COLD_EMAIL,
+                    body="draft", is_provisional=True, created_at=datetime.now(timezone.utc) - age,
+                ))
+            await session.commit()
+
+    asyncio.run(add_predrafts())
+    assert asyncio.run(speculative_drafts.purge_stale_predrafts(max_age_hours=24)) >= 1
+
+    assert asyncio.run(_provisional_ids(user["id"])) == {recent}